@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.queries.session import get_db
+from services import analytics
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+@router.get("")
+async def overall_analytics(db: AsyncSession = Depends(get_db)):
+    """
+    Score statistics over every scored answer: per metric (score and each
+    rubric category) the count, mean, variance, standard deviation,
+    percentiles and histogram, read from the incrementally kept rollups.
+    """
+    overall = await analytics.summary(db, "all", "")
+    
+    return JSONResponse({
+        "overall": overall,
+        "roles": await analytics.ranked(db, "role", limit=20)
+    })
+
+@router.get("/roles")
+async def role_analytics(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Roles by number of scored answers, with their mean score and spread"""
+    return JSONResponse({
+        "limit": limit,
+        "offset": offset,
+        "roles": await analytics.ranked(db, "role", limit=limit, offset=offset)
+    })
+
+@router.get("/roles/{role}")
+async def role_summary(role: str, db: AsyncSession = Depends(get_db)):
+    """Score statistics for one role (matched case-insensitively)"""
+    summary = await analytics.summary(db, "role", analytics.role_key(role))
+    if summary is None:
+        return JSONResponse({"error": "No scored answers for this role"}, status_code=404)
+    
+    return JSONResponse(summary)
+
+@router.get("/questions")
+async def question_analytics(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Questions by number of scored answers; each key opens /analytics/questions/{key}"""
+    return JSONResponse({
+        "limit": limit,
+        "offset": offset,
+        "questions": await analytics.ranked(db, "question", limit=limit, offset=offset)
+    })
+
+@router.get("/questions/{key}")
+async def question_summary(key: str, db: AsyncSession = Depends(get_db)):
+    """Score statistics for one question, by the key listed in /analytics/questions"""
+    summary = await analytics.summary(db, "question", key)
+    if summary is None:
+        return JSONResponse({"error": "No scored answers for this question"}, status_code=404)
+    
+    return JSONResponse(summary)
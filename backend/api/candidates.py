@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import datetime
+from typing import Optional
+from db.queries.session import get_db
+from db.models.models import Candidate
+from services import candidate_search
+import json
+
+router = APIRouter(prefix="/candidates", tags=["Candidates"])
+
+@router.get("")
+async def list_candidates(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Candidates, newest first, optionally within a creation date range. Pages
+    are keyset-based on the id: pass the returned next_cursor to get the next
+    page, which costs the same however deep it is.
+    """
+    query = (
+        select(Candidate.id, Candidate.name, Candidate.email, Candidate.skills, Candidate.created_at)
+        .order_by(Candidate.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        query = query.where(Candidate.id < cursor)
+    if created_from is not None:
+        query = query.where(Candidate.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Candidate.created_at < created_to)
+    rows = (await db.execute(query)).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    
+    return JSONResponse({
+        "candidates": [
+            {
+                "candidate_id": row.id,
+                "name": row.name,
+                "email": row.email,
+                "skills": json.loads(row.skills or "[]"),
+                "created_at": row.created_at.isoformat() if row.created_at else None
+            }
+            for row in rows
+        ],
+        "limit": limit,
+        "next_cursor": rows[-1].id if more else None
+    })
+
+@router.get("/search")
+async def search_candidates(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    match: str = Query("all", pattern="^(all|any)$"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search over resumes and skills, ranked by BM25. With
+    match=all (the default) every query term must appear; match=any ranks
+    candidates matching any of them.
+    """
+    total, page = candidate_search.search(q, limit=limit, offset=offset, match_all=match == "all")
+
+    candidates = {}
+    if page:
+        result = await db.execute(
+            select(Candidate.id, Candidate.name, Candidate.email, Candidate.skills)
+            .where(Candidate.id.in_([candidate_id for candidate_id, _ in page]))
+        )
+        candidates = {row.id: row for row in result}
+
+    return JSONResponse({
+        "query": q,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "results": [
+            {
+                "candidate_id": candidate_id,
+                "score": score,
+                "name": candidates[candidate_id].name,
+                "email": candidates[candidate_id].email,
+                "skills": json.loads(candidates[candidate_id].skills or "[]")
+            }
+            for candidate_id, score in page if candidate_id in candidates
+        ]
+    })
@@ -1,15 +1,22 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from db.queries.session import get_db
+from sqlalchemy import select, update, func
+from db.queries.session import get_db, AsyncSessionLocal
+from db.queries import interviews
 from db.models.models import Candidate, Interview, Answer
-from services import question_generator, scoring_engine
+from services import question_generator, question_bank, scoring_engine, score_batcher, job_queue, llm_gateway, group_commit, analytics
+from .report import invalidate_report, materialize_report
+from . import sse
 from pydantic import BaseModel
 import json
+import functools
 
 router = APIRouter(prefix="/interview", tags=["Interview"])
 
+# How long a streamed answer's backup scoring job waits before a worker may run it
+STREAM_SCORE_GRACE = 2 * llm_gateway.LLM_TIMEOUT
+
 class StartInterviewRequest(BaseModel):
     candidate_id: int
     role: str = "Software Engineer"
@@ -18,6 +25,24 @@ class NextQuestionRequest(BaseModel):
     interview_id: int
     answer: str
 
+async def _load_question_plan(interview: Interview, db: AsyncSession):
+    """Return the stored question plan and cursor for an interview.
+
+    Interviews started before plans were persisted get one generated and
+    stored on first use; their cursor was backfilled from the answer count
+    by migration 0002.
+    """
+    if interview.questions is not None:
+        return json.loads(interview.questions), interview.current_question or 0
+    
+    candidate = await db.get(Candidate, interview.candidate_id)
+    skills = json.loads(candidate.skills) if candidate and candidate.skills else []
+    questions = await question_generator.generate_questions(skills, interview.role)
+    
+    interview.questions = json.dumps(questions)
+    await db.commit()
+    return questions, interview.current_question
+
 @router.post("/start")
 async def start_interview(
     request: StartInterviewRequest,
@@ -30,13 +55,18 @@ async def start_interview(
     
     skills = json.loads(candidate.skills) if candidate.skills else []
     
-    # Generate questions
-    questions = question_generator.generate_questions(skills, request.role)
+    # Assemble the question plan once from the bank, generating it only if the
+    # bank cannot cover this role yet; /next serves from the stored copy
+    questions = question_bank.assemble_plan(skills, request.role)
+    if questions is None:
+        questions = await question_generator.generate_questions(skills, request.role)
     
     # Create interview in database
     interview = Interview(
         candidate_id=request.candidate_id,
-        role=request.role
+        role=request.role,
+        questions=json.dumps(questions),
+        current_question=0
     )
     db.add(interview)
     await db.commit()
@@ -48,6 +78,56 @@ async def start_interview(
         "question": questions[0] if questions else None
     })
 
+async def _stage_answer(db: AsyncSession, interview_id: int, answer_text: str, score_delay: float = 0.0):
+    """Add the answer to the current question, its scoring job and the cursor
+    move to ``db`` without committing.
+
+    Returns (answer, next question or None when the interview is now
+    complete), or None if every question has already been answered.
+    """
+    interview = await db.get(Interview, interview_id)
+    questions, current_q_idx = json.loads(interview.questions), interview.current_question or 0
+    if current_q_idx >= len(questions):
+        return None
+    
+    db_answer = Answer(
+        interview_id=interview.id,
+        question=questions[current_q_idx],
+        answer=answer_text,
+        status="pending"
+    )
+    db.add(db_answer)
+    interview.current_question = current_q_idx + 1
+    # Check if interview is complete
+    if current_q_idx + 1 >= len(questions):
+        interview.completed_at = func.now()
+    await db.flush()
+    job_queue.enqueue(db, "score_answer", {"answer_id": db_answer.id}, delay=score_delay)
+    await invalidate_report(db, interview.id)
+    
+    if current_q_idx + 1 >= len(questions):
+        return db_answer, None
+    return db_answer, questions[current_q_idx + 1]
+
+async def _record_answer(db: AsyncSession, interview: Interview, answer_text: str, score_delay: float = 0.0):
+    """Store the answer to the current question and queue it for scoring, in one commit.
+
+    With group commit enabled the write joins other requests' writes in a
+    shared transaction. Returns what _stage_answer returns.
+    """
+    await _load_question_plan(interview, db)
+    stage = functools.partial(_stage_answer, interview_id=interview.id, answer_text=answer_text,
+                              score_delay=score_delay)
+    if group_commit.GROUP_COMMIT_ENABLED:
+        # Release this request's read transaction so the batch can take the write lock
+        await db.rollback()
+        recorded = await group_commit.submit(stage)
+    else:
+        recorded = await stage(db)
+        await db.commit()
+    job_queue.notify()
+    return recorded
+
 @router.post("/next")
 async def next_question(
     request: NextQuestionRequest,
@@ -57,40 +137,138 @@ async def next_question(
     if not interview:
         return JSONResponse({"error": "Interview not found"}, status_code=404)
     
-    # Get candidate for skills
-    candidate = await db.get(Candidate, interview.candidate_id)
-    skills = json.loads(candidate.skills) if candidate.skills else []
-    questions = question_generator.generate_questions(skills, interview.role)
+    # Store the answer now and score it in the background
+    recorded = await _record_answer(db, interview, request.answer)
+    if recorded is None:
+        return JSONResponse({"message": "Interview already complete"})
     
-    # Get answers count properly
-    answers_query = select(func.count(Answer.id)).where(Answer.interview_id == request.interview_id)
-    result = await db.execute(answers_query)
-    current_q_idx = result.scalar() or 0
+    db_answer, question = recorded
+    if question is None:
+        return JSONResponse({
+            "message": "Interview complete",
+            "answer_id": db_answer.id,
+            "score": None,
+            "status": "pending"
+        })
+    return JSONResponse({
+        "question": question, 
+        "answer_id": db_answer.id,
+        "score": None,
+        "status": "pending"
+    })
+
+@router.post("/next/stream")
+async def next_question_stream(
+    request: NextQuestionRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Like /next, but scores the answer inline and streams it as Server-Sent Events:
+    "question" (the next question, immediately), "token" (feedback text as the
+    model writes it) and a closing "score" with the parsed result.
+    """
+    interview = await db.get(Interview, request.interview_id)
+    if not interview:
+        return JSONResponse({"error": "Interview not found"}, status_code=404)
     
-    if current_q_idx < len(questions):
-        question = questions[current_q_idx]
-        score_data = scoring_engine.score_answer(question, request.answer)
-        
-        # Store answer in database
-        db_answer = Answer(
-            interview_id=request.interview_id,
-            question=question,
-            answer=request.answer,
-            score=score_data['score'],
-            feedback=score_data['feedback']
+    # The queued job only runs if this stream is abandoned before it stores a score
+    recorded = await _record_answer(
+        db, interview, request.answer, score_delay=STREAM_SCORE_GRACE
+    )
+    if recorded is None:
+        return JSONResponse({"message": "Interview already complete"})
+    
+    db_answer, question = recorded
+    answer_id, asked, answer_text = db_answer.id, db_answer.question, db_answer.answer
+    
+    async def events():
+        yield sse.format_event("question", {
+            "question": question,
+            "answer_id": answer_id,
+            "complete": question is None
+        })
+        async for kind, value in scoring_engine.stream_score_answer(asked, answer_text):
+            if kind == "token":
+                yield sse.format_event("token", {"text": value})
+            else:
+                await _save_score(answer_id, value)
+                yield sse.format_event("score", value)
+    
+    return sse.event_stream(events())
+
+@router.get("/{interview_id}/status")
+async def interview_status(
+    interview_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Report how many answers have been scored so far"""
+    interview = await interviews.load_interview_status(db, interview_id)
+    if not interview:
+        return JSONResponse({"error": "Interview not found"}, status_code=404)
+    
+    counts = interview.counts
+    questions = json.loads(interview.questions) if interview.questions else []
+    
+    return JSONResponse({
+        "interview_id": interview_id,
+        "total_questions": len(questions),
+        "answered": sum(counts.values()),
+        "scored": counts.get("scored", 0),
+        "pending": counts.get("pending", 0),
+        "failed": counts.get("failed", 0),
+        "completed": interview.completed_at is not None
+    })
+
+async def _mark_answer_failed(payload: dict):
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Answer).where(Answer.id == payload["answer_id"]).values(status="failed")
         )
-        db.add(db_answer)
+        await db.commit()
+
+async def _save_score(answer_id: int, score_data: dict):
+    """Store a finished score, add it to the analytics rollups and build the report
+    once the interview is fully scored"""
+    async with AsyncSessionLocal() as db:
+        # Conditional on the status so an answer scored twice is only counted once
+        stored = (await db.execute(
+            update(Answer)
+            .where(Answer.id == answer_id, Answer.status != "scored")
+            .values(
+                score=score_data['score'],
+                feedback=score_data['feedback'],
+                score_details=json.dumps(score_data),
+                status="scored"
+            )
+            .returning(Answer.interview_id, Answer.question)
+        )).first()
+        if stored is None:
+            await db.rollback()
+            return
+        interview_id, question = stored
+        interview = (await db.execute(
+            select(Interview.role, Interview.completed_at).where(Interview.id == interview_id)
+        )).first()
+        await analytics.record_score(db, interview.role, question, score_data)
+        await invalidate_report(db, interview_id)
         await db.commit()
         
-        # Check if interview is complete
-        if current_q_idx + 1 >= len(questions):
-            interview.completed_at = func.now()
-            await db.commit()
-            return JSONResponse({"message": "Interview complete", "score": score_data})
-        else:
-            return JSONResponse({
-                "question": questions[current_q_idx + 1], 
-                "score": score_data
-            })
-    else:
-        return JSONResponse({"message": "Interview already complete"}) 
\ No newline at end of file
+        # Build the report as soon as the last answer of a finished interview is scored
+        pending = (await db.execute(
+            select(func.count(Answer.id))
+            .where(Answer.interview_id == interview_id, Answer.status == "pending")
+        )).scalar()
+        if interview.completed_at is not None and not pending:
+            await materialize_report(interview_id)
+
+@job_queue.handler("score_answer", on_failure=_mark_answer_failed)
+async def _score_answer_job(payload: dict):
+    async with AsyncSessionLocal() as db:
+        db_answer = await db.get(Answer, payload["answer_id"])
+        if db_answer is None or db_answer.status == "scored":
+            return
+        question, answer_text = db_answer.question, db_answer.answer
+    
+    # Answers scored concurrently by other workers share one LLM request
+    score_data = await score_batcher.score(question, answer_text)
+    await _save_score(payload["answer_id"], score_data)
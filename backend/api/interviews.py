@@ -0,0 +1,134 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.queries.session import get_db, AsyncSessionLocal
+from db.queries import interviews
+from db.queries.interviews import InterviewFilter, InterviewSummary, InterviewExport
+from .report import CATEGORIES
+from datetime import datetime
+from typing import Optional
+import io
+import csv
+import json
+
+router = APIRouter(prefix="/interviews", tags=["Interviews"])
+
+CSV_COLUMNS = [
+    "interview_id", "candidate_id", "candidate_name", "role", "started_at", "completed_at", "archived",
+    "average_score", "answer_index", "question", "answer", "status", "score", "feedback"
+] + CATEGORIES
+
+# Export rows are written to the response in chunks of about this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+def _filters(
+    role: Optional[str] = Query(None),
+    started_from: Optional[datetime] = Query(None),
+    started_to: Optional[datetime] = Query(None),
+    completed: Optional[bool] = Query(None)
+) -> InterviewFilter:
+    return InterviewFilter(role, started_from, started_to, completed)
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+def _summary_json(summary: InterviewSummary) -> dict:
+    return {
+        "interview_id": summary.id,
+        "candidate_id": summary.candidate_id,
+        "candidate_name": summary.candidate_name,
+        "role": summary.role,
+        "started_at": _iso(summary.started_at),
+        "completed_at": _iso(summary.completed_at),
+        "average_score": summary.average_score,
+        "archived": summary.archived
+    }
+
+@router.get("")
+async def list_interviews(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
+    filters: InterviewFilter = Depends(_filters),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Interviews, newest first, filtered by role, start date range and
+    completion; archived interviews are included. Pages are keyset-based:
+    pass the returned next_cursor to get the next page.
+    """
+    page = await interviews.list_interviews(db, filters, cursor, limit + 1)
+    more = len(page) > limit
+    page = page[:limit]
+    
+    return JSONResponse({
+        "interviews": [_summary_json(summary) for summary in page],
+        "limit": limit,
+        "next_cursor": page[-1].id if more else None
+    })
+
+def _export_json(export: InterviewExport) -> dict:
+    entry = _summary_json(export.interview)
+    entry["total_score"] = export.total_score
+    entry["category_averages"] = json.loads(export.category_averages) if export.category_averages else None
+    entry["answers"] = []
+    for answer in export.answers:
+        details = json.loads(answer.score_details) if answer.score_details else {}
+        entry["answers"].append({
+            "question": answer.question,
+            "answer": answer.answer,
+            "status": answer.status,
+            "score": answer.score,
+            "feedback": answer.feedback,
+            "categories": {c: details.get(c, answer.score) for c in CATEGORIES} if answer.score is not None else None
+        })
+    return entry
+
+def _export_csv_rows(export: InterviewExport):
+    """One row per answer; an interview without answers still gets one row"""
+    summary = export.interview
+    interview_columns = [
+        summary.id, summary.candidate_id, summary.candidate_name, summary.role,
+        _iso(summary.started_at), _iso(summary.completed_at), summary.archived, summary.average_score
+    ]
+    if not export.answers:
+        yield interview_columns + [None] * (len(CSV_COLUMNS) - len(interview_columns))
+    for index, answer in enumerate(export.answers):
+        details = json.loads(answer.score_details) if answer.score_details else {}
+        categories = [details.get(c, answer.score) for c in CATEGORIES]
+        yield interview_columns + [
+            index, answer.question, answer.answer, answer.status, answer.score, answer.feedback
+        ] + categories
+
+@router.get("/export")
+async def export_interviews(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: InterviewFilter = Depends(_filters)
+):
+    """
+    Stream every matching interview with its answers and scores, as NDJSON
+    (one interview per line) or CSV (one answer per row). Stored scores and
+    reports are exported as they are; no feedback is generated. Archived
+    interviews come first, then live ones, each in id order.
+    """
+    async def chunks():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if format == "csv":
+            writer.writerow(CSV_COLUMNS)
+        # The response outlives the request's session, so the stream has its own
+        async with AsyncSessionLocal() as db:
+            async for export in interviews.stream_interview_exports(db, filters):
+                if format == "csv":
+                    writer.writerows(_export_csv_rows(export))
+                else:
+                    buffer.write(json.dumps(_export_json(export)) + "\n")
+                if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+        yield buffer.getvalue()
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(chunks(), media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="interviews.{format}"'
+    })
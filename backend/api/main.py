@@ -3,15 +3,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Routers
-from .resume import router as resume_router
+from .resume import router as resume_router, UploadSizeLimit
 from .interview import router as interview_router
 from .report import router as report_router
 from .websocket import router as websocket_router
+from .metrics import router as metrics_router
+from .candidates import router as candidates_router
+from .analytics import router as analytics_router
+from .interviews import router as interviews_router
 
 # -- Database Imports --
-from sqlalchemy.ext.asyncio import create_async_engine
-from db.models.models import Base
-from db.queries.session import DATABASE_URL
+from db.migrations import migrate as migrations
+from db.queries import session
+from services import llm_gateway, job_queue, question_bank, parse_pool, bulk_ingest, candidate_search, compression, archiver, analytics
 
 
 # 1. Define the lifespan manager for the application
@@ -19,19 +23,38 @@ from db.queries.session import DATABASE_URL
 async def lifespan(app: FastAPI):
     """
     This function runs on application startup.
-    It creates the database tables before the app starts listening for requests.
+    The schema is managed by db/migrations, applied as a separate deploy step;
+    startup only refuses to run against a database that is behind the code.
     """
-    print("Application startup: creating database tables...")
-    engine = create_async_engine(DATABASE_URL)
-    async with engine.begin() as conn:
-        # Use run_sync for the synchronous create_all method
-        await conn.run_sync(Base.metadata.create_all)
-    await engine.dispose()
-    print("Database tables are ready.")
+    print(f"Database engine: {session.describe()}")
+    if not analytics.live_rollups(session.engine.dialect.name):
+        print(f"Score analytics: {session.engine.dialect.name} has no upserts, so rollups are only "
+              f"updated by `python -m services.analytics rebuild`.")
+    await migrations.check()
+    print("Database schema is up to date.")
+    # zstd dictionaries of the compressed text columns
+    print(f"Loaded {await compression.load()} compression dictionaries.")
+    
+    # Background workers that score answers off the request path
+    await job_queue.start()
+    # In-memory question bank, topped up in the background
+    await question_bank.start()
+    # Worker processes for CPU-bound resume parsing
+    parse_pool.start()
+    # Full-text candidate index, caught up with the database in the background
+    await candidate_search.start()
+    # Moves old completed interviews to the compressed archive
+    await archiver.start()
     
     yield  # The application runs here
     
     # Code below yield runs on shutdown, if needed
+    await archiver.stop()
+    await candidate_search.stop()
+    parse_pool.stop()
+    await question_bank.stop()
+    await job_queue.stop()
+    await llm_gateway.aclose()
     print("Application shutdown.")
 
 
@@ -41,6 +64,10 @@ app = FastAPI(lifespan=lifespan)
 
 # --- 3. ADD MIDDLEWARE AND ROUTES AS BEFORE ---
 
+# Reject oversized resume uploads while they are still being received
+app.add_middleware(UploadSizeLimit)
+app.add_middleware(UploadSizeLimit, path="/resume/bulk", max_bytes=bulk_ingest.BULK_MAX_BYTES)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -57,4 +84,8 @@ app.include_router(resume_router)
 app.include_router(interview_router)
 app.include_router(report_router)
 app.include_router(websocket_router)
+app.include_router(metrics_router)
+app.include_router(candidates_router)
+app.include_router(analytics_router)
+app.include_router(interviews_router)
 
@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from services import score_cache, score_batcher, parse_pool, resume_cache, candidate_search, group_commit, archiver
+from . import websocket
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("")
+async def get_metrics():
+    """Runtime counters for caches and background workers"""
+    return JSONResponse({
+        "score_cache": score_cache.stats(),
+        "score_batcher": score_batcher.stats(),
+        "resume_parser": parse_pool.stats(),
+        "resume_cache": resume_cache.stats(),
+        "candidate_search": candidate_search.stats(),
+        "group_commit": group_commit.stats(),
+        "archiver": archiver.stats(),
+        "proctor_relay": websocket.stats()
+    })
@@ -1,62 +1,123 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse, FileResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from db.queries.session import get_db
-from db.models.models import Interview, Answer, Candidate
-from services import transcript_summarizer, pdf_reporter, scoring_engine
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from db.queries.session import get_db, AsyncSessionLocal
+from db.queries import interviews
+from db.queries.interviews import AnswerRow, InterviewView
+from db.models.models import InterviewReport
+from services import transcript_summarizer, pdf_reporter, scoring_engine, artifact_store
+from . import sse
 import os
 import json
+import asyncio
+from typing import List, Optional
 
 router = APIRouter(prefix="/report", tags=["Report"])
 
-@router.get("/{interview_id}")
-async def get_report(
-    interview_id: int,
-    db: AsyncSession = Depends(get_db)
-):
-    interview = await db.get(Interview, interview_id)
-    if not interview:
-        return JSONResponse({"error": "Interview not found"}, status_code=404)
-    
-    # Get candidate info
-    candidate = await db.get(Candidate, interview.candidate_id)
-    
-    # Get all answers for this interview
-    result = await db.execute(
-        select(Answer).where(Answer.interview_id == interview_id)
-    )
-    answers = result.scalars().all()
-    
-    if not answers:
-        return JSONResponse({"error": "No answers found for this interview"}, status_code=404)
-    
-    # Prepare answers data for enhanced report
+CATEGORIES = ["technical_depth", "problem_solving", "communication", "experience", "critical_thinking"]
+
+SCORE_POLL_INTERVAL = 0.25
+
+async def _wait_for_scores(db: AsyncSession, interview_id: int, wait: float) -> Optional[InterviewView]:
+    """Load the interview, polling for up to ``wait`` seconds while background
+    scoring is still running; check ``pending`` on the result.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        view = await interviews.load_interview_view(db, interview_id)
+        if view is None or not view.pending or loop.time() >= deadline:
+            return view
+        # End the read transaction so scoring workers can commit meanwhile
+        await db.rollback()
+        await asyncio.sleep(SCORE_POLL_INTERVAL)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+def _pending_response(pending: int) -> JSONResponse:
+    return JSONResponse({
+        "status": "pending",
+        "pending": pending,
+        "message": "Answers are still being scored, retry shortly"
+    }, status_code=202)
+
+async def invalidate_report(db: AsyncSession, interview_id: int):
+    """Drop the stored report; call in the same transaction that changes answers"""
+    await db.execute(delete(InterviewReport).where(InterviewReport.interview_id == interview_id))
+
+def _answers_for_feedback(answers: List[AnswerRow]) -> list:
+    """Per-answer scores with category breakdowns, as the feedback prompt expects"""
     answers_data = []
-    total_score = 0
-    
     for ans in answers:
-        answers_data.append({
-            "question": ans.question,
-            "answer": ans.answer,
-            "score": ans.score,
-            "feedback": ans.feedback
-        })
-        total_score += ans.score
-    
-    avg_score = total_score / len(answers_data)
-    
-    # Generate enhanced overall feedback using Gemini AI
-    overall_feedback = scoring_engine.generate_overall_feedback(answers_data)
+        details = json.loads(ans.score_details) if ans.score_details else {}
+        entry = {"question": ans.question, "answer": ans.answer, "score": ans.score}
+        entry.update({c: details.get(c, ans.score) for c in CATEGORIES})
+        answers_data.append(entry)
+    return answers_data
+
+async def _store_report(db: AsyncSession, interview_id: int, answers_data: list, overall_feedback: dict):
+    total_score = sum(a["score"] for a in answers_data)
+    category_averages = {
+        c: round(sum(a[c] for a in answers_data) / len(answers_data), 1) for c in CATEGORIES
+    }
     
-    # Create comprehensive report data
-    report_data = {
-        "interview_id": interview_id,
-        "candidate_name": candidate.name if candidate else "Unknown",
-        "role": interview.role,
-        "total_score": total_score,
-        "average_score": round(avg_score, 1),
-        "answers": answers_data,
+    await invalidate_report(db, interview_id)
+    db.add(InterviewReport(
+        interview_id=interview_id,
+        answer_count=len(answers_data),
+        total_score=total_score,
+        average_score=round(total_score / len(answers_data), 1),
+        category_averages=json.dumps(category_averages),
+        overall_feedback=json.dumps(overall_feedback)
+    ))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request stored the same report first
+        await db.rollback()
+
+async def materialize_report(interview_id: int):
+    """Compute overall feedback and aggregates from the scored answers and store them.
+
+    Runs in its own session so the LLM call does not hold the caller's
+    transaction open.
+    """
+    async with AsyncSessionLocal() as db:
+        answers_data = _answers_for_feedback(await interviews.load_scored_answers(db, interview_id))
+        if not answers_data:
+            return
+        await db.rollback()
+        
+        # Generate enhanced overall feedback using Gemini AI
+        overall_feedback = await scoring_engine.generate_overall_feedback(answers_data)
+        await _store_report(db, interview_id, answers_data, overall_feedback)
+
+def _report_data(view: InterviewView) -> dict:
+    report = view.report
+    overall_feedback = json.loads(report.overall_feedback)
+    return {
+        "interview_id": view.id,
+        "candidate_name": view.candidate_name if view.candidate_name is not None else "Unknown",
+        "role": view.role,
+        "total_score": report.total_score,
+        "average_score": report.average_score,
+        "category_averages": json.loads(report.category_averages),
+        "answers": [
+            {
+                "question": ans.question,
+                "answer": ans.answer,
+                "score": ans.score,
+                "feedback": ans.feedback
+            }
+            for ans in view.answers
+        ],
         "overall_feedback": overall_feedback["overall_feedback"],
         "strengths": overall_feedback["strengths"],
         "areas_for_improvement": overall_feedback.get("critical_weaknesses", []),
@@ -67,71 +128,118 @@ async def get_report(
         "critical_weaknesses": overall_feedback.get("critical_weaknesses", []),
         "hiring_recommendation": overall_feedback.get("hiring_recommendation", "consider")
     }
+
+async def _load_report_data(db: AsyncSession, view: InterviewView, build: bool = True):
+    """Assemble report data from the stored report row, building it if missing"""
+    if view.report is None:
+        if not build:
+            return None
+        await materialize_report(view.id)
+        view = await interviews.load_interview_view(db, view.id)
+        if view is None or view.report is None:
+            return None
+    return _report_data(view)
+
+@router.get("/{interview_id}")
+async def get_report(
+    interview_id: int,
+    request: Request,
+    wait: float = Query(10.0, ge=0, le=60),
+    db: AsyncSession = Depends(get_db)
+):
+    view = await _wait_for_scores(db, interview_id, wait)
+    if view is None:
+        return JSONResponse({"error": "Interview not found"}, status_code=404)
+    
+    if view.pending:
+        return _pending_response(view.pending)
     
-    # Generate PDF with enhanced data
-    pdf_path = pdf_reporter.generate_enhanced_pdf_report(report_data)
+    report_data = await _load_report_data(db, view)
+    if report_data is None:
+        return JSONResponse({"error": "No answers found for this interview"}, status_code=404)
+    
+    # Render the PDF once per distinct report; the content hash is the ETag
+    etag = f'"{artifact_store.content_key(report_data)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    pdf_path, _ = await artifact_store.get_or_render(
+        report_data, pdf_reporter.generate_enhanced_pdf_report
+    )
     
+    # FileResponse answers Range / If-Range requests against our ETag
     return FileResponse(
         pdf_path, 
         filename=f"interview_report_{interview_id}.pdf", 
-        media_type="application/pdf"
+        media_type="application/pdf",
+        headers=headers
     )
 
 @router.get("/{interview_id}/data")
 async def get_report_data(
     interview_id: int,
+    wait: float = Query(10.0, ge=0, le=60),
     db: AsyncSession = Depends(get_db)
 ):
     """Get report data as JSON for frontend display"""
-    interview = await db.get(Interview, interview_id)
-    if not interview:
+    view = await _wait_for_scores(db, interview_id, wait)
+    if view is None:
         return JSONResponse({"error": "Interview not found"}, status_code=404)
     
-    # Get candidate info
-    candidate = await db.get(Candidate, interview.candidate_id)
+    if view.pending:
+        return _pending_response(view.pending)
     
-    # Get all answers for this interview
-    result = await db.execute(
-        select(Answer).where(Answer.interview_id == interview_id)
-    )
-    answers = result.scalars().all()
-    
-    if not answers:
+    report_data = await _load_report_data(db, view)
+    if report_data is None:
         return JSONResponse({"error": "No answers found for this interview"}, status_code=404)
     
-    # Prepare answers data
-    answers_data = []
-    total_score = 0
-    
-    for ans in answers:
-        answers_data.append({
-            "question": ans.question,
-            "answer": ans.answer,
-            "score": ans.score,
-            "feedback": ans.feedback
-        })
-        total_score += ans.score
-    
-    avg_score = total_score / len(answers_data)
-    
-    # Generate enhanced overall feedback using Gemini AI
-    overall_feedback = scoring_engine.generate_overall_feedback(answers_data)
-    
     # Return comprehensive report data
-    return JSONResponse({
-        "interview_id": interview_id,
-        "candidate_name": candidate.name if candidate else "Unknown",
-        "role": interview.role,
-        "total_score": total_score,
-        "average_score": round(avg_score, 1),
-        "answers": answers_data,
-        "overall_feedback": overall_feedback["overall_feedback"],
-        "strengths": overall_feedback["strengths"],
-        "areas_for_improvement": overall_feedback.get("critical_weaknesses", []),
-        "recommendations": overall_feedback["recommendations"],
-        "potential": overall_feedback.get("potential", "medium"),
-        "next_steps": overall_feedback.get("next_steps", []),
-        "category_analysis": overall_feedback.get("category_analysis", {}),
-        "critical_weaknesses": overall_feedback.get("critical_weaknesses", []),
-        "hiring_recommendation": overall_feedback.get("hiring_recommendation", "consider")
-    }) 
\ No newline at end of file
+    return JSONResponse(report_data)
+
+@router.get("/{interview_id}/data/stream")
+async def stream_report_data(
+    interview_id: int,
+    wait: float = Query(10.0, ge=0, le=60),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Report data as Server-Sent Events. If the overall feedback still has to be
+    generated, its text is streamed as "token" events first; the closing
+    "report" event carries the same payload as /report/{id}/data. If an
+    answer is scored while the feedback is generated, the report is already
+    out of date and the stream ends with a "stale" event instead; retry.
+    """
+    view = await _wait_for_scores(db, interview_id, wait)
+    if view is None:
+        return JSONResponse({"error": "Interview not found"}, status_code=404)
+    
+    if view.pending:
+        return _pending_response(view.pending)
+    
+    report_data = await _load_report_data(db, view, build=False)
+    answers_data = None
+    if report_data is None:
+        answers_data = _answers_for_feedback(await interviews.load_scored_answers(db, interview_id))
+        if not answers_data:
+            return JSONResponse({"error": "No answers found for this interview"}, status_code=404)
+    
+    async def events():
+        data = report_data
+        if data is None:
+            async with AsyncSessionLocal() as session:
+                async for kind, value in scoring_engine.stream_overall_feedback(answers_data):
+                    if kind == "token":
+                        yield sse.format_event("token", {"text": value})
+                    else:
+                        await _store_report(session, interview_id, answers_data, value)
+                stored = await interviews.load_interview_view(session, interview_id)
+            if stored is None or stored.report is None:
+                # A newly scored answer invalidated the report that was just stored
+                yield sse.format_event("stale", {"message": "The report changed while it was generated, retry"})
+                return
+            data = _report_data(stored)
+        yield sse.format_event("report", data)
+    
+    return sse.event_stream(events())
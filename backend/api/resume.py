@@ -1,15 +1,64 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from db.queries.session import get_db
 from db.models.models import Candidate
-from services import resume_parser
-import tempfile
-import os
+from services import resume_parser, parse_pool, resume_cache, bulk_ingest, candidate_search
 import json
+import hashlib
+import zipfile
+import shutil
+import asyncio
+import tempfile
 
 router = APIRouter(prefix="/resume", tags=["Resume"])
 
+RESUME_MAX_BYTES = parse_pool.RESUME_MAX_BYTES
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for the multipart framing and form fields around the file itself
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_SPOOL_BYTES = 16 * 1024 * 1024
+
+def _too_large_message(max_bytes: int) -> str:
+    return f"Upload exceeds the {max_bytes / (1024 * 1024):.3g} MB limit"
+
+def _too_large_response(max_bytes: int = RESUME_MAX_BYTES) -> JSONResponse:
+    return JSONResponse({"error": _too_large_message(max_bytes)}, status_code=413)
+
+class UploadSizeLimit:
+    """
+    ASGI middleware that caps the request body of an upload route while it
+    is being received, before the multipart parser buffers or spools it.
+    """
+    def __init__(self, app, path: str = "/resume/upload", max_bytes: int = RESUME_MAX_BYTES):
+        self.app = app
+        self.path = path
+        self.max_bytes = max_bytes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+        
+        limit = self.max_bytes + UPLOAD_OVERHEAD_BYTES
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > limit:
+            await _too_large_response(self.max_bytes)(scope, receive, send)
+            return
+        
+        received = 0
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Surfaces from the body parser as a 413 response
+                    raise HTTPException(status_code=413, detail=_too_large_message(self.max_bytes))
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
 @router.post("/upload")
 async def upload_resume(
     file: UploadFile = File(None), 
@@ -19,12 +68,32 @@ async def upload_resume(
     db: AsyncSession = Depends(get_db)
 ):
     if file:
-        # Save uploaded PDF to a temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-            tmp.write(await file.read())
-            tmp_path = tmp.name
-        result = resume_parser.parse_resume(pdf_path=tmp_path)
-        os.remove(tmp_path)
+        # Copy the upload into memory in chunks, refusing it once it exceeds the cap;
+        # the PDF is parsed straight from this buffer
+        pdf_bytes = bytearray()
+        digest = hashlib.sha256()
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            pdf_bytes += chunk
+            digest.update(chunk)
+            if len(pdf_bytes) > RESUME_MAX_BYTES:
+                return _too_large_response()
+        content_hash = digest.hexdigest()
+        
+        # The same file parsed before is served from the stored parse
+        result = await resume_cache.get(db, content_hash)
+        if result is None:
+            # Parse in the process pool so large PDFs do not block the event loop
+            try:
+                result = await parse_pool.parse_resume(pdf_bytes)
+            except parse_pool.ParseQueueFull:
+                return JSONResponse(
+                    {"error": "Too many resumes are being processed, please retry shortly"},
+                    status_code=429,
+                    headers={"Retry-After": "5"}
+                )
+            except parse_pool.ParseTimeout:
+                return JSONResponse({"error": "Resume took too long to parse"}, status_code=422)
+            await resume_cache.put(db, content_hash, result)
     elif linkedin_url:
         result = resume_parser.parse_resume(linkedin_url=linkedin_url)
     else:
@@ -34,15 +103,61 @@ async def upload_resume(
     candidate = Candidate(
         name=name,
         email=email,
-        resume_text=result.get('text', ''),
+        resume_text=resume_cache.stored_text(result),
+        resume_text_key=result.get('text_key'),
         skills=json.dumps(result.get('skills', []))
     )
     db.add(candidate)
     await db.commit()
     await db.refresh(candidate)
+    await candidate_search.add_parsed(candidate.id, result)
     
     return JSONResponse({
         "candidate_id": candidate.id,
         "skills": result.get('skills', []),
         "text": result.get('text', '')[:500]  # Truncate for response
-    }) 
\ No newline at end of file
+    }) 
+
+def _bulk_busy_response() -> JSONResponse:
+    return JSONResponse(
+        {"error": "Another bulk upload is being processed, please retry shortly"},
+        status_code=429,
+        headers={"Retry-After": "30"}
+    )
+
+@router.post("/bulk")
+async def bulk_upload(file: UploadFile = File(...)):
+    """
+    Ingest a zip of resume PDFs. Streams one JSON line per file (candidate id
+    and skills, or the error) and a closing summary line with totals and
+    throughput. Only BULK_MAX_JOBS ingests run at once; further uploads get 429.
+    """
+    if bulk_ingest.busy():
+        return _bulk_busy_response()
+    # The upload is closed once this handler returns, before the response has
+    # streamed, so the archive is read from a copy the stream owns
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+    await asyncio.to_thread(shutil.copyfileobj, file.file, spool, UPLOAD_CHUNK_SIZE)
+    try:
+        archive = zipfile.ZipFile(spool)
+    except zipfile.BadZipFile:
+        spool.close()
+        return JSONResponse({"error": "Upload must be a zip archive"}, status_code=400)
+    sources = bulk_ingest.zip_sources(archive)
+    if not sources:
+        archive.close()
+        spool.close()
+        return JSONResponse({"error": "No PDF files found in the archive"}, status_code=400)
+    
+    async def lines():
+        try:
+            async for event in bulk_ingest.ingest(sources):
+                yield json.dumps(event) + "\n"
+        except bulk_ingest.BulkIngestBusy:
+            # Another upload started while this one was being received
+            yield json.dumps({"error": "Another bulk upload is being processed, please retry shortly"}) + "\n"
+        finally:
+            archive.close()
+            spool.close()
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,29 +1,146 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-from typing import Dict, List
+from fastapi.websockets import WebSocketState
+from typing import Any, Dict, Optional
+import os
 import json
 import asyncio
 
 router = APIRouter()
 
-# Store active connections by room
-proctor_rooms: Dict[str, List[WebSocket]] = {}
+# Signaling messages relayed between the peers of a room
+RELAYED_TYPES = ("offer", "answer", "ice-candidate")
+# Messages the browser builds with JSON.stringify({type, ...}) start with one
+# of these, so they can be forwarded as received without parsing
+RAW_PREFIXES = tuple(f'{{"type":"{t}"{end}' for t in RELAYED_TYPES for end in (",", "}"))
+
+# Each peer gets its own bounded send queue drained by its own task, so a
+# message is queued for every peer at once and a slow peer only delays
+# itself. A peer whose queue fills up, or whose socket takes longer than
+# PROCTOR_SEND_TIMEOUT to accept a message, is disconnected.
+PROCTOR_SEND_QUEUE = int(os.getenv("PROCTOR_SEND_QUEUE", "256"))
+PROCTOR_SEND_TIMEOUT = float(os.getenv("PROCTOR_SEND_TIMEOUT", "5"))
+
+# Close code for evicted peers: 1013 "try again later"
+SLOW_PEER_CLOSE_CODE = 1013
+
+_stats = {"relayed": 0, "deliveries": 0, "parsed": 0, "ignored": 0, "evicted": 0}
+_closing: set = set()
+
+class ProctorPeer:
+    """A connected socket with its send queue and the task that drains it"""
+    __slots__ = ("websocket", "room", "queue", "sender")
+
+    def __init__(self, websocket: WebSocket, room: str):
+        self.websocket = websocket
+        self.room = room
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=PROCTOR_SEND_QUEUE)
+        self.sender: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.sender = asyncio.create_task(self._send_loop())
+
+    async def _send_loop(self):
+        try:
+            while True:
+                text = await self.queue.get()
+                # asyncio.timeout rather than wait_for, which wraps every send in a new task
+                async with asyncio.timeout(PROCTOR_SEND_TIMEOUT):
+                    await self.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Timed out or the socket is gone
+            _evict(self)
+
+    def offer(self, text: str) -> bool:
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def stop(self):
+        if self.sender is not None and self.sender is not asyncio.current_task():
+            self.sender.cancel()
+            await asyncio.gather(self.sender, return_exceptions=True)
+
+# Active peers by room
+proctor_rooms: Dict[str, Dict[WebSocket, ProctorPeer]] = {}
+
+def _leave(peer: ProctorPeer) -> bool:
+    """Remove the peer from its room; False if it had already left"""
+    peers = proctor_rooms.get(peer.room)
+    if peers is None or peers.get(peer.websocket) is not peer:
+        return False
+    del peers[peer.websocket]
+    if not peers:
+        del proctor_rooms[peer.room]
+    return True
+
+async def _close_evicted(peer: ProctorPeer):
+    await peer.stop()
+    try:
+        await peer.websocket.close(code=SLOW_PEER_CLOSE_CODE)
+    except Exception:
+        pass
+
+def _evict(peer: ProctorPeer):
+    """Drop a peer that cannot keep up; its own receive loop ends when the close lands"""
+    if not _leave(peer):
+        return
+    _stats["evicted"] += 1
+    print(f"Proctor relay: disconnecting slow peer in room '{peer.room}'")
+    task = asyncio.get_running_loop().create_task(_close_evicted(peer))
+    # Keep a reference until the close is done so it is not garbage collected
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+def _is_relayed(data: str) -> bool:
+    if data.startswith(RAW_PREFIXES):
+        return True
+    # Not in the browser's layout: parse to check the type, but still forward the original text
+    _stats["parsed"] += 1
+    try:
+        message = json.loads(data)
+    except ValueError:
+        return False
+    return isinstance(message, dict) and message.get("type") in RELAYED_TYPES
+
+def _relay(sender: ProctorPeer, data: str):
+    """Queue ``data`` for every other peer in the sender's room without waiting on any of them"""
+    _stats["relayed"] += 1
+    for peer in list(proctor_rooms.get(sender.room, {}).values()):
+        if peer is sender:
+            continue
+        if peer.offer(data):
+            _stats["deliveries"] += 1
+        else:
+            _evict(peer)
+
+def stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "rooms": len(proctor_rooms),
+        "peers": sum(len(peers) for peers in proctor_rooms.values())
+    }
 
 @router.websocket("/ws/proctor")
 async def proctor_signaling(websocket: WebSocket, room: str = Query("default")):
     await websocket.accept()
-    if room not in proctor_rooms:
-        proctor_rooms[room] = []
-    proctor_rooms[room].append(websocket)
+    peer = ProctorPeer(websocket, room)
+    peer.start()
+    proctor_rooms.setdefault(room, {})[websocket] = peer
     try:
-        while True:
+        # Ends once the socket is closed, including by eviction
+        while websocket.application_state == WebSocketState.CONNECTED:
             data = await websocket.receive_text()
-            message = json.loads(data)
             # Relay signaling messages to all other peers in the room
-            if message["type"] in ["offer", "answer", "ice-candidate"]:
-                for peer in proctor_rooms[room]:
-                    if peer != websocket:
-                        await peer.send_text(json.dumps(message))
+            if _is_relayed(data):
+                _relay(peer, data)
+            else:
+                _stats["ignored"] += 1
     except WebSocketDisconnect:
-        proctor_rooms[room].remove(websocket)
-        if not proctor_rooms[room]:
-            del proctor_rooms[room] 
\ No newline at end of file
+        pass
+    finally:
+        _leave(peer)
+        await peer.stop()
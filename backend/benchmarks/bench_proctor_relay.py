@@ -0,0 +1,176 @@
+"""
+Proctor signaling relay under many rooms and peers.
+
+Runs the relay with in-memory sockets against the previous handler (parse
+each message, re-serialize it per peer and await every peer's send in
+turn). Each room has fast peers that all signal each other and,
+depending on the scenario, listeners that are slow (every send takes
+--slow-ms) or stalled (sends never complete). Reports how long the fast
+peers take to receive every message, and how many listeners the relay
+disconnected. Run from the backend directory:
+
+    python -m benchmarks.bench_proctor_relay [--rooms 200] [--peers 4] [--messages 25] [--queue 256] [--send-timeout 1]
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+from fastapi import WebSocketDisconnect
+from fastapi.websockets import WebSocketState
+from api import websocket as relay
+
+# The previous handler gets this long before a scenario counts as stalled
+LEGACY_TIMEOUT = 10.0
+
+
+class FakeSocket:
+    """Just enough of a WebSocket for the relay: an inbox to receive from and a send delay"""
+
+    def __init__(self, send_delay: Optional[float], expected: int = 0):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.send_delay = send_delay  # None: sends never complete
+        self.application_state = WebSocketState.CONNECTED
+        self.received = 0
+        self.expected = expected
+        self.done = asyncio.Event()
+        if not expected:
+            self.done.set()
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self) -> str:
+        text = await self.inbox.get()
+        if text is None:
+            raise WebSocketDisconnect(1000)
+        return text
+
+    async def send_text(self, text: str):
+        if self.send_delay is None:
+            await asyncio.Event().wait()
+        elif self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.received += 1
+        if self.received == self.expected:
+            self.done.set()
+
+    async def close(self, code: int = 1000):
+        self.application_state = WebSocketState.DISCONNECTED
+        self.inbox.put_nowait(None)
+
+
+legacy_rooms: Dict[str, List[FakeSocket]] = {}
+
+
+async def legacy_signaling(websocket, room: str):
+    """The handler as it was: parse, then json.dumps and await each peer's send in turn"""
+    await websocket.accept()
+    if room not in legacy_rooms:
+        legacy_rooms[room] = []
+    legacy_rooms[room].append(websocket)
+    try:
+        while True:
+            data = await websocket.receive_text()
+            message = json.loads(data)
+            if message["type"] in ["offer", "answer", "ice-candidate"]:
+                for peer in legacy_rooms[room]:
+                    if peer != websocket:
+                        await peer.send_text(json.dumps(message))
+    except WebSocketDisconnect:
+        legacy_rooms[room].remove(websocket)
+        if not legacy_rooms[room]:
+            del legacy_rooms[room]
+
+
+def signaling_messages(count: int, rng: random.Random) -> List[str]:
+    """Offers, answers and ICE candidates laid out as the browser's JSON.stringify sends them"""
+    messages = []
+    for _ in range(count):
+        kind = rng.choice(["offer", "answer", "ice-candidate", "ice-candidate", "ice-candidate"])
+        if kind == "ice-candidate":
+            body = {"candidate": {
+                "candidate": f"candidate:{rng.getrandbits(32)} 1 udp {rng.getrandbits(31)} "
+                             f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)} {rng.randint(1024, 65535)} typ host",
+                "sdpMid": "0", "sdpMLineIndex": 0
+            }}
+        else:
+            sdp = "\r\n".join(f"a=fingerprint:sha-256 {rng.getrandbits(128):032x}" for _ in range(24))
+            body = {kind: {"type": kind, "sdp": sdp}}
+        messages.append(json.dumps({"type": kind, **body}, separators=(",", ":")))
+    return messages
+
+
+async def run_scenario(handler, rooms: int, peers: int, messages: int, listeners: int,
+                       listener_delay: Optional[float], timeout: float) -> Optional[dict]:
+    rng = random.Random(7)
+    payloads = signaling_messages(messages, rng)
+    fast: List[FakeSocket] = []
+    tasks = []
+    for room in range(rooms):
+        room_sockets = [FakeSocket(0, expected=(peers - 1) * messages) for _ in range(peers)]
+        room_sockets += [FakeSocket(listener_delay) for _ in range(listeners)]
+        fast += room_sockets[:peers]
+        for socket in room_sockets:
+            tasks.append(asyncio.create_task(handler(socket, f"room-{room}")))
+    await asyncio.sleep(0)  # let every handler join its room
+
+    start = time.perf_counter()
+    for socket in fast:
+        for payload in payloads:
+            socket.inbox.put_nowait(payload)
+    try:
+        await asyncio.wait_for(asyncio.gather(*(socket.done.wait() for socket in fast)), timeout)
+        elapsed = time.perf_counter() - start
+    except asyncio.TimeoutError:
+        elapsed = None
+    if listener_delay is None and handler is relay.proctor_signaling:
+        # Give the relay time to evict the stalled listeners
+        await asyncio.sleep(relay.PROCTOR_SEND_TIMEOUT + 0.1)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    relay.proctor_rooms.clear()
+    legacy_rooms.clear()
+    if elapsed is None:
+        return None
+    deliveries = sum(socket.received for socket in fast)
+    return {"seconds": elapsed, "rate": deliveries / elapsed}
+
+
+def run(rooms: int, peers: int, messages: int, slow_ms: float) -> None:
+    scenarios = [
+        ("all fast", 0, 0.0),
+        (f"+1 slow ({slow_ms:g} ms)", 1, slow_ms / 1000),
+        ("+1 stalled", 1, None),
+    ]
+    print(f"{rooms} rooms x {peers} peers, {messages} messages per peer "
+          f"({rooms * peers * (peers - 1) * messages} deliveries to fast peers)")
+    print(f"{'scenario':<22} {'impl':<8} {'seconds':>9} {'deliveries/s':>13} {'evicted':>8}")
+    for name, listeners, delay in scenarios:
+        for impl, handler in (("legacy", legacy_signaling), ("relay", relay.proctor_signaling)):
+            evicted_before = relay._stats["evicted"]
+            timeout = LEGACY_TIMEOUT if impl == "legacy" else LEGACY_TIMEOUT + relay.PROCTOR_SEND_TIMEOUT
+            result = asyncio.run(run_scenario(handler, rooms, peers, messages, listeners, delay, timeout))
+            evicted = relay._stats["evicted"] - evicted_before if impl == "relay" else "-"
+            if result is None:
+                print(f"{name:<22} {impl:<8} {'stalled':>9} {'-':>13} {evicted:>8}")
+            else:
+                print(f"{name:<22} {impl:<8} {result['seconds']:>9.3f} {result['rate']:>13.0f} {evicted:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--peers", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=25)
+    parser.add_argument("--slow-ms", type=float, default=5.0)
+    parser.add_argument("--queue", type=int, default=relay.PROCTOR_SEND_QUEUE,
+                        help="Per-peer send queue size (PROCTOR_SEND_QUEUE)")
+    parser.add_argument("--send-timeout", type=float, default=1.0,
+                        help="Seconds before a stalled send evicts its peer (PROCTOR_SEND_TIMEOUT)")
+    args = parser.parse_args()
+    relay.PROCTOR_SEND_QUEUE = args.queue
+    relay.PROCTOR_SEND_TIMEOUT = args.send_timeout
+    run(args.rooms, args.peers, args.messages, args.slow_ms)
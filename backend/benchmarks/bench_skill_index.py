@@ -0,0 +1,91 @@
+"""
+Skill extraction throughput as the taxonomy grows.
+
+Compares the token-trie SkillIndex with the previous approach (one
+case-insensitive word-boundary regex search per term) on synthetic
+resumes. Run from the backend directory:
+
+    python -m benchmarks.bench_skill_index [--resumes 200] [--sizes 21,100,1000,5000,20000]
+"""
+import re
+import time
+import random
+import argparse
+from typing import Dict, List
+from services.skill_index import SkillIndex, default_index
+
+FILLER = (
+    "responsible for designing building and maintaining services across the team with a focus on "
+    "reliability delivery quality customers stakeholders roadmap reviews mentoring hiring quarterly "
+    "goals shipped improved reduced latency cost migrated legacy platform owned incident response"
+).split()
+
+# Above this many terms the per-term regex loop is too slow to be worth timing in full
+LEGACY_MAX_TERMS = 5000
+
+
+def synthetic_taxonomy(size: int, rng: random.Random) -> Dict[str, List[str]]:
+    """The shipped taxonomy, padded with generated skills up to ``size`` canonical entries"""
+    base = {skill: [] for skill in default_index().skills}
+    taxonomy = dict(list(base.items())[:size])
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    while len(taxonomy) < size:
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.choice([1, 1, 2, 3]))]
+        canonical = " ".join(words)
+        taxonomy[canonical] = ["".join(words) + str(rng.randint(1, 9))]
+    return taxonomy
+
+
+def synthetic_resumes(taxonomy: Dict[str, List[str]], count: int, rng: random.Random) -> List[str]:
+    terms = [t for canonical, synonyms in taxonomy.items() for t in [canonical, *synonyms]]
+    resumes = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(600)]
+        for _ in range(40):
+            words.insert(rng.randrange(len(words)), rng.choice(terms).title())
+        resumes.append(" ".join(words))
+    return resumes
+
+
+def legacy_extract(terms: List[str], text: str) -> List[str]:
+    return [t for t in terms if re.search(rf'\b{re.escape(t)}\b', text, re.IGNORECASE)]
+
+
+def run(sizes: List[int], resume_count: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    print(f"{'skills':>8} {'terms':>8} {'build ms':>9} {'index MB/s':>11} {'legacy MB/s':>12} {'speedup':>8}")
+    for size in sizes:
+        taxonomy = synthetic_taxonomy(size, rng)
+        resumes = synthetic_resumes(taxonomy, resume_count, rng)
+        megabytes = sum(len(r) for r in resumes) / 1e6
+
+        start = time.perf_counter()
+        index = SkillIndex(taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for resume in resumes:
+            index.match(resume)
+        index_rate = megabytes / (time.perf_counter() - start)
+
+        legacy_rate = None
+        terms = [t for canonical, synonyms in taxonomy.items() for t in [canonical, *synonyms]]
+        if len(terms) <= LEGACY_MAX_TERMS:
+            sample = resumes[:max(1, resume_count // 10)]
+            start = time.perf_counter()
+            for resume in sample:
+                legacy_extract(terms, resume)
+            legacy_rate = sum(len(r) for r in sample) / 1e6 / (time.perf_counter() - start)
+
+        legacy = f"{legacy_rate:12.2f}" if legacy_rate else f"{'-':>12}"
+        speedup = f"{index_rate / legacy_rate:7.1f}x" if legacy_rate else f"{'-':>8}"
+        print(f"{size:>8} {index.term_count:>8} {build_ms:>9.1f} {index_rate:>11.2f} {legacy} {speedup}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--sizes", default="21,100,1000,5000,20000")
+    args = parser.parse_args()
+    run([int(s) for s in args.sizes.split(",")], args.resumes)
@@ -1,22 +1,18 @@
 import asyncio
 import sys
-import os
 from pathlib import Path
 
 # Add the backend directory to Python path
 backend_path = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_path))
 
-from sqlalchemy.ext.asyncio import create_async_engine
-from db.models.models import Base
-from db.queries.session import DATABASE_URL
+from db.migrations.migrate import migrate
 
+# Kept for existing setup scripts: tables are created and upgraded by the
+# versioned migrations in db/migrations/versions
 async def create_tables():
-    engine = create_async_engine(DATABASE_URL, echo=True)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    await engine.dispose()
+    await migrate()
 
 if __name__ == "__main__":
     asyncio.run(create_tables())
-    print("Database tables created successfully!") 
\ No newline at end of file
+    print("Database tables created successfully!")
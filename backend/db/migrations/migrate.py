@@ -0,0 +1,132 @@
+"""
+Versioned schema migrations.
+
+Each module in versions/ is named NNNN_<name>.py and defines DESCRIPTION
+and upgrade(conn), which runs synchronously on a SQLAlchemy connection.
+Applied versions are recorded in schema_migrations; every migration runs
+in its own transaction together with its record, so a failure leaves the
+database at the previous version. Run it as a deploy step, before the
+app starts:
+
+    cd backend
+    python -m db.migrations.migrate            # apply everything pending
+    python -m db.migrations.migrate --status   # list applied and pending versions
+"""
+import sys
+import asyncio
+import importlib
+from pathlib import Path
+from types import ModuleType
+from typing import List, Optional, Set, Tuple
+
+# Allow running as a script from anywhere, like create_tables.py
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select, insert, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import func
+from db.queries.session import DATABASE_URL, make_engine
+
+VERSIONS_DIR = Path(__file__).parent / "versions"
+
+# Arbitrary key for the Postgres advisory lock that serialises concurrent runs
+MIGRATION_LOCK_KEY = 720_301
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Migration = Tuple[int, ModuleType]
+
+
+def discover() -> List[Migration]:
+    """Every migration in versions/, in version order"""
+    migrations = []
+    for path in sorted(VERSIONS_DIR.glob("[0-9][0-9][0-9][0-9]_*.py")):
+        module = importlib.import_module(f"db.migrations.versions.{path.stem}")
+        migrations.append((int(path.stem[:4]), module))
+    versions = [version for version, _ in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions in {VERSIONS_DIR}")
+    return migrations
+
+
+def _applied(conn: Connection) -> Set[int]:
+    if not inspect(conn).has_table(schema_migrations.name):
+        return set()
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def _apply(conn: Connection, version: int, module: ModuleType) -> bool:
+    """Apply one migration unless another run got there first"""
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    _metadata.create_all(conn)
+    if version in _applied(conn):
+        return False
+    module.upgrade(conn)
+    conn.execute(insert(schema_migrations).values(version=version, description=module.DESCRIPTION))
+    return True
+
+
+async def applied_versions(url: str = DATABASE_URL) -> Set[int]:
+    engine = make_engine(url, echo=False)
+    try:
+        async with engine.connect() as conn:
+            return await conn.run_sync(_applied)
+    finally:
+        await engine.dispose()
+
+
+async def migrate(url: str = DATABASE_URL, target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to ``target`` (default: all); returns the versions applied"""
+    applied = await applied_versions(url)
+    engine = make_engine(url, echo=False)
+    applied_now = []
+    try:
+        for version, module in discover():
+            if version in applied or (target is not None and version > target):
+                continue
+            async with engine.begin() as conn:
+                if await conn.run_sync(_apply, version, module):
+                    print(f"Applied migration {version:04d}: {module.DESCRIPTION}")
+                    applied_now.append(version)
+    finally:
+        await engine.dispose()
+    return applied_now
+
+
+async def status(url: str = DATABASE_URL) -> None:
+    applied = await applied_versions(url)
+    for version, module in discover():
+        state = "applied" if version in applied else "pending"
+        print(f"{version:04d} {state:8} {module.DESCRIPTION}")
+
+
+async def check(url: str = DATABASE_URL) -> None:
+    """Raise if the database is behind the code; called at app startup"""
+    applied = await applied_versions(url)
+    pending = [f"{version:04d}" for version, _ in discover() if version not in applied]
+    if pending:
+        raise RuntimeError(
+            f"Database schema is missing migrations {', '.join(pending)}. "
+            f"Run `python -m db.migrations.migrate` from backend/ first."
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--target", type=int, help="stop after this version")
+    parser.add_argument("--status", action="store_true", help="list migrations and exit")
+    args = parser.parse_args()
+    if args.status:
+        asyncio.run(status())
+    else:
+        applied = asyncio.run(migrate(target=args.target))
+        print(f"{len(applied)} migration(s) applied.")
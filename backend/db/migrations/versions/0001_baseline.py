@@ -0,0 +1,114 @@
+"""Baseline: the schema as it stood before versioned migrations.
+
+Databases created by the old startup create_all may predate some of these
+tables and columns, so missing tables are created and missing columns
+added; on an up-to-date database this is a no-op.
+"""
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, ForeignKey, DateTime, Text, Float, Index,
+    UniqueConstraint, inspect, text
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql import func
+
+DESCRIPTION = "baseline schema"
+
+# Frozen copy of the models at this version; later migrations must not import db.models
+metadata = MetaData()
+
+Table(
+    "candidates", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=True),
+    Column("email", String, nullable=True),
+    Column("resume_text", Text),
+    Column("resume_text_key", String(64), nullable=True),
+    Column("skills", Text),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "interviews", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("candidate_id", Integer, ForeignKey("candidates.id")),
+    Column("role", String),
+    Column("started_at", DateTime(timezone=True), server_default=func.now()),
+    Column("completed_at", DateTime(timezone=True), nullable=True),
+    Column("questions", Text),
+    Column("current_question", Integer, nullable=False, server_default="0"),
+)
+
+Table(
+    "answers", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("interview_id", Integer, ForeignKey("interviews.id")),
+    Column("question", Text),
+    Column("answer", Text),
+    Column("score", Float),
+    Column("feedback", Text),
+    Column("score_details", Text),
+    Column("status", String, nullable=False, server_default="scored"),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "interview_reports", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("interview_id", Integer, ForeignKey("interviews.id"), unique=True, nullable=False),
+    Column("answer_count", Integer, nullable=False),
+    Column("total_score", Float),
+    Column("average_score", Float),
+    Column("category_averages", Text),
+    Column("overall_feedback", Text),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "question_bank", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("role", String, nullable=False),
+    Column("skill", String, nullable=False),
+    Column("difficulty", String, nullable=False),
+    Column("question", Text, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Index("ix_question_bank_role_skill", "role", "skill"),
+)
+
+Table(
+    "resume_parses", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("content_hash", String(64), nullable=False),
+    Column("parser_version", String, nullable=False),
+    Column("text", Text),
+    Column("text_key", String(64), nullable=True),
+    Column("skills", Text),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    UniqueConstraint("content_hash", "parser_version"),
+)
+
+Table(
+    "jobs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("kind", String, nullable=False),
+    Column("payload", Text),
+    Column("status", String, nullable=False, index=True),
+    Column("attempts", Integer, nullable=False),
+    Column("available_at", Float, nullable=False),
+    Column("last_error", Text),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("finished_at", DateTime(timezone=True), nullable=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn)
+
+    # Columns added to existing tables while the schema was managed by create_all
+    inspector = inspect(conn)
+    for table in metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
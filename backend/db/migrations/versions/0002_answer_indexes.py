@@ -0,0 +1,26 @@
+"""Index answers by interview and interviews by candidate; backfill the answer cursor.
+
+Without these, the per-interview answer queries (pending counts while
+scoring, /status, the report) and the candidate's interview lookups scan
+the whole table. Interviews started before the question plan was stored
+get their cursor from the answers already given, so /next never has to
+count them.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "answer and interview indexes, answer cursor backfill"
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_answers_interview_id_status ON answers (interview_id, status)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_interviews_candidate_id ON interviews (candidate_id)"
+    ))
+    conn.execute(text(
+        "UPDATE interviews SET current_question = "
+        "(SELECT count(*) FROM answers WHERE answers.interview_id = interviews.id) "
+        "WHERE questions IS NULL"
+    ))
@@ -0,0 +1,41 @@
+"""Score rollup and histogram tables for /analytics.
+
+They start empty; `python -m services.analytics rebuild` fills them from
+the answers already scored.
+"""
+from sqlalchemy import MetaData, Table, Column, Integer, String, Text, Float, UniqueConstraint
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "score rollup and histogram tables"
+
+metadata = MetaData()
+
+Table(
+    "score_rollups", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("scope", String, nullable=False),
+    Column("key", String, nullable=False),
+    Column("label", Text),
+    Column("metric", String, nullable=False),
+    Column("count", Integer, nullable=False),
+    Column("total", Float, nullable=False),
+    Column("total_sq", Float, nullable=False),
+    Column("min_value", Float),
+    Column("max_value", Float),
+    UniqueConstraint("scope", "key", "metric"),
+)
+
+Table(
+    "score_histograms", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("scope", String, nullable=False),
+    Column("key", String, nullable=False),
+    Column("metric", String, nullable=False),
+    Column("bucket", Integer, nullable=False),
+    Column("count", Integer, nullable=False),
+    UniqueConstraint("scope", "key", "metric", "bucket"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn)
@@ -0,0 +1,54 @@
+"""Compressed text columns, their zstd dictionaries, and the interview archive.
+
+candidates.resume_text, answers.answer and answers.feedback become binary
+columns holding zstd frames (db.models.compressed). Existing values are
+kept as they are and still read back; `python -m services.compression
+train` trains a dictionary per column and compresses them. On Postgres the
+columns are converted to bytea; SQLite stores the frames in the existing
+columns as they are, so nothing is rewritten there.
+"""
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, BigInteger, String, DateTime, LargeBinary, ForeignKey, text, func
+)
+from sqlalchemy.engine import Connection
+
+DESCRIPTION = "compressed text columns, zstd dictionaries and interview archive"
+
+COMPRESSED_COLUMNS = [("candidates", "resume_text"), ("answers", "answer"), ("answers", "feedback")]
+
+metadata = MetaData()
+
+# Referenced by interview_archives; already created by the baseline
+Table("candidates", metadata, Column("id", Integer, primary_key=True))
+
+Table(
+    "compression_dictionaries", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("column_name", String, nullable=False),
+    Column("dict_id", BigInteger, unique=True, nullable=False),
+    Column("data", LargeBinary, nullable=False),
+    Column("sample_count", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "interview_archives", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("interview_id", Integer, unique=True, nullable=False),
+    Column("candidate_id", Integer, ForeignKey("candidates.id"), index=True),
+    Column("role", String),
+    Column("completed_at", DateTime(timezone=True)),
+    Column("archived_at", DateTime(timezone=True), server_default=func.now()),
+    Column("payload", LargeBinary, nullable=False),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn, tables=[
+        metadata.tables["compression_dictionaries"], metadata.tables["interview_archives"]
+    ])
+    if conn.dialect.name == "postgresql":
+        for table, column in COMPRESSED_COLUMNS:
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BYTEA USING convert_to({column}, 'UTF8')"
+            ))
@@ -0,0 +1,66 @@
+"""Start time and average score on archived interviews, for listing and export.
+
+/interviews lists and filters archived interviews alongside live ones
+without opening their documents. Rows archived before this migration get
+both values from their archived document.
+"""
+import json
+from datetime import datetime
+from typing import Dict
+import zstandard
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Float, Integer, LargeBinary, MetaData, String, Table, select, text
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+DESCRIPTION = "archived interview start time and average score"
+
+metadata = MetaData()
+
+archives = Table(
+    "interview_archives", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("payload", LargeBinary),
+    Column("started_at", DateTime(timezone=True)),
+    Column("average_score", Float),
+)
+
+dictionaries = Table(
+    "compression_dictionaries", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("column_name", String),
+    Column("dict_id", BigInteger),
+    Column("data", LargeBinary),
+)
+
+# Frozen copy of how db.models.compressed stored text at this version: a zstd
+# frame naming its dictionary (0 for none), or plain UTF-8
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _decompress(value: bytes, decompressors: Dict[int, zstandard.ZstdDecompressor]) -> str:
+    if not value.startswith(ZSTD_MAGIC):
+        return value.decode("utf-8")
+    dict_id = zstandard.get_frame_parameters(value).dict_id
+    return decompressors[dict_id].decompress(value).decode("utf-8")
+
+
+def upgrade(conn: Connection) -> None:
+    for name in ("started_at", "average_score"):
+        ddl = CreateColumn(archives.c[name]).compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE interview_archives ADD COLUMN {ddl}"))
+
+    # Archived documents may be compressed with trained dictionaries
+    decompressors = {0: zstandard.ZstdDecompressor()}
+    for dict_id, data in conn.execute(select(dictionaries.c.dict_id, dictionaries.c.data)):
+        decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=zstandard.ZstdCompressionDict(bytes(data)))
+    for row_id, payload in conn.execute(select(archives.c.id, archives.c.payload)).all():
+        document = json.loads(payload if isinstance(payload, str) else _decompress(bytes(payload), decompressors))
+        started_at = document["interview"]["started_at"]
+        conn.execute(
+            archives.update().where(archives.c.id == row_id).values(
+                started_at=datetime.fromisoformat(started_at) if started_at else None,
+                average_score=document["report"]["average_score"]
+            )
+        )
@@ -0,0 +1 @@
+# Migration versions, applied in order by db.migrations.migrate
@@ -0,0 +1,106 @@
+import os
+from typing import Dict, Optional
+import zstandard
+from sqlalchemy.types import TypeDecorator, LargeBinary
+
+# Transparent zstd compression for large text columns. Values are stored as
+# zstd frames compressed with the column's active trained dictionary (see
+# services.compression); each frame names its dictionary, so rows written
+# with an older dictionary, or none, still read back. Values too short to
+# gain anything are stored as plain UTF-8, and str values from rows written
+# before the column was compressed are returned as they are.
+DB_COMPRESSION_LEVEL = int(os.getenv("DB_COMPRESSION_LEVEL", "3"))
+DB_COMPRESSION_MIN_BYTES = int(os.getenv("DB_COMPRESSION_MIN_BYTES", "32"))
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"  # cannot start valid UTF-8 text
+
+_dictionaries: Dict[int, zstandard.ZstdCompressionDict] = {}
+_active: Dict[str, int] = {}  # column -> dict_id used for new values
+_compressors: Dict[str, zstandard.ZstdCompressor] = {}
+_decompressors: Dict[int, zstandard.ZstdDecompressor] = {}
+
+
+def register(column: str, dict_id: int, data: bytes, active: bool = True) -> None:
+    """Make a stored dictionary available for reads and, if ``active``, for new values of ``column``"""
+    dictionary = zstandard.ZstdCompressionDict(data)
+    if dictionary.dict_id() != dict_id:
+        raise ValueError(f"Dictionary for {column} has id {dictionary.dict_id()}, expected {dict_id}")
+    _dictionaries[dict_id] = dictionary
+    _decompressors.pop(dict_id, None)
+    if active:
+        _active[column] = dict_id
+        _compressors.pop(column, None)
+
+
+def active_dictionary(column: str) -> Optional[int]:
+    return _active.get(column)
+
+
+def _compressor(column: str) -> zstandard.ZstdCompressor:
+    compressor = _compressors.get(column)
+    if compressor is None:
+        dict_id = _active.get(column)
+        if dict_id is None:
+            compressor = zstandard.ZstdCompressor(level=DB_COMPRESSION_LEVEL)
+        else:
+            dictionary = _dictionaries[dict_id]
+            dictionary.precompute_compress(level=DB_COMPRESSION_LEVEL)
+            compressor = zstandard.ZstdCompressor(level=DB_COMPRESSION_LEVEL, dict_data=dictionary)
+        _compressors[column] = compressor
+    return compressor
+
+
+def _decompressor(dict_id: int) -> zstandard.ZstdDecompressor:
+    decompressor = _decompressors.get(dict_id)
+    if decompressor is None:
+        if dict_id == 0:
+            decompressor = zstandard.ZstdDecompressor()
+        elif dict_id in _dictionaries:
+            decompressor = zstandard.ZstdDecompressor(dict_data=_dictionaries[dict_id])
+        else:
+            # Trained by another process after this one loaded its dictionaries
+            raise LookupError(f"zstd dictionary {dict_id} is not loaded; restart to load new dictionaries")
+        _decompressors[dict_id] = decompressor
+    return decompressor
+
+
+def compress(column: str, text: str) -> bytes:
+    data = text.encode("utf-8")
+    if len(data) < DB_COMPRESSION_MIN_BYTES:
+        return data
+    compressed = _compressor(column).compress(data)
+    return compressed if len(compressed) < len(data) else data
+
+
+def frame_dictionary(value: bytes) -> Optional[int]:
+    """The dictionary a stored value was compressed with: 0 for none, None if it is plain text"""
+    if not value.startswith(ZSTD_MAGIC):
+        return None
+    return zstandard.get_frame_parameters(value).dict_id
+
+
+def decompress(value: bytes) -> str:
+    dict_id = frame_dictionary(value)
+    if dict_id is None:
+        return value.decode("utf-8")
+    return _decompressor(dict_id).decompress(value).decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """Text stored zstd-compressed; ``column`` ("table.column") selects the dictionary"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, column: str):
+        super().__init__()
+        self.column = column
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress(self.column, value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return decompress(bytes(value))
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Float
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Text, Float, LargeBinary, Index, UniqueConstraint
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
+from .compressed import CompressedText
 
 Base = declarative_base()
 
@@ -9,7 +10,8 @@ class Candidate(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=True)
     email = Column(String, nullable=True)
-    resume_text = Column(Text)
+    resume_text = Column(CompressedText('candidates.resume_text'))
+    resume_text_key = Column(String(64), nullable=True)  # full text in services.text_store
     skills = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     interviews = relationship('Interview', back_populates='candidate')
@@ -17,20 +19,132 @@ class Candidate(Base):
 class Interview(Base):
     __tablename__ = 'interviews'
     id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey('candidates.id'))
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), index=True)
     role = Column(String)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Question plan generated once at start (JSON list) and the index of the
+    # question the candidate is currently answering, which is also the number
+    # of answers given so far
+    questions = Column(Text)
+    current_question = Column(Integer, default=0, nullable=False)
     candidate = relationship('Candidate', back_populates='interviews')
     answers = relationship('Answer', back_populates='interview')
 
 class Answer(Base):
     __tablename__ = 'answers'
+    # Per-interview lookups: the report, /status and pending counts while scoring
+    __table_args__ = (Index('ix_answers_interview_id_status', 'interview_id', 'status'),)
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey('interviews.id'))
     question = Column(Text)
-    answer = Column(Text)
+    answer = Column(CompressedText('answers.answer'))
     score = Column(Float)
-    feedback = Column(Text)
+    feedback = Column(CompressedText('answers.feedback'))
+    score_details = Column(Text)  # JSON: per-category scores, strengths, suggestions
+    # "pending" until the background scoring job fills in score/feedback,
+    # then "scored" (or "failed" if the job gave up)
+    status = Column(String, nullable=False, server_default='scored')
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    interview = relationship('Interview', back_populates='answers') 
\ No newline at end of file
+    interview = relationship('Interview', back_populates='answers')
+
+class InterviewReport(Base):
+    """Overall feedback and aggregates, computed once per set of scored answers"""
+    __tablename__ = 'interview_reports'
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(Integer, ForeignKey('interviews.id'), unique=True, nullable=False)
+    answer_count = Column(Integer, nullable=False)
+    total_score = Column(Float)
+    average_score = Column(Float)
+    category_averages = Column(Text)  # JSON
+    overall_feedback = Column(Text)  # JSON from scoring_engine.generate_overall_feedback
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class QuestionBankEntry(Base):
+    """Pre-generated question, pooled by (role, skill); skill '' is the role's general pool"""
+    __tablename__ = 'question_bank'
+    __table_args__ = (Index('ix_question_bank_role_skill', 'role', 'skill'),)
+    id = Column(Integer, primary_key=True, index=True)
+    role = Column(String, nullable=False)
+    skill = Column(String, nullable=False, default='')
+    difficulty = Column(String, nullable=False)  # easy | medium | hard
+    question = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ResumeParse(Base):
+    """Parsed resume, keyed by the SHA-256 of the uploaded file and the parser version"""
+    __tablename__ = 'resume_parses'
+    __table_args__ = (UniqueConstraint('content_hash', 'parser_version'),)
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False)
+    parser_version = Column(String, nullable=False)
+    text = Column(Text)
+    text_key = Column(String(64), nullable=True)  # full text in services.text_store
+    skills = Column(Text)  # JSON list of canonical skills
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class Job(Base):
+    __tablename__ = 'jobs'
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    payload = Column(Text)
+    # pending -> running -> done | failed; a running job whose lease has
+    # expired (worker died) is claimable again while it has attempts left
+    status = Column(String, nullable=False, default='pending', index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(Float, nullable=False)  # epoch seconds: retry backoff / lease expiry
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True) 
+
+class ScoreRollup(Base):
+    """Running count, sum, sum of squares and range of one score metric over a scope
+    ("all", a role, or a question), maintained as answers are scored"""
+    __tablename__ = 'score_rollups'
+    __table_args__ = (UniqueConstraint('scope', 'key', 'metric'),)
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String, nullable=False)  # all | role | question
+    key = Column(String, nullable=False)  # '' for all, the role, or the question's hash
+    label = Column(Text)  # role name or question text, for display
+    metric = Column(String, nullable=False)  # score or a rubric category
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
+    total_sq = Column(Float, nullable=False, default=0.0)
+    min_value = Column(Float, nullable=True)
+    max_value = Column(Float, nullable=True)
+
+class ScoreHistogram(Base):
+    """Answers per score bucket for one metric over a scope, for percentiles"""
+    __tablename__ = 'score_histograms'
+    __table_args__ = (UniqueConstraint('scope', 'key', 'metric', 'bucket'),)
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    metric = Column(String, nullable=False)
+    bucket = Column(Integer, nullable=False)  # see services.analytics.HISTOGRAM_BUCKET_WIDTH
+    count = Column(Integer, nullable=False, default=0)
+
+class CompressionDictionary(Base):
+    """Trained zstd dictionary for a compressed column; the newest one per column compresses new values"""
+    __tablename__ = 'compression_dictionaries'
+    id = Column(Integer, primary_key=True, index=True)
+    column_name = Column(String, nullable=False)  # "table.column", as given to CompressedText
+    dict_id = Column(BigInteger, unique=True, nullable=False)  # zstd's id, written into each frame
+    data = Column(LargeBinary, nullable=False)
+    sample_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class InterviewArchive(Base):
+    """A completed interview moved out of the hot tables by services.archiver: the
+    interview, its answers and its report as one compressed JSON document"""
+    __tablename__ = 'interview_archives'
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(Integer, unique=True, nullable=False)
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), index=True)
+    role = Column(String)
+    # Copied out of the document so archived interviews can be listed and filtered
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    average_score = Column(Float)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    payload = Column(CompressedText('interview_archives.payload'), nullable=False)
@@ -0,0 +1,320 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.models import Candidate, Interview, Answer, InterviewReport, InterviewArchive
+
+# Read models for the interview endpoints. Each loader fetches everything an
+# endpoint needs in one statement (interview, candidate, stored report and
+# ordered answers joined together) and selects only the columns it uses,
+# returning plain slotted records instead of ORM entities. Interviews moved
+# to the archive by services.archiver are read from their archived document
+# when they are no longer in the hot tables.
+
+
+@dataclass(slots=True)
+class AnswerRow:
+    id: int
+    question: str
+    answer: str
+    score: Optional[float]
+    feedback: Optional[str]
+    score_details: Optional[str]  # JSON
+    status: str
+
+
+@dataclass(slots=True)
+class StoredReport:
+    total_score: float
+    average_score: float
+    category_averages: str  # JSON
+    overall_feedback: str  # JSON
+
+
+@dataclass(slots=True)
+class InterviewView:
+    id: int
+    role: Optional[str]
+    completed_at: Optional[datetime]
+    candidate_name: Optional[str]
+    report: Optional[StoredReport]
+    answers: List[AnswerRow] = field(default_factory=list)
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for answer in self.answers if answer.status == "pending")
+
+    def scored_answers(self) -> List[AnswerRow]:
+        return [answer for answer in self.answers if answer.status == "scored"]
+
+
+@dataclass(slots=True)
+class InterviewStatus:
+    id: int
+    questions: Optional[str]  # JSON
+    completed_at: Optional[datetime]
+    counts: Dict[str, int]
+
+
+async def load_interview_view(db: AsyncSession, interview_id: int) -> Optional[InterviewView]:
+    """An interview with its candidate's name, stored report and answers in order, in one query"""
+    result = await db.execute(
+        select(
+            Interview.id, Interview.role, Interview.completed_at, Candidate.name,
+            InterviewReport.total_score, InterviewReport.average_score,
+            InterviewReport.category_averages, InterviewReport.overall_feedback,
+            Answer.id.label("answer_id"), Answer.question, Answer.answer, Answer.score,
+            Answer.feedback, Answer.score_details, Answer.status
+        )
+        .outerjoin(Candidate, Candidate.id == Interview.candidate_id)
+        .outerjoin(InterviewReport, InterviewReport.interview_id == Interview.id)
+        .outerjoin(Answer, Answer.interview_id == Interview.id)
+        .where(Interview.id == interview_id)
+        .order_by(Answer.id)
+    )
+    rows = result.all()
+    if not rows:
+        return await _load_archived_view(db, interview_id)
+
+    first = rows[0]
+    report = None
+    if first.overall_feedback is not None:
+        report = StoredReport(
+            first.total_score, first.average_score, first.category_averages, first.overall_feedback
+        )
+    view = InterviewView(first.id, first.role, first.completed_at, first.name, report)
+    view.answers = [
+        AnswerRow(row.answer_id, row.question, row.answer, row.score, row.feedback, row.score_details, row.status)
+        for row in rows if row.answer_id is not None
+    ]
+    return view
+
+
+async def _load_archive(db: AsyncSession, interview_id: int) -> Optional[dict]:
+    payload = (await db.execute(
+        select(InterviewArchive.payload).where(InterviewArchive.interview_id == interview_id)
+    )).scalar()
+    return json.loads(payload) if payload is not None else None
+
+
+async def _load_archived_view(db: AsyncSession, interview_id: int) -> Optional[InterviewView]:
+    document = await _load_archive(db, interview_id)
+    if document is None:
+        return None
+    interview, report = document["interview"], document["report"]
+    candidate_name = None
+    if interview["candidate_id"] is not None:
+        candidate_name = (await db.execute(
+            select(Candidate.name).where(Candidate.id == interview["candidate_id"])
+        )).scalar()
+    completed_at = interview["completed_at"]
+    view = InterviewView(
+        interview["id"], interview["role"],
+        datetime.fromisoformat(completed_at) if completed_at else None,
+        candidate_name,
+        StoredReport(
+            report["total_score"], report["average_score"], report["category_averages"], report["overall_feedback"]
+        )
+    )
+    view.answers = [
+        AnswerRow(a["id"], a["question"], a["answer"], a["score"], a["feedback"], a["score_details"], a["status"])
+        for a in document["answers"]
+    ]
+    return view
+
+
+async def load_scored_answers(db: AsyncSession, interview_id: int) -> List[AnswerRow]:
+    """Scored answers of an interview, in order, without the interview itself"""
+    result = await db.execute(
+        select(
+            Answer.id, Answer.question, Answer.answer, Answer.score,
+            Answer.feedback, Answer.score_details, Answer.status
+        )
+        .where(Answer.interview_id == interview_id, Answer.status == "scored")
+        .order_by(Answer.id)
+    )
+    return [AnswerRow(*row) for row in result.all()]
+
+
+async def load_interview_status(db: AsyncSession, interview_id: int) -> Optional[InterviewStatus]:
+    """The interview's plan and completion, with its answers counted by status, in one query"""
+    result = await db.execute(
+        select(Interview.id, Interview.questions, Interview.completed_at, Answer.status, func.count(Answer.id))
+        .outerjoin(Answer, Answer.interview_id == Interview.id)
+        .where(Interview.id == interview_id)
+        .group_by(Interview.id, Interview.questions, Interview.completed_at, Answer.status)
+    )
+    rows = result.all()
+    if not rows:
+        return await _load_archived_status(db, interview_id)
+    counts = {status: n for _, _, _, status, n in rows if status is not None}
+    return InterviewStatus(rows[0].id, rows[0].questions, rows[0].completed_at, counts)
+
+
+async def _load_archived_status(db: AsyncSession, interview_id: int) -> Optional[InterviewStatus]:
+    document = await _load_archive(db, interview_id)
+    if document is None:
+        return None
+    interview = document["interview"]
+    counts: Dict[str, int] = {}
+    for answer in document["answers"]:
+        counts[answer["status"]] = counts.get(answer["status"], 0) + 1
+    completed_at = interview["completed_at"]
+    return InterviewStatus(
+        interview["id"], interview["questions"],
+        datetime.fromisoformat(completed_at) if completed_at else None,
+        counts
+    )
+
+
+@dataclass(slots=True)
+class InterviewFilter:
+    role: Optional[str] = None  # matched case-insensitively
+    started_from: Optional[datetime] = None
+    started_to: Optional[datetime] = None
+    completed: Optional[bool] = None
+
+    def conditions(self, model) -> list:
+        """WHERE clauses for Interview or InterviewArchive, which share these columns"""
+        conditions = []
+        if self.role:
+            conditions.append(func.lower(model.role) == self.role.strip().lower())
+        if self.started_from is not None:
+            conditions.append(model.started_at >= self.started_from)
+        if self.started_to is not None:
+            conditions.append(model.started_at < self.started_to)
+        if self.completed is not None:
+            conditions.append(model.completed_at.is_not(None) if self.completed else model.completed_at.is_(None))
+        return conditions
+
+    @property
+    def includes_archive(self) -> bool:
+        # Only completed interviews are archived
+        return self.completed is not False
+
+
+@dataclass(slots=True)
+class InterviewSummary:
+    id: int
+    candidate_id: Optional[int]
+    candidate_name: Optional[str]
+    role: Optional[str]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    average_score: Optional[float]
+    archived: bool
+
+
+@dataclass(slots=True)
+class InterviewExport:
+    interview: InterviewSummary
+    total_score: Optional[float]
+    category_averages: Optional[str]  # JSON
+    answers: List[AnswerRow] = field(default_factory=list)
+
+
+async def list_interviews(db: AsyncSession, filters: InterviewFilter, before: Optional[int],
+                          limit: int) -> List[InterviewSummary]:
+    """Up to ``limit`` interviews with ids below ``before``, newest first, live and archived.
+
+    Each source is read by a keyset query on its id index and the two are
+    merged, so a page costs the same however deep into the list it is.
+    """
+    live = (
+        select(
+            Interview.id, Interview.candidate_id, Candidate.name, Interview.role,
+            Interview.started_at, Interview.completed_at, InterviewReport.average_score
+        )
+        .outerjoin(Candidate, Candidate.id == Interview.candidate_id)
+        .outerjoin(InterviewReport, InterviewReport.interview_id == Interview.id)
+        .where(*filters.conditions(Interview))
+        .order_by(Interview.id.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        live = live.where(Interview.id < before)
+    summaries = [InterviewSummary(*row, archived=False) for row in (await db.execute(live)).all()]
+
+    if filters.includes_archive:
+        archived = (
+            select(
+                InterviewArchive.interview_id, InterviewArchive.candidate_id, Candidate.name,
+                InterviewArchive.role, InterviewArchive.started_at, InterviewArchive.completed_at,
+                InterviewArchive.average_score
+            )
+            .outerjoin(Candidate, Candidate.id == InterviewArchive.candidate_id)
+            .where(*filters.conditions(InterviewArchive))
+            .order_by(InterviewArchive.interview_id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            archived = archived.where(InterviewArchive.interview_id < before)
+        summaries += [InterviewSummary(*row, archived=True) for row in (await db.execute(archived)).all()]
+        summaries.sort(key=lambda summary: summary.id, reverse=True)
+    return summaries[:limit]
+
+
+async def stream_interview_exports(db: AsyncSession, filters: InterviewFilter,
+                                   batch_size: int = 500) -> AsyncIterator[InterviewExport]:
+    """Every matching interview with its answers, one at a time: archived ones first,
+    then live ones, each in id order. Rows come from server-side cursors, so memory
+    stays flat however many interviews there are.
+    """
+    if filters.includes_archive:
+        result = await db.stream(
+            select(InterviewArchive.payload, Candidate.name)
+            .outerjoin(Candidate, Candidate.id == InterviewArchive.candidate_id)
+            .where(*filters.conditions(InterviewArchive))
+            .order_by(InterviewArchive.interview_id)
+            .execution_options(yield_per=50)
+        )
+        async for payload, candidate_name in result:
+            document = json.loads(payload)
+            interview, report = document["interview"], document["report"]
+            summary = InterviewSummary(
+                interview["id"], interview["candidate_id"], candidate_name, interview["role"],
+                datetime.fromisoformat(interview["started_at"]) if interview["started_at"] else None,
+                datetime.fromisoformat(interview["completed_at"]) if interview["completed_at"] else None,
+                report["average_score"], archived=True
+            )
+            yield InterviewExport(summary, report["total_score"], report["category_averages"], [
+                AnswerRow(a["id"], a["question"], a["answer"], a["score"], a["feedback"], a["score_details"], a["status"])
+                for a in document["answers"]
+            ])
+
+    result = await db.stream(
+        select(
+            Interview.id, Interview.candidate_id, Candidate.name, Interview.role,
+            Interview.started_at, Interview.completed_at, InterviewReport.average_score,
+            InterviewReport.total_score, InterviewReport.category_averages,
+            Answer.id.label("answer_id"), Answer.question, Answer.answer, Answer.score,
+            Answer.feedback, Answer.score_details, Answer.status
+        )
+        .outerjoin(Candidate, Candidate.id == Interview.candidate_id)
+        .outerjoin(InterviewReport, InterviewReport.interview_id == Interview.id)
+        .outerjoin(Answer, Answer.interview_id == Interview.id)
+        .where(*filters.conditions(Interview))
+        .order_by(Interview.id, Answer.id)
+        .execution_options(yield_per=batch_size)
+    )
+    # Rows arrive grouped by interview; emit each one when the next begins
+    current: Optional[InterviewExport] = None
+    async for row in result:
+        if current is None or current.interview.id != row.id:
+            if current is not None:
+                yield current
+            current = InterviewExport(
+                InterviewSummary(
+                    row.id, row.candidate_id, row.name, row.role, row.started_at, row.completed_at,
+                    row.average_score, archived=False
+                ),
+                row.total_score, row.category_averages
+            )
+        if row.answer_id is not None:
+            current.answers.append(AnswerRow(
+                row.answer_id, row.question, row.answer, row.score, row.feedback, row.score_details, row.status
+            ))
+    if current is not None:
+        yield current
@@ -1,6 +1,9 @@
 import os
 from pathlib import Path
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import Any, Dict
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 # Get the backend directory path
@@ -8,17 +11,123 @@ BACKEND_DIR = Path(__file__).parent.parent.parent
 
 # Try to get DATABASE_URL from environment, fallback to SQLite in backend directory
 DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
+    "DATABASE_URL",
     f"sqlite+aiosqlite:///{BACKEND_DIR}/ai_interviewer.db"
 )
 
+# Engine profiles: "production" (the default) keeps statement logging off and
+# sizes the pool for a server; "development" echoes every statement. Each
+# setting can be overridden on its own with the DB_* variable of the same name.
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "production": {
+        "echo": False,
+        # Postgres pool: connections kept open, extra ones allowed under bursts
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,  # seconds; below typical server/proxy idle cut-offs
+        "pool_pre_ping": True,
+        # asyncpg prepared statements cached per connection; 0 behind pgbouncer in transaction mode
+        "statement_cache_size": 500,
+        # SQLite: WAL lets readers run alongside the writer; NORMAL syncs at checkpoints only
+        "sqlite_journal_mode": "WAL",
+        "sqlite_synchronous": "NORMAL",
+        "sqlite_busy_timeout": 5000,  # ms a writer waits for the lock instead of failing
+        "sqlite_mmap_size": 256 * 1024 * 1024,
+    },
+    "development": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 100,
+        "sqlite_journal_mode": "WAL",
+        "sqlite_synchronous": "NORMAL",
+        "sqlite_busy_timeout": 5000,
+        "sqlite_mmap_size": 0,
+    },
+}
+
+if DB_PROFILE not in PROFILES:
+    raise ValueError(f"Unknown DB_PROFILE '{DB_PROFILE}', expected one of {', '.join(PROFILES)}")
+
+
+def _setting(name: str) -> Any:
+    default = PROFILES[DB_PROFILE][name]
+    value = os.getenv(f"DB_{name.upper()}")
+    if value is None:
+        return default
+    if isinstance(default, bool):
+        return value == "1"
+    if isinstance(default, int):
+        return int(value)
+    return value
+
+
+SETTINGS: Dict[str, Any] = {name: _setting(name) for name in PROFILES[DB_PROFILE]}
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SETTINGS['sqlite_journal_mode']}")
+    cursor.execute(f"PRAGMA synchronous={SETTINGS['sqlite_synchronous']}")
+    cursor.execute(f"PRAGMA busy_timeout={SETTINGS['sqlite_busy_timeout']}")
+    cursor.execute(f"PRAGMA mmap_size={SETTINGS['sqlite_mmap_size']}")
+    cursor.close()
+
+
+def engine_options(url: str = DATABASE_URL) -> Dict[str, Any]:
+    """create_async_engine arguments for ``url`` under the active profile"""
+    if _is_sqlite(url):
+        # The connection is used from aiosqlite's worker thread
+        return {"echo": SETTINGS["echo"], "connect_args": {"check_same_thread": False}}
+    options = {
+        "echo": SETTINGS["echo"],
+        "pool_size": SETTINGS["pool_size"],
+        "max_overflow": SETTINGS["max_overflow"],
+        "pool_timeout": SETTINGS["pool_timeout"],
+        "pool_recycle": SETTINGS["pool_recycle"],
+        "pool_pre_ping": SETTINGS["pool_pre_ping"],
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            # SQLAlchemy's cache of prepared statements, then asyncpg's own
+            "prepared_statement_cache_size": SETTINGS["statement_cache_size"],
+            "statement_cache_size": SETTINGS["statement_cache_size"],
+        }
+    return options
+
+
+def make_engine(url: str = DATABASE_URL, **overrides) -> AsyncEngine:
+    """An engine for ``url`` with the active profile's pool settings and, for SQLite, pragmas"""
+    new_engine = create_async_engine(url, **{**engine_options(url), **overrides})
+    if _is_sqlite(url):
+        event.listen(new_engine.sync_engine, "connect", _sqlite_pragmas)
+    return new_engine
+
+
+def describe(url: str = DATABASE_URL) -> str:
+    """The effective engine settings, for the startup log (password hidden)"""
+    shown = make_url(url).render_as_string(hide_password=True)
+    if _is_sqlite(url):
+        keys = ["echo", "sqlite_journal_mode", "sqlite_synchronous", "sqlite_busy_timeout", "sqlite_mmap_size"]
+    else:
+        keys = ["echo", "pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"]
+        if make_url(url).get_driver_name() == "asyncpg":
+            keys.append("statement_cache_size")
+    return f"{shown} [{DB_PROFILE}] " + ", ".join(f"{key}={SETTINGS[key]}" for key in keys)
+
+
 # Create async engine
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-    # For SQLite, we need to enable foreign keys
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+engine = make_engine()
 
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
@@ -30,4 +139,4 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
@@ -1,11 +1,7 @@
-import openai
-import os
 from typing import List, Dict, Optional
-from services import question_generator, scoring_engine
+from services import llm_gateway, question_generator, scoring_engine
 
-openai.api_key = os.getenv('OPENAI_API_KEY')
-
-def generate_contextual_questions(skills: List[str], role: str, previous_answers: List[str] = None) -> List[str]:
+async def generate_contextual_questions(skills: List[str], role: str, previous_answers: List[str] = None) -> List[str]:
     """Generate contextual questions based on previous answers and skills"""
     context = f"Role: {role}\nSkills: {', '.join(skills)}"
     if previous_answers:
@@ -25,18 +21,14 @@ def generate_contextual_questions(skills: List[str], role: str, previous_answers
     """
     
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=300
-        )
-        questions = response.choices[0].message.content.strip().split('\n')
+        content = await llm_gateway.generate(prompt, provider="openai", max_tokens=300)
+        questions = content.strip().split('\n')
         return [q.strip() for q in questions if q.strip()]
     except Exception as e:
         print(f"Error generating questions: {e}")
-        return question_generator.generate_questions(skills, role)
+        return await question_generator.generate_questions(skills, role)
 
-def evaluate_answer_advanced(question: str, answer: str, context: str = "") -> Dict:
+async def evaluate_answer_advanced(question: str, answer: str, context: str = "") -> Dict:
     """Advanced answer evaluation using GPT-4"""
     prompt = f"""
     Evaluate this interview answer:
@@ -63,19 +55,15 @@ def evaluate_answer_advanced(question: str, answer: str, context: str = "") -> D
     """
     
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=400
-        )
+        content = await llm_gateway.generate(prompt, provider="openai", max_tokens=400)
         import json
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(content)
         return result
     except Exception as e:
         print(f"Error evaluating answer: {e}")
-        return scoring_engine.score_answer(question, answer)
+        return await scoring_engine.score_answer(question, answer)
 
-def generate_interview_summary(answers: List[str], scores: List[Dict], role: str) -> str:
+async def generate_interview_summary(answers: List[str], scores: List[Dict], role: str) -> str:
     """Generate comprehensive interview summary"""
     prompt = f"""
     Create a professional interview summary for a {role} position.
@@ -95,12 +83,7 @@ def generate_interview_summary(answers: List[str], scores: List[Dict], role: str
     """
     
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=500
-        )
-        return response.choices[0].message.content
+        return await llm_gateway.generate(prompt, provider="openai", max_tokens=500)
     except Exception as e:
         print(f"Error generating summary: {e}")
         return f"Candidate provided {len(answers)} answers with average score."
@@ -0,0 +1,287 @@
+import math
+import json
+import asyncio
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.models import Answer, Interview, InterviewArchive, ScoreRollup, ScoreHistogram
+from db.queries.session import AsyncSessionLocal
+from services import fallback_scorer
+
+# Score analytics kept as running aggregates. Each scored answer adds its
+# score and rubric categories to a rollup row per scope (everything, the
+# interview's role and the question): count, sum and sum of squares, which
+# give the mean and variance, the lowest and highest value, plus a histogram
+# bucket, which gives percentiles. Updates are atomic upserts in the transaction that stores
+# the score, so reading a summary costs the same however many answers
+# there are.
+METRICS = ["score"] + fallback_scorer.CATEGORIES
+SCORE_MAX = 10.0
+HISTOGRAM_BUCKET_WIDTH = 0.5
+BUCKETS = int(SCORE_MAX / HISTOGRAM_BUCKET_WIDTH) + 1  # the last bucket holds exactly SCORE_MAX
+PERCENTILES = (25, 50, 75, 90)
+# Dialects with INSERT ... ON CONFLICT DO UPDATE; elsewhere scores are stored
+# without live rollups, and `python -m services.analytics rebuild` fills them
+UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+_unsupported_warned = False
+
+Scope = Tuple[str, str, Optional[str]]  # (scope, key, label)
+
+
+def role_key(role: Optional[str]) -> str:
+    return (role or "").strip().lower()
+
+
+def question_key(question: Optional[str]) -> str:
+    normalized = " ".join((question or "").lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def _scopes(role: Optional[str], question: Optional[str]) -> List[Scope]:
+    return [
+        ("all", "", None),
+        ("role", role_key(role), role),
+        ("question", question_key(question), question),
+    ]
+
+
+def _metric_values(score_data: Dict[str, Any]) -> Dict[str, float]:
+    """Each metric's value, clamped to 0-10; a missing category counts as the overall score"""
+    values = {}
+    for metric in METRICS:
+        try:
+            value = float(score_data.get(metric, score_data.get("score")))
+        except (TypeError, ValueError):
+            continue
+        if math.isfinite(value):
+            values[metric] = min(max(value, 0.0), SCORE_MAX)
+    return values
+
+
+def _bucket(value: float) -> int:
+    return min(int(value / HISTOGRAM_BUCKET_WIDTH), BUCKETS - 1)
+
+
+def live_rollups(dialect: str) -> bool:
+    """Whether scores can be added to the rollups as they are stored on ``dialect``"""
+    return dialect in UPSERT_DIALECTS
+
+
+def _upsert(dialect: str, model, index: List[str], increments: List[str], extremes: bool = False):
+    """INSERT that adds to the counters of an existing row instead of failing"""
+    stmt = (postgresql if dialect == "postgresql" else sqlite).insert(model)
+    updates = {name: getattr(model, name) + getattr(stmt.excluded, name) for name in increments}
+    if extremes:
+        # SQLite's two-argument min()/max() are scalar, like Postgres' LEAST/GREATEST
+        least, greatest = (func.least, func.greatest) if dialect == "postgresql" else (func.min, func.max)
+        updates["min_value"] = least(model.min_value, stmt.excluded.min_value)
+        updates["max_value"] = greatest(model.max_value, stmt.excluded.max_value)
+    return stmt.on_conflict_do_update(index_elements=index, set_=updates)
+
+
+async def record_score(db: AsyncSession, role: Optional[str], question: Optional[str],
+                       score_data: Dict[str, Any]) -> None:
+    """Add one scored answer to the rollups; call in the transaction that stores the score.
+
+    Does nothing on databases without upserts, so storing the score never fails on its account.
+    """
+    global _unsupported_warned
+    dialect = db.bind.dialect.name
+    if not live_rollups(dialect):
+        if not _unsupported_warned:
+            _unsupported_warned = True
+            print(f"Score rollups are not updated live on {dialect}; run `python -m services.analytics rebuild`")
+        return
+    values = _metric_values(score_data)
+    if not values:
+        return
+    rollups, buckets = [], []
+    for scope, key, label in _scopes(role, question):
+        for metric, value in values.items():
+            rollups.append({"scope": scope, "key": key, "label": label, "metric": metric,
+                            "count": 1, "total": value, "total_sq": value * value,
+                            "min_value": value, "max_value": value})
+            buckets.append({"scope": scope, "key": key, "metric": metric,
+                            "bucket": _bucket(value), "count": 1})
+
+    await db.execute(
+        _upsert(dialect, ScoreRollup, ["scope", "key", "metric"], ["count", "total", "total_sq"], extremes=True),
+        rollups
+    )
+    await db.execute(
+        _upsert(dialect, ScoreHistogram, ["scope", "key", "metric", "bucket"], ["count"]), buckets
+    )
+
+
+def _percentile(histogram: Dict[int, int], count: int, p: float, low: float, high: float) -> float:
+    """Percentile from bucket counts, interpolating linearly inside the bucket
+    and kept within the lowest and highest value seen"""
+    target = p / 100 * count
+    seen = 0
+    for bucket in sorted(histogram):
+        in_bucket = histogram[bucket]
+        if seen + in_bucket >= target:
+            fraction = (target - seen) / in_bucket if in_bucket else 0.0
+            return round(min(max((bucket + fraction) * HISTOGRAM_BUCKET_WIDTH, low), high), 2)
+        seen += in_bucket
+    return high
+
+
+def _metric_summary(count: int, total: float, total_sq: float, low: float, high: float,
+                    histogram: Dict[int, int]) -> Dict[str, Any]:
+    mean = total / count
+    # Sample variance from the running sums; rounding can push it just below zero
+    variance = max(total_sq - count * mean * mean, 0.0) / (count - 1) if count > 1 else 0.0
+    return {
+        "count": count,
+        "mean": round(mean, 2),
+        "variance": round(variance, 3),
+        "stddev": round(math.sqrt(variance), 3),
+        "min": low,
+        "max": high,
+        "percentiles": {f"p{p}": _percentile(histogram, count, p, low, high) for p in PERCENTILES},
+        "histogram": [histogram.get(bucket, 0) for bucket in range(BUCKETS)],
+    }
+
+
+async def summary(db: AsyncSession, scope: str, key: str) -> Optional[Dict[str, Any]]:
+    """Mean, variance and percentiles of every metric for one scope, or None if nothing is scored"""
+    rollups = (await db.execute(
+        select(
+            ScoreRollup.metric, ScoreRollup.label, ScoreRollup.count, ScoreRollup.total, ScoreRollup.total_sq,
+            ScoreRollup.min_value, ScoreRollup.max_value
+        )
+        .where(ScoreRollup.scope == scope, ScoreRollup.key == key)
+    )).all()
+    if not rollups:
+        return None
+    histograms: Dict[str, Dict[int, int]] = defaultdict(dict)
+    result = await db.execute(
+        select(ScoreHistogram.metric, ScoreHistogram.bucket, ScoreHistogram.count)
+        .where(ScoreHistogram.scope == scope, ScoreHistogram.key == key)
+    )
+    for metric, bucket, count in result:
+        histograms[metric][bucket] = count
+
+    metrics = {
+        row.metric: _metric_summary(
+            row.count, row.total, row.total_sq, row.min_value, row.max_value, histograms[row.metric]
+        )
+        for row in rollups if row.count
+    }
+    return {
+        "scope": scope,
+        "key": key,
+        "label": rollups[0].label,
+        "count": metrics.get("score", {}).get("count", 0),
+        "histogram_bucket_width": HISTOGRAM_BUCKET_WIDTH,
+        "metrics": {metric: metrics[metric] for metric in METRICS if metric in metrics},
+    }
+
+
+async def ranked(db: AsyncSession, scope: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    """Roles or questions by number of scored answers, with their overall score mean and spread"""
+    result = await db.execute(
+        select(ScoreRollup.key, ScoreRollup.label, ScoreRollup.count, ScoreRollup.total, ScoreRollup.total_sq)
+        .where(ScoreRollup.scope == scope, ScoreRollup.metric == "score", ScoreRollup.count > 0)
+        .order_by(ScoreRollup.count.desc(), ScoreRollup.key)
+        .limit(limit)
+        .offset(offset)
+    )
+    entries = []
+    for key, label, count, total, total_sq in result:
+        mean = total / count
+        variance = max(total_sq - count * mean * mean, 0.0) / (count - 1) if count > 1 else 0.0
+        entries.append({"key": key, "label": label, "count": count,
+                        "mean": round(mean, 2), "stddev": round(math.sqrt(variance), 3)})
+    return entries
+
+
+async def rebuild(batch_size: int = 5000) -> int:
+    """Recompute every rollup from the scored answers, archived ones included; returns the
+    number of answers read.
+
+    Run it with the server stopped, e.g. after the migration that adds the
+    rollup tables, since scores stored meanwhile could be counted twice.
+    """
+    rollups: Dict[Tuple[str, str, str], List[float]] = defaultdict(lambda: [0, 0.0, 0.0, SCORE_MAX, 0.0])
+    labels: Dict[Tuple[str, str], Optional[str]] = {}
+    buckets: Dict[Tuple[str, str, str, int], int] = defaultdict(int)
+    answers = 0
+
+    def add(role, question, score, score_details):
+        score_data = json.loads(score_details) if score_details else {"score": score}
+        values = _metric_values(score_data)
+        for scope, key, label in _scopes(role, question):
+            labels.setdefault((scope, key), label)
+            for metric, value in values.items():
+                entry = rollups[(scope, key, metric)]
+                entry[0] += 1
+                entry[1] += value
+                entry[2] += value * value
+                entry[3] = min(entry[3], value)
+                entry[4] = max(entry[4], value)
+                buckets[(scope, key, metric, _bucket(value))] += 1
+
+    async with AsyncSessionLocal() as db:
+        # Archived interviews are the oldest, so labels are still taken from the first answers
+        result = await db.stream(
+            select(InterviewArchive.payload)
+            .order_by(InterviewArchive.interview_id)
+            .execution_options(yield_per=100)
+        )
+        async for payload in result.scalars():
+            document = json.loads(payload)
+            for answer in document["answers"]:
+                if answer["status"] == "scored":
+                    answers += 1
+                    add(document["interview"]["role"], answer["question"], answer["score"], answer["score_details"])
+
+        result = await db.stream(
+            select(Interview.role, Answer.question, Answer.score, Answer.score_details)
+            .join(Interview, Interview.id == Answer.interview_id)
+            .where(Answer.status == "scored")
+            .order_by(Answer.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for role, question, score, score_details in result:
+            answers += 1
+            add(role, question, score, score_details)
+
+        await db.execute(delete(ScoreRollup))
+        await db.execute(delete(ScoreHistogram))
+        if rollups:
+            await db.execute(insert(ScoreRollup), [
+                {"scope": scope, "key": key, "label": labels[(scope, key)], "metric": metric,
+                 "count": count, "total": total, "total_sq": total_sq, "min_value": low, "max_value": high}
+                for (scope, key, metric), (count, total, total_sq, low, high) in rollups.items()
+            ])
+            await db.execute(insert(ScoreHistogram), [
+                {"scope": scope, "key": key, "metric": metric, "bucket": bucket, "count": count}
+                for (scope, key, metric, bucket), count in buckets.items()
+            ])
+        await db.commit()
+    return answers
+
+
+if __name__ == "__main__":
+    # Fill the rollups from existing answers, e.g. after upgrading:
+    #   python -m services.analytics rebuild
+    import argparse
+    from services import compression
+
+    parser = argparse.ArgumentParser(description="Maintain the score analytics rollups")
+    parser.add_argument("command", choices=["rebuild"])
+    args = parser.parse_args()
+
+    async def _main() -> int:
+        # Archived interviews may be compressed with trained dictionaries
+        await compression.load()
+        return await rebuild()
+
+    count = asyncio.run(_main())
+    print(f"Rebuilt score rollups from {count} scored answers.")
@@ -0,0 +1,166 @@
+import os
+import json
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, delete, func, exists
+from db.models.models import Interview, Answer, InterviewReport, InterviewArchive
+from db.queries.session import AsyncSessionLocal
+
+# Cold storage for finished interviews. Interviews completed more than
+# ARCHIVE_AFTER_DAYS ago, fully scored and with a stored report, are moved
+# out of the interviews/answers/report tables into one compressed JSON
+# document each in interview_archives. The report endpoints read archived
+# interviews from there (db.queries.interviews), so nothing changes for
+# clients; the hot tables and their indexes stay small.
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))  # 0 disables archiving
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "3600"))  # seconds between runs
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "100"))
+
+_archive_task: Optional[asyncio.Task] = None
+_stats = {"runs": 0, "archived": 0, "last_run": None, "last_error": None}
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _document(interview: Interview, answers: List[Answer], report: InterviewReport) -> Dict[str, Any]:
+    return {
+        "interview": {
+            "id": interview.id,
+            "candidate_id": interview.candidate_id,
+            "role": interview.role,
+            "started_at": _iso(interview.started_at),
+            "completed_at": _iso(interview.completed_at),
+            "questions": interview.questions,
+            "current_question": interview.current_question,
+        },
+        "answers": [
+            {
+                "id": answer.id,
+                "question": answer.question,
+                "answer": answer.answer,
+                "score": answer.score,
+                "feedback": answer.feedback,
+                "score_details": answer.score_details,
+                "status": answer.status,
+                "created_at": _iso(answer.created_at),
+            }
+            for answer in answers
+        ],
+        "report": {
+            "answer_count": report.answer_count,
+            "total_score": report.total_score,
+            "average_score": report.average_score,
+            "category_averages": report.category_averages,
+            "overall_feedback": report.overall_feedback,
+            "created_at": _iso(report.created_at),
+        },
+    }
+
+
+async def archive_batch(cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Archive up to ``batch_size`` interviews completed before ``cutoff``; returns how many"""
+    async with AsyncSessionLocal() as db:
+        # The newest interview always stays: SQLite hands out max(id) + 1 as
+        # the next id, so archiving it would let a new interview reuse its id
+        newest = select(func.max(Interview.id)).scalar_subquery()
+        result = await db.execute(
+            select(Interview, InterviewReport)
+            .join(InterviewReport, InterviewReport.interview_id == Interview.id)
+            .where(
+                Interview.completed_at.is_not(None),
+                Interview.completed_at < cutoff,
+                Interview.id < newest,
+                ~exists().where(Answer.interview_id == Interview.id, Answer.status == "pending")
+            )
+            .order_by(Interview.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            return 0
+
+        ids = [interview.id for interview, _ in rows]
+        answers: Dict[int, List[Answer]] = {interview_id: [] for interview_id in ids}
+        for answer in (await db.execute(
+            select(Answer).where(Answer.interview_id.in_(ids)).order_by(Answer.id)
+        )).scalars():
+            answers[answer.interview_id].append(answer)
+
+        for interview, report in rows:
+            db.add(InterviewArchive(
+                interview_id=interview.id,
+                candidate_id=interview.candidate_id,
+                role=interview.role,
+                started_at=interview.started_at,
+                completed_at=interview.completed_at,
+                average_score=report.average_score,
+                payload=json.dumps(_document(interview, answers[interview.id], report))
+            ))
+        await db.execute(delete(Answer).where(Answer.interview_id.in_(ids)))
+        await db.execute(delete(InterviewReport).where(InterviewReport.interview_id.in_(ids)))
+        await db.execute(delete(Interview).where(Interview.id.in_(ids)))
+        await db.commit()
+    return len(ids)
+
+
+async def archive_older_than(days: int = ARCHIVE_AFTER_DAYS) -> int:
+    """Archive every eligible interview completed more than ``days`` days ago"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    total = 0
+    while True:
+        count = await archive_batch(cutoff)
+        total += count
+        if count < ARCHIVE_BATCH_SIZE:
+            return total
+
+
+async def _archive_loop() -> None:
+    while True:
+        try:
+            count = await archive_older_than()
+            _stats["runs"] += 1
+            _stats["archived"] += count
+            _stats["last_run"] = datetime.now(timezone.utc).isoformat()
+            if count:
+                print(f"Archived {count} interviews completed more than {ARCHIVE_AFTER_DAYS} days ago.")
+        except Exception as e:
+            _stats["last_error"] = str(e)
+            print(f"Interview archiving failed: {e}")
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+
+
+def stats() -> Dict[str, Any]:
+    return {**_stats, "after_days": ARCHIVE_AFTER_DAYS}
+
+
+async def start() -> None:
+    global _archive_task
+    if ARCHIVE_AFTER_DAYS > 0:
+        _archive_task = asyncio.create_task(_archive_loop())
+
+
+async def stop() -> None:
+    if _archive_task is not None:
+        _archive_task.cancel()
+        await asyncio.gather(_archive_task, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    # One-off run, e.g. from a scheduled job with the in-process loop disabled:
+    #   python -m services.archiver --days 30
+    import argparse
+    from services import compression
+
+    parser = argparse.ArgumentParser(description="Move old completed interviews to the archive")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+    args = parser.parse_args()
+
+    async def _main() -> int:
+        # Answers compressed with trained dictionaries are read back before archiving
+        await compression.load()
+        return await archive_older_than(args.days)
+
+    print(f"Archived {asyncio.run(_main())} interviews.")
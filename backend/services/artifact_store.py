@@ -0,0 +1,114 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+# Rendered report files, stored once per distinct report content. The file
+# name is the content hash, which doubles as a strong ETag. Files are
+# evicted least-recently-served first once the directory exceeds
+# ARTIFACT_MAX_BYTES, and unconditionally after ARTIFACT_MAX_AGE seconds.
+BACKEND_DIR = Path(__file__).parent.parent
+
+ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", str(BACKEND_DIR / "artifacts")))
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(500 * 1024 * 1024)))
+ARTIFACT_MAX_AGE = float(os.getenv("ARTIFACT_MAX_AGE", str(7 * 24 * 3600)))
+# Files served this recently are never evicted, so a path handed to a
+# response is still there when the response opens it
+ARTIFACT_SERVE_GRACE = float(os.getenv("ARTIFACT_SERVE_GRACE", "60"))
+
+# Bump when the PDF layout changes so old renders are not served
+PDF_RENDER_VERSION = "1"
+
+# key -> (lock, number of callers holding or waiting for it)
+_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+
+def content_key(data: Dict[str, Any], version: str = PDF_RENDER_VERSION) -> str:
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{version}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+def _path_for(key: str, suffix: str) -> Path:
+    return ARTIFACT_DIR / f"{key}{suffix}"
+
+
+def _render_to(path: Path, data: Dict[str, Any], render: Callable[[Dict[str, Any], str], None]) -> None:
+    # Render next to the final name and rename, so readers never see a partial file
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=ARTIFACT_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        render(data, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def evict() -> int:
+    """Remove expired artifacts, then the oldest ones until under the size cap.
+
+    Files served within the last ARTIFACT_SERVE_GRACE seconds are kept either way.
+    """
+    if not ARTIFACT_DIR.exists():
+        return 0
+    now = time.time()
+    entries = []
+    removed = 0
+    for entry in os.scandir(ARTIFACT_DIR):
+        if not entry.is_file() or entry.name.endswith(".tmp"):
+            continue
+        try:
+            st = entry.stat()
+        except FileNotFoundError:
+            continue  # removed by a concurrent eviction
+        if now - st.st_mtime < ARTIFACT_SERVE_GRACE:
+            continue
+        if now - st.st_mtime > ARTIFACT_MAX_AGE:
+            os.unlink(entry.path)
+            removed += 1
+        else:
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= ARTIFACT_MAX_BYTES:
+            break
+        os.unlink(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+async def get_or_render(data: Dict[str, Any], render: Callable[[Dict[str, Any], str], None],
+                        suffix: str = ".pdf") -> Tuple[str, str]:
+    """Return (path, key) of the artifact for ``data``, rendering it only if missing.
+
+    ``render(data, path)`` writes the file; it runs in a worker thread.
+    """
+    key = content_key(data)
+    path = _path_for(key, suffix)
+    lock, users = _locks.get(key, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    # Counted, so the lock is dropped only once nobody holds or waits for it
+    _locks[key] = (lock, users + 1)
+    try:
+        async with lock:
+            try:
+                # Refresh mtime: eviction treats it as the last-served time
+                os.utime(path)
+            except FileNotFoundError:
+                await asyncio.to_thread(_render_to, path, data, render)
+                await asyncio.to_thread(evict)
+    finally:
+        lock, users = _locks[key]
+        if users > 1:
+            _locks[key] = (lock, users - 1)
+        else:
+            del _locks[key]
+    return str(path), key
@@ -0,0 +1,276 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from db.models.models import Candidate, ResumeParse
+from db.queries.session import AsyncSessionLocal
+from services import parse_pool, resume_cache, candidate_search
+
+# Bulk resume ingestion (a campus drive's worth of CVs at once). Files are
+# handled in windows of BULK_BATCH_SIZE: read and hashed, looked up in the
+# parse cache with one query, parsed across BULK_WORKERS processes, and
+# inserted as candidates with one multi-row INSERT per window. Results are
+# yielded per file as each window completes, then a summary. Each ingest
+# runs its own pool of BULK_WORKERS processes, so at most BULK_MAX_JOBS
+# ingests run at once in a process; beyond that ingest raises BulkIngestBusy.
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", str(os.cpu_count() or 1)))
+BULK_MAX_JOBS = int(os.getenv("BULK_MAX_JOBS", "1"))
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "200"))
+BULK_MAX_BYTES = int(os.getenv("BULK_MAX_BYTES", str(500 * 1024 * 1024)))
+RESUME_MAX_BYTES = parse_pool.RESUME_MAX_BYTES
+
+# (file name, callable returning the file's bytes)
+Source = Tuple[str, Callable[[], bytes]]
+
+_active_jobs = 0
+
+
+class BulkIngestBusy(Exception):
+    pass
+
+
+def busy() -> bool:
+    """True when another ingest would be turned away with BulkIngestBusy"""
+    return _active_jobs >= BULK_MAX_JOBS
+
+
+def directory_sources(directory: str) -> List[Source]:
+    """Every PDF under ``directory``, recursively"""
+    paths = sorted(p for p in Path(directory).rglob("*") if p.is_file() and p.suffix.lower() == ".pdf")
+    return [(str(p.relative_to(directory)), p.read_bytes) for p in paths]
+
+
+def zip_sources(archive: zipfile.ZipFile) -> List[Source]:
+    """Every PDF member of a zip archive; oversized members fail on read"""
+    sources = []
+    for info in archive.infolist():
+        name = info.filename
+        if info.is_dir() or not name.lower().endswith(".pdf") or name.startswith("__MACOSX/"):
+            continue
+
+        def load(info=info) -> bytes:
+            # Check the declared size before inflating, so a zip bomb is never expanded
+            if info.file_size > RESUME_MAX_BYTES:
+                raise ValueError(f"File exceeds the {RESUME_MAX_BYTES} byte limit")
+            return archive.read(info)
+        sources.append((name, load))
+    return sources
+
+
+def _candidate_name(file_name: str) -> str:
+    return Path(file_name).stem.replace("_", " ").replace("-", " ").strip() or file_name
+
+
+def _insert_ignoring_duplicates(dialect: str):
+    """INSERT for resume_parses that skips rows another upload stored meanwhile"""
+    if dialect == "postgresql":
+        return postgresql.insert(ResumeParse).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(ResumeParse).on_conflict_do_nothing()
+    return insert(ResumeParse).prefix_with("IGNORE")
+
+
+class _WorkerPool:
+    """One ingest's worker processes, started on the first parse and replaced when killed"""
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self._starting = asyncio.Lock()
+
+    async def get(self) -> ProcessPoolExecutor:
+        async with self._starting:
+            if self.executor is None:
+                executor = parse_pool.create_executor(self.workers)
+                # Start every worker before any parse is timed; spawned processes
+                # take a while to import the application
+                loop = asyncio.get_running_loop()
+                await asyncio.gather(*(loop.run_in_executor(executor, os.getpid) for _ in range(self.workers)))
+                self.executor = executor
+            return self.executor
+
+    def recycle(self, executor: ProcessPoolExecutor) -> None:
+        if self.executor is executor:
+            self.executor = None
+        parse_pool.terminate_executor(executor)
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+async def _parse_window(pool: _WorkerPool, window: List[Tuple[str, bytes]], timeout: float) -> List[Any]:
+    """Parse results (or exceptions) for each file, in order.
+
+    Only as many files as there are workers are handed to the pool at once,
+    so the timeout covers a file's own parse, not its wait behind others.
+    """
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(pool.workers)
+
+    async def parse(data: bytes):
+        async with slots:
+            # As in parse_pool: a hung parse is stopped by replacing the pool,
+            # and files killed along with it (or by a crash) get one retry
+            for attempt in range(2):
+                executor = await pool.get()
+                future = loop.run_in_executor(executor, parse_pool.parse_job(data))
+                try:
+                    return await asyncio.wait_for(future, timeout)
+                except asyncio.TimeoutError:
+                    pool.recycle(executor)
+                    raise parse_pool.ParseTimeout(f"Resume parsing took longer than {timeout:g}s")
+                except BrokenProcessPool:
+                    pool.recycle(executor)
+                    if attempt:
+                        raise
+
+    return await asyncio.gather(*(parse(data) for _, data in window), return_exceptions=True)
+
+
+async def ingest(sources: Iterable[Source], workers: int = BULK_WORKERS,
+                 batch_size: int = BULK_BATCH_SIZE,
+                 timeout: float = parse_pool.PARSE_TIMEOUT,
+                 index: bool = True) -> AsyncIterator[Dict[str, Any]]:
+    """Parse and store a batch of resumes.
+
+    With ``index`` the candidates are added to this process's search index;
+    outside the server, leave it off and the server indexes them on start.
+
+    Yields {"file", "status": "ok", "candidate_id", "skills", "cached"} or
+    {"file", "status": "error", "error"} per file, then a final
+    {"summary": {...}} with totals and throughput. Raises BulkIngestBusy
+    before the first event when BULK_MAX_JOBS ingests are already running.
+    """
+    global _active_jobs
+    if busy():
+        raise BulkIngestBusy(f"{_active_jobs} bulk ingests are already running")
+    started = time.perf_counter()
+    totals = {"files": 0, "ok": 0, "failed": 0, "cached": 0}
+    version = resume_cache.parser_version()
+    sources = list(sources)
+    pool = _WorkerPool(workers)
+    _active_jobs += 1
+    try:
+        async with AsyncSessionLocal() as db:
+            dialect = db.bind.dialect.name
+            for offset in range(0, len(sources), batch_size):
+                events: Dict[int, Dict[str, Any]] = {}
+                loaded: List[Tuple[int, str, bytes, str]] = []
+                for i, (name, load) in enumerate(sources[offset:offset + batch_size], offset):
+                    try:
+                        data = await asyncio.to_thread(load)
+                        if len(data) > RESUME_MAX_BYTES:
+                            raise ValueError(f"File exceeds the {RESUME_MAX_BYTES} byte limit")
+                    except Exception as e:
+                        events[i] = {"file": name, "status": "error", "error": str(e)}
+                        continue
+                    loaded.append((i, name, data, hashlib.sha256(data).hexdigest()))
+
+                # One lookup for every file in the window that was parsed before
+                hashes = {content_hash for _, _, _, content_hash in loaded}
+                result = await db.execute(
+                    select(ResumeParse.content_hash, ResumeParse.text, ResumeParse.text_key,
+                           ResumeParse.skills).where(
+                        ResumeParse.content_hash.in_(hashes), ResumeParse.parser_version == version
+                    )
+                )
+                known = {
+                    row.content_hash: resume_cache.from_row(row.text, row.text_key, row.skills)
+                    for row in result
+                }
+                await db.rollback()
+
+                # Parse the rest across the worker processes; duplicates within the window parse once
+                to_parse: Dict[str, Tuple[str, bytes]] = {}
+                for _, name, data, content_hash in loaded:
+                    if content_hash not in known:
+                        to_parse.setdefault(content_hash, (name, data))
+                parsed = await _parse_window(pool, list(to_parse.values()), timeout) if to_parse else []
+                fresh = {}
+                parse_errors = {}
+                for content_hash, outcome in zip(to_parse, parsed):
+                    if isinstance(outcome, BaseException):
+                        parse_errors[content_hash] = str(outcome) or type(outcome).__name__
+                    else:
+                        fresh[content_hash] = outcome
+
+                rows, row_files, indexed = [], [], []
+                for i, name, data, content_hash in loaded:
+                    if content_hash in parse_errors:
+                        events[i] = {"file": name, "status": "error", "error": parse_errors[content_hash]}
+                        continue
+                    cached = content_hash in known
+                    parse = known[content_hash] if cached else fresh[content_hash]
+                    rows.append({
+                        "name": _candidate_name(name),
+                        "email": None,
+                        "resume_text": resume_cache.stored_text(parse),
+                        "resume_text_key": parse.get("text_key"),
+                        "skills": json.dumps(parse.get("skills", []))
+                    })
+                    row_files.append((i, name, parse.get("skills", []), cached, parse))
+
+                # Multi-row inserts: new parses for the cache, then the candidates
+                if fresh:
+                    await db.execute(_insert_ignoring_duplicates(dialect), [
+                        {"content_hash": content_hash, "parser_version": version,
+                         "text": resume_cache.stored_text(parse), "text_key": parse.get("text_key"),
+                         "skills": json.dumps(parse.get("skills", []))}
+                        for content_hash, parse in fresh.items()
+                    ])
+                if rows:
+                    result = await db.execute(
+                        insert(Candidate).returning(Candidate.id, sort_by_parameter_order=True), rows
+                    )
+                    for (i, name, skills, cached, parse), candidate_id in zip(row_files, result.scalars()):
+                        events[i] = {"file": name, "status": "ok", "candidate_id": candidate_id,
+                                     "skills": skills, "cached": cached}
+                        indexed.append((candidate_id, parse))
+                await db.commit()
+                if index:
+                    for candidate_id, parse in indexed:
+                        await candidate_search.add_parsed(candidate_id, parse)
+
+                for i in sorted(events):
+                    event = events[i]
+                    totals["files"] += 1
+                    totals["ok" if event["status"] == "ok" else "failed"] += 1
+                    totals["cached"] += 1 if event.get("cached") else 0
+                    yield event
+    finally:
+        _active_jobs -= 1
+        pool.close()
+
+    elapsed = time.perf_counter() - started
+    yield {"summary": {
+        **totals,
+        "seconds": round(elapsed, 2),
+        "files_per_second": round(totals["files"] / elapsed, 2) if elapsed else 0.0
+    }}
+
+
+async def _main(directory: str, workers: int) -> None:
+    async for event in ingest(directory_sources(directory), workers=workers, index=False):
+        print(json.dumps(event))
+
+
+if __name__ == "__main__":
+    # Ingest a directory of PDFs, e.g.:
+    #   python -m services.bulk_ingest /data/campus-drive-cvs --workers 8 > results.ndjson
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parse a directory of resume PDFs into candidates")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=BULK_WORKERS)
+    args = parser.parse_args()
+    asyncio.run(_main(args.directory, args.workers))
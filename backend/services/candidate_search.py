@@ -0,0 +1,338 @@
+import os
+import math
+import json
+import pickle
+import asyncio
+import tempfile
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.engine import make_url
+from db.models.models import Candidate
+from db.queries.session import AsyncSessionLocal, DATABASE_URL
+from services import skill_index, text_store
+
+# Full-text candidate search: an in-memory inverted index over each
+# candidate's resume text and skills, ranked with BM25. Postings are
+# append-only arrays of (candidate id, term frequency), so indexing a new
+# candidate is a few appends and a query is a handful of vectorised passes
+# over the postings of its terms. The index is a cache of the candidates
+# table: it is saved as a snapshot plus an append log of candidates added
+# since, and on startup candidates past the caught-up id are read from the
+# database, which picks up imports made by other processes (the bulk
+# ingestion CLI) and writes from before the index existed. The snapshot
+# records which database it was built from and how many rows it had read;
+# when the database no longer matches, the index is rebuilt from scratch.
+BACKEND_DIR = Path(__file__).parent.parent
+
+CANDIDATE_INDEX_DIR = Path(os.getenv("CANDIDATE_INDEX_DIR", str(BACKEND_DIR / "search_index")))
+# Appended documents after which the log is folded into a new snapshot
+CANDIDATE_INDEX_LOG_MAX = int(os.getenv("CANDIDATE_INDEX_LOG_MAX", "5000"))
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+# Joining words in queries like "kafka and go"; documents keep them
+QUERY_STOPWORDS = {"and", "or", "with", "the", "a", "an", "of", "in", "for", "on", "to"}
+
+SNAPSHOT_VERSION = 2
+CATCH_UP_BATCH = 500
+
+
+def terms(text: str) -> List[str]:
+    """Index terms: the skill tokenizer's tokens, plus the parts of compound ones ("node.js" -> node, js)"""
+    found = []
+    for match in skill_index.TOKEN_RE.finditer(text.lower()):
+        token = match.group()
+        found.append(token)
+        parts = skill_index.PART_RE.findall(token)
+        if len(parts) > 1 or parts[0] != token:
+            found.extend(parts)
+    return found
+
+
+class CandidateIndex:
+    def __init__(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}  # term -> (candidate ids, term frequencies)
+        self._lengths = array("I")  # document length in terms, by candidate id; 0 when not indexed
+        self.total_length = 0
+        self.documents = 0
+        self.caught_up = 0  # every candidate up to this id has been read from the database
+        self.caught_up_rows = 0  # how many candidates that was
+        self.database = _database()
+
+    def indexed(self, candidate_id: int) -> bool:
+        return candidate_id < len(self._lengths) and self._lengths[candidate_id] > 0
+
+    def add(self, candidate_id: int, text: str) -> bool:
+        """Index a candidate; False if it was already indexed or has no terms"""
+        if self.indexed(candidate_id):
+            return False
+        counts = Counter(terms(text))
+        if not counts:
+            return False
+
+        if candidate_id >= len(self._lengths):
+            self._lengths.extend([0] * (candidate_id + 1 - len(self._lengths)))
+        length = sum(counts.values())
+        self._lengths[candidate_id] = length
+        self.total_length += length
+        self.documents += 1
+        for term, count in counts.items():
+            ids, frequencies = self._postings.setdefault(term, (array("I"), array("I")))
+            ids.append(candidate_id)
+            frequencies.append(count)
+        return True
+
+    def search(self, query: str, limit: int = 20, offset: int = 0,
+               match_all: bool = True) -> Tuple[int, List[Tuple[int, float]]]:
+        """(total matches, [(candidate id, score)]) for one page, best first.
+
+        With ``match_all`` a candidate must contain every query term,
+        otherwise any term is enough.
+        """
+        query_terms = list(dict.fromkeys(t for t in terms(query) if t not in QUERY_STOPWORDS))
+        if not query_terms or not self.documents:
+            return 0, []
+        if match_all and any(t not in self._postings for t in query_terms):
+            return 0, []
+
+        lengths = np.frombuffer(self._lengths, dtype=np.uint32).astype(np.float64)
+        average_length = self.total_length / self.documents
+        scores = np.zeros(len(lengths))
+        hits = np.zeros(len(lengths), dtype=np.int32)
+        for term in query_terms:
+            if term not in self._postings:
+                continue
+            ids, frequencies = self._postings[term]
+            ids = np.frombuffer(ids, dtype=np.uint32)
+            tf = np.frombuffer(frequencies, dtype=np.uint32).astype(np.float64)
+            idf = math.log(1 + (self.documents - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[ids] / average_length)
+            # Each candidate appears once per term's postings, so plain fancy-index adds are exact
+            scores[ids] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            hits[ids] += 1
+
+        matched = np.flatnonzero(hits == len(query_terms) if match_all else hits)
+        total = len(matched)
+        end = min(offset + limit, total)
+        if offset >= end:
+            return total, []
+        # Only the first ``end`` results need a full sort
+        matched_scores = scores[matched]
+        if end < total:
+            top = np.argpartition(-matched_scores, end - 1)[:end]
+            matched, matched_scores = matched[top], matched_scores[top]
+        order = np.lexsort((matched, -matched_scores))[offset:end]
+        return total, [(int(matched[i]), round(float(matched_scores[i]), 4)) for i in order]
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION, "postings": self._postings, "lengths": self._lengths,
+            "total_length": self.total_length, "documents": self.documents, "caught_up": self.caught_up,
+            "caught_up_rows": self.caught_up_rows, "database": self.database,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "CandidateIndex":
+        index = cls()
+        index._postings = state["postings"]
+        index._lengths = state["lengths"]
+        index.total_length = state["total_length"]
+        index.documents = state["documents"]
+        index.caught_up = state["caught_up"]
+        index.caught_up_rows = state["caught_up_rows"]
+        index.database = state["database"]
+        return index
+
+
+def _database() -> str:
+    """The database the index belongs to, without its password"""
+    return make_url(DATABASE_URL).render_as_string(hide_password=True)
+
+
+_index = CandidateIndex()
+_log = None
+_log_entries = 0
+_catch_up_task: Optional[asyncio.Task] = None
+
+
+def _snapshot_path() -> Path:
+    return CANDIDATE_INDEX_DIR / "snapshot.pkl"
+
+
+def _log_path() -> Path:
+    return CANDIDATE_INDEX_DIR / "log.ndjson"
+
+
+def _write_snapshot(data: bytes) -> None:
+    # Write next to the final name and rename, so a crash never leaves a partial snapshot
+    CANDIDATE_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CANDIDATE_INDEX_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, _snapshot_path())
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _load() -> Tuple[CandidateIndex, int]:
+    """The saved index: snapshot, then the log replayed over it. Returns (index, log entries)."""
+    index = CandidateIndex()
+    try:
+        with open(_snapshot_path(), "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") == SNAPSHOT_VERSION:
+            index = CandidateIndex.from_state(state)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Candidate index snapshot unreadable, rebuilding: {e}")
+
+    entries = 0
+    try:
+        with open(_log_path(), encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # a torn last line from a crash; the database catch-up covers it
+                index.add(entry["id"], entry["text"])
+                entries += 1
+    except FileNotFoundError:
+        pass
+    return index, entries
+
+
+def _open_log():
+    CANDIDATE_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    return open(_log_path(), "a", encoding="utf-8")
+
+
+async def compact() -> None:
+    """Fold the log into a new snapshot and start an empty log"""
+    global _log, _log_entries
+    # caught_up stays where catch_up left it: candidates indexed as they were
+    # stored can sit above rows from other processes that were never read
+    # Pickle on the loop so no add interleaves; only the file write runs in a thread
+    data = pickle.dumps(_index.to_state(), protocol=pickle.HIGHEST_PROTOCOL)
+    await asyncio.to_thread(_write_snapshot, data)
+    if _log is not None:
+        _log.close()
+    _log = open(_log_path(), "w", encoding="utf-8")
+    _log_entries = 0
+
+
+def document_text(text: str, skills: List[str]) -> str:
+    return "\n".join([text or "", " ".join(skills or [])])
+
+
+async def add(candidate_id: int, text: str, skills: List[str]) -> None:
+    """Index a newly stored candidate and record it in the log"""
+    global _log, _log_entries
+    document = document_text(text, skills)
+    if not _index.add(candidate_id, document):
+        return
+    if _log is None:
+        _log = _open_log()
+    _log.write(json.dumps({"id": candidate_id, "text": document}) + "\n")
+    _log.flush()
+    _log_entries += 1
+    if _log_entries >= CANDIDATE_INDEX_LOG_MAX:
+        await compact()
+
+
+async def add_parsed(candidate_id: int, parsed: Dict[str, Any]) -> None:
+    """Index a candidate from a resume_parser result, reading the full text from the text store"""
+    text = parsed.get("full_text")
+    if text is None and parsed.get("text_key"):
+        text = await text_store.aget(parsed["text_key"])
+    await add(candidate_id, text if text is not None else parsed.get("text", ""), parsed.get("skills", []))
+
+
+async def catch_up() -> int:
+    """Index candidates stored past the caught-up id; returns how many were read"""
+    read = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Candidate.id, Candidate.resume_text, Candidate.resume_text_key, Candidate.skills)
+                .where(Candidate.id > _index.caught_up)
+                .order_by(Candidate.id)
+                .limit(CATCH_UP_BATCH)
+            )
+            rows = result.all()
+        if not rows:
+            return read
+        for candidate_id, resume_text, text_key, skills in rows:
+            # Candidates indexed as they were stored only need counting
+            if not _index.indexed(candidate_id):
+                text = await text_store.aget(text_key) if text_key else None
+                await add(candidate_id, text if text is not None else resume_text, json.loads(skills or "[]"))
+            _index.caught_up = candidate_id
+            _index.caught_up_rows += 1
+        read += len(rows)
+
+
+async def _matches_database(index: CandidateIndex) -> bool:
+    """True if the saved index was built from this database as it is now"""
+    if index.database != _database():
+        return False
+    async with AsyncSessionLocal() as db:
+        rows, last = (await db.execute(
+            select(func.count(Candidate.id), func.max(Candidate.id)).where(Candidate.id <= index.caught_up)
+        )).one()
+    return rows == index.caught_up_rows and (last or 0) == index.caught_up
+
+
+def search(query: str, limit: int = 20, offset: int = 0,
+           match_all: bool = True) -> Tuple[int, List[Tuple[int, float]]]:
+    return _index.search(query, limit, offset, match_all)
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "candidates": _index.documents,
+        "terms": len(_index._postings),
+        "caught_up": _index.caught_up,
+        "log_entries": _log_entries,
+        "catching_up": _catch_up_task is not None and not _catch_up_task.done(),
+    }
+
+
+async def _catch_up_in_background() -> None:
+    try:
+        count = await catch_up()
+        if count:
+            print(f"Candidate index caught up with {count} candidates.")
+            # Save how far the database has been read
+            await compact()
+    except Exception as e:
+        print(f"Candidate index catch-up failed: {e}")
+
+
+async def start() -> None:
+    global _index, _log_entries, _catch_up_task
+    _index, _log_entries = await asyncio.to_thread(_load)
+    if not await _matches_database(_index):
+        print("Candidate index was built from another database or its candidates changed, rebuilding.")
+        _index, _log_entries = CandidateIndex(), 0
+        _log_path().unlink(missing_ok=True)
+    print(f"Candidate index loaded with {_index.documents} candidates.")
+    _catch_up_task = asyncio.create_task(_catch_up_in_background())
+
+
+async def stop() -> None:
+    global _log
+    if _catch_up_task is not None:
+        _catch_up_task.cancel()
+        await asyncio.gather(_catch_up_task, return_exceptions=True)
+    if _log_entries:
+        await compact()
+    if _log is not None:
+        _log.close()
+        _log = None
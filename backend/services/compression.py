@@ -0,0 +1,152 @@
+import os
+import asyncio
+from typing import Any, Dict, List, Optional
+import zstandard
+from sqlalchemy import select, update, func, type_coerce, LargeBinary
+from db.models.models import Candidate, Answer, InterviewArchive, CompressionDictionary
+from db.models import compressed
+from db.queries.session import AsyncSessionLocal
+
+# Trained zstd dictionaries for the compressed text columns. Short texts such
+# as answers and feedback share most of their vocabulary and phrasing, which
+# a dictionary trained on existing rows supplies up front, so each value
+# compresses well on its own. Dictionaries are stored in the database and
+# loaded at startup; training one recompresses the column's existing rows
+# with it. Train with the server stopped, since servers only see
+# dictionaries that existed when they started:
+#   python -m services.compression train
+COMPRESSION_DICT_SIZE = int(os.getenv("COMPRESSION_DICT_SIZE", str(64 * 1024)))
+COMPRESSION_TRAIN_SAMPLES = int(os.getenv("COMPRESSION_TRAIN_SAMPLES", "20000"))
+COMPRESSION_MIN_SAMPLES = int(os.getenv("COMPRESSION_MIN_SAMPLES", "200"))
+RECOMPRESS_BATCH_SIZE = 500
+
+COLUMNS = {
+    "candidates.resume_text": Candidate.resume_text,
+    "answers.answer": Answer.answer,
+    "answers.feedback": Answer.feedback,
+    "interview_archives.payload": InterviewArchive.payload,
+}
+
+
+async def load() -> int:
+    """Register every stored dictionary; the newest per column compresses new values"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CompressionDictionary.column_name, CompressionDictionary.dict_id, CompressionDictionary.data)
+            .order_by(CompressionDictionary.id)
+        )
+        rows = result.all()
+    for column, dict_id, data in rows:
+        compressed.register(column, dict_id, data)
+    return len(rows)
+
+
+async def train(column: str) -> Optional[int]:
+    """Train a dictionary for ``column`` from its most recent values and make it active.
+
+    Returns the dictionary id, or None if there are too few values to train on.
+    """
+    attribute = COLUMNS[column]
+    model = attribute.class_
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(attribute)
+            .where(attribute.is_not(None))
+            .order_by(model.id.desc())
+            .limit(COMPRESSION_TRAIN_SAMPLES)
+        )
+        samples = [value.encode("utf-8") for value in result.scalars() if value]
+        if len(samples) < COMPRESSION_MIN_SAMPLES:
+            return None
+
+        # Training is CPU-bound; keep it off the event loop
+        dictionary = await asyncio.to_thread(
+            zstandard.train_dictionary, COMPRESSION_DICT_SIZE, samples, level=compressed.DB_COMPRESSION_LEVEL
+        )
+        db.add(CompressionDictionary(
+            column_name=column,
+            dict_id=dictionary.dict_id(),
+            data=dictionary.as_bytes(),
+            sample_count=len(samples)
+        ))
+        await db.commit()
+    compressed.register(column, dictionary.dict_id(), dictionary.as_bytes())
+    return dictionary.dict_id()
+
+
+async def recompress(column: str) -> int:
+    """Rewrite the column's values not yet compressed with its active dictionary; returns the count"""
+    attribute = COLUMNS[column]
+    model = attribute.class_
+    active = compressed.active_dictionary(column)
+    # Raw stored bytes, so the current encoding of each value can be checked
+    raw = type_coerce(attribute, LargeBinary)
+    rewritten, last_id = 0, 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(model.id, raw)
+                .where(model.id > last_id, attribute.is_not(None))
+                .order_by(model.id)
+                .limit(RECOMPRESS_BATCH_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                return rewritten
+            last_id = rows[-1][0]
+            for row_id, value in rows:
+                if isinstance(value, str):
+                    text = value
+                else:
+                    value = bytes(value)
+                    if compressed.frame_dictionary(value) == active:
+                        continue
+                    text = compressed.decompress(value)
+                await db.execute(update(model).where(model.id == row_id).values({attribute.key: text}))
+                rewritten += 1
+            await db.commit()
+
+
+async def status() -> List[Dict[str, Any]]:
+    """Per column: rows, stored bytes and the active dictionary"""
+    columns = []
+    async with AsyncSessionLocal() as db:
+        for column, attribute in COLUMNS.items():
+            rows, stored = (await db.execute(
+                select(func.count(), func.coalesce(func.sum(func.length(type_coerce(attribute, LargeBinary))), 0))
+                .where(attribute.is_not(None))
+            )).one()
+            columns.append({
+                "column": column,
+                "rows": rows,
+                "stored_bytes": stored,
+                "dictionary": compressed.active_dictionary(column)
+            })
+    return columns
+
+
+async def _main(command: str, columns: List[str]) -> None:
+    await load()
+    if command == "train":
+        for column in columns:
+            dict_id = await train(column)
+            if dict_id is None:
+                print(f"{column}: fewer than {COMPRESSION_MIN_SAMPLES} values, keeping the current dictionary")
+            else:
+                print(f"{column}: trained dictionary {dict_id}")
+            count = await recompress(column)
+            print(f"{column}: recompressed {count} values")
+    for entry in await status():
+        print(f"{entry['column']}: {entry['rows']} values, {entry['stored_bytes']} bytes, "
+              f"dictionary {entry['dictionary']}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train zstd dictionaries for the compressed text columns")
+    parser.add_argument("command", choices=["train", "status"])
+    parser.add_argument("--column", choices=list(COLUMNS), action="append",
+                        help="Column to train (default: all)")
+    args = parser.parse_args()
+    asyncio.run(_main(args.command, args.column or list(COLUMNS)))
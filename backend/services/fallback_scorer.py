@@ -0,0 +1,253 @@
+import os
+import re
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+# Keyword-based answer scoring, used whenever no LLM provider can score an
+# answer. All indicator vocabularies are compiled into one regular
+# expression, so an answer is scanned once no matter how many terms there
+# are. A term counts when it occurs anywhere in the lower-cased answer,
+# including inside a longer word ("method" in "methodology").
+DEFAULT_VOCABULARIES: Dict[str, List[str]] = {
+    "technical": ['algorithm', 'complexity', 'optimization', 'architecture', 'framework', 'methodology', 'pattern'],
+    "experience": ['project', 'experience', 'worked on', 'implemented', 'developed', 'built'],
+    "problem_solving": ['step', 'approach', 'process', 'method', 'strategy', 'solution'],
+    "critical_thinking": ['consider', 'trade-off', 'alternative', 'challenge', 'limitation', 'future'],
+    "communication": ['clearly', 'specifically', 'example', 'because', 'therefore', 'however'],
+}
+
+# JSON file of {"<vocabulary>": ["term", ...]} overriding any of the defaults
+FALLBACK_VOCABULARY_PATH = os.getenv("FALLBACK_VOCABULARY_PATH")
+
+CATEGORIES = ["technical_depth", "problem_solving", "communication", "experience", "critical_thinking"]
+
+# Every category starts at BASE_SCORE and is adjusted by the rules below,
+# then clamped to 1-10.
+BASE_SCORE = 5
+LONG_ANSWER, SHORT_ANSWER = 200, 100
+
+# (category, delta if longer than LONG_ANSWER, delta if shorter than SHORT_ANSWER)
+LENGTH_RULES = [
+    ("communication", 2, -2),
+    ("experience", 1, -1),
+]
+
+# (vocabulary, category, [(minimum distinct terms found, delta), ...] highest first,
+#  delta when no step applies)
+KEYWORD_RULES = [
+    ("technical", "technical_depth", [(3, 3), (1, 1)], -1),
+    ("technical", "problem_solving", [(3, 2), (1, 1)], 0),
+    ("experience", "experience", [(2, 3), (1, 1)], -2),
+    ("experience", "technical_depth", [(2, 1)], 0),
+    ("problem_solving", "problem_solving", [(2, 2), (1, 1)], 0),
+    ("problem_solving", "critical_thinking", [(2, 1)], 0),
+    ("critical_thinking", "critical_thinking", [(2, 3), (1, 1)], -1),
+    ("communication", "communication", [(3, 2), (1, 1)], 0),
+]
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation over ``terms`` with shared prefixes factored out.
+
+    Optional tails are greedy, so the pattern matches the longest term
+    starting at a position; factoring keeps the regex engine from retrying
+    every term at every character.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class FallbackScorer:
+    def __init__(self, vocabularies: Optional[Dict[str, Iterable[str]]] = None):
+        merged = {name: list(terms) for name, terms in DEFAULT_VOCABULARIES.items()}
+        for name, terms in (vocabularies or {}).items():
+            if name not in merged:
+                raise ValueError(f"Unknown vocabulary '{name}', expected one of {sorted(merged)}")
+            merged[name] = list(terms)
+        self.vocabularies = merged
+        self._names = list(merged)
+        self._position = {name: v for v, name in enumerate(self._names)}
+
+        # term -> indexes of the vocabularies it belongs to
+        members: Dict[str, set] = {}
+        for v, terms in enumerate(merged.values()):
+            for term in terms:
+                term = term.lower()
+                if term:
+                    members.setdefault(term, set()).add(v)
+        self._terms = list(members)
+
+        # At each position the lookahead reports only the longest term that
+        # starts there; every shorter term starting at the same position is
+        # a prefix of it, so credit those along with it.
+        self._credits = {
+            term: [other for other in self._terms if term.startswith(other)]
+            for term in self._terms
+        }
+        self._members = members
+        self._pattern = re.compile("(?=(" + _trie_pattern(self._terms) + "))") if self._terms else None
+
+    def count_matches(self, answer: str) -> List[int]:
+        """Number of distinct terms of each vocabulary found in ``answer``, in a single scan."""
+        found = set()
+        if self._pattern is not None:
+            for term in set(self._pattern.findall(answer.lower())):
+                found.update(self._credits[term])
+        counts = [0] * len(self._names)
+        for term in found:
+            for v in self._members[term]:
+                counts[v] += 1
+        return counts
+
+    def score_batch(self, questions: Sequence[str], answers: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Category scores for many answers at once.
+
+        Returns one integer array per category plus the rounded average as
+        "score", each aligned with ``answers``. ``questions`` is accepted for
+        symmetry with the LLM scorer; the keyword rubric does not use it.
+        """
+        if len(questions) != len(answers):
+            raise ValueError("questions and answers must have the same length")
+        n = len(answers)
+        counts = np.zeros((n, len(self._names)), dtype=np.int64)
+        for i, answer in enumerate(answers):
+            counts[i] = self.count_matches(answer)
+        lengths = np.fromiter((len(a) for a in answers), dtype=np.int64, count=n)
+
+        totals = {c: np.full(n, BASE_SCORE, dtype=np.int64) for c in CATEGORIES}
+        for category, long_delta, short_delta in LENGTH_RULES:
+            totals[category] += np.where(lengths > LONG_ANSWER, long_delta,
+                                         np.where(lengths < SHORT_ANSWER, short_delta, 0))
+        for vocabulary, category, steps, default in KEYWORD_RULES:
+            found = counts[:, self._position[vocabulary]]
+            totals[category] += np.select([found >= t for t, _ in steps], [d for _, d in steps], default)
+
+        scores = {c: np.clip(totals[c], 1, 10) for c in CATEGORIES}
+        scores["score"] = np.round(sum(scores[c] for c in CATEGORIES) / 5, 1)
+        return scores
+
+    def category_scores(self, answer: str) -> Dict[str, int]:
+        """The five category scores for one answer (scalar twin of score_batch)"""
+        found = self.count_matches(answer)
+        totals = {c: BASE_SCORE for c in CATEGORIES}
+        for category, long_delta, short_delta in LENGTH_RULES:
+            if len(answer) > LONG_ANSWER:
+                totals[category] += long_delta
+            elif len(answer) < SHORT_ANSWER:
+                totals[category] += short_delta
+        for vocabulary, category, steps, default in KEYWORD_RULES:
+            count = found[self._position[vocabulary]]
+            totals[category] += next((d for t, d in steps if count >= t), default)
+        return {c: max(1, min(10, totals[c])) for c in CATEGORIES}
+
+    def score(self, question: str, answer: str) -> Dict[str, Any]:
+        """Full score result for one answer, shaped like the LLM scorer's"""
+        return build_result(self.category_scores(answer))
+
+
+def build_result(scores: Dict[str, int]) -> Dict[str, Any]:
+    """Turn the five category scores into the score_answer result with feedback"""
+    technical_depth = scores["technical_depth"]
+    problem_solving = scores["problem_solving"]
+    communication = scores["communication"]
+    experience = scores["experience"]
+    critical_thinking = scores["critical_thinking"]
+
+    # Calculate average score
+    avg_score = (technical_depth + problem_solving + communication + experience + critical_thinking) / 5
+
+    # Generate feedback based on scores
+    strengths = []
+    improvements = []
+    suggestions = []
+
+    if technical_depth >= 7:
+        strengths.append("Strong technical knowledge")
+    else:
+        improvements.append("Could demonstrate deeper technical understanding")
+        suggestions.append("Provide more technical details and specific technologies")
+
+    if problem_solving >= 7:
+        strengths.append("Good problem-solving approach")
+    else:
+        improvements.append("Could show more systematic problem-solving")
+        suggestions.append("Break down problems into steps and explain your reasoning")
+
+    if communication >= 7:
+        strengths.append("Clear communication")
+    else:
+        improvements.append("Could improve clarity and structure")
+        suggestions.append("Organize your thoughts and provide specific examples")
+
+    if experience >= 7:
+        strengths.append("Good practical experience")
+    else:
+        improvements.append("Could provide more specific examples")
+        suggestions.append("Share concrete examples from your work experience")
+
+    if critical_thinking >= 7:
+        strengths.append("Shows critical thinking")
+    else:
+        improvements.append("Could demonstrate more analytical thinking")
+        suggestions.append("Consider trade-offs and alternative approaches")
+
+    if avg_score >= 8:
+        overall_assessment = "Excellent answer demonstrating strong technical knowledge, problem-solving skills, and communication."
+    elif avg_score >= 6:
+        overall_assessment = "Good answer showing solid understanding with room for improvement in specific areas."
+    else:
+        overall_assessment = "Answer needs improvement in multiple areas. Focus on providing more specific examples and technical depth."
+
+    return {
+        "score": round(avg_score, 1),
+        "technical_depth": technical_depth,
+        "problem_solving": problem_solving,
+        "communication": communication,
+        "experience": experience,
+        "critical_thinking": critical_thinking,
+        "feedback": f"Technical Depth: {technical_depth}/10, Problem Solving: {problem_solving}/10, Communication: {communication}/10, Experience: {experience}/10, Critical Thinking: {critical_thinking}/10",
+        "strengths": strengths,
+        "improvements": improvements,
+        "suggestions": suggestions,
+        "overall_assessment": overall_assessment
+    }
+
+
+def _load_vocabularies() -> Optional[Dict[str, List[str]]]:
+    if not FALLBACK_VOCABULARY_PATH:
+        return None
+    with open(FALLBACK_VOCABULARY_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_default = FallbackScorer(_load_vocabularies())
+
+
+def configure(vocabularies: Optional[Dict[str, Iterable[str]]] = None) -> None:
+    """Replace the vocabularies used by the module-level scorer"""
+    global _default
+    _default = FallbackScorer(vocabularies)
+
+
+def score(question: str, answer: str) -> Dict[str, Any]:
+    return _default.score(question, answer)
+
+
+def score_batch(questions: Sequence[str], answers: Sequence[str]) -> Dict[str, np.ndarray]:
+    return _default.score_batch(questions, answers)
@@ -0,0 +1,107 @@
+import os
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.queries.session import AsyncSessionLocal
+
+# Group commit: writes from concurrent requests are collected for a few
+# milliseconds and applied in one session with a single commit, so the
+# write lock is taken and the log flushed once per batch instead of once
+# per request. A caller's future resolves only after the commit that holds
+# its write. Batches commit one at a time; requests arriving meanwhile
+# form the next batch. If anything in a batch fails, the batch is rolled
+# back and each write is retried in its own transaction, so one bad write
+# only fails its own caller.
+GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT_ENABLED", "0") == "1"
+GROUP_COMMIT_WINDOW = float(os.getenv("GROUP_COMMIT_WINDOW", "0.005"))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+
+# Stages its writes in the given session without committing; may run twice
+Work = Callable[[AsyncSession], Awaitable[Any]]
+Pending = Tuple[Work, asyncio.Future]
+
+_pending: List[Pending] = []
+_timer: Optional[asyncio.TimerHandle] = None
+_tasks: set = set()
+_commit_lock: Optional[asyncio.Lock] = None
+_stats = {"batches": 0, "writes": 0, "largest_batch": 0, "split_batches": 0}
+
+
+def _flush() -> None:
+    global _pending, _timer
+    if _timer is not None:
+        _timer.cancel()
+        _timer = None
+    if not _pending:
+        return
+    batch, _pending = _pending, []
+    task = asyncio.get_running_loop().create_task(_run(batch))
+    # Keep a reference until the batch is done so it is not garbage collected
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _apply_each(batch: List[Pending]) -> None:
+    """Fallback after a failed batch: one transaction per write"""
+    for work, future in batch:
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await work(db)
+                await db.commit()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            continue
+        if not future.done():
+            future.set_result(result)
+
+
+async def _run(batch: List[Pending]) -> None:
+    global _commit_lock
+    if _commit_lock is None:
+        _commit_lock = asyncio.Lock()
+    async with _commit_lock:
+        _stats["batches"] += 1
+        _stats["writes"] += len(batch)
+        _stats["largest_batch"] = max(_stats["largest_batch"], len(batch))
+        try:
+            async with AsyncSessionLocal() as db:
+                results = [await work(db) for work, _ in batch]
+                await db.commit()
+        except Exception as e:
+            print(f"Group commit of {len(batch)} writes failed ({e}), retrying them one by one")
+            _stats["split_batches"] += 1
+            await _apply_each(batch)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def submit(work: Work) -> Any:
+    """Run ``work`` in the next batch's session and return its result once committed"""
+    global _timer
+    if not GROUP_COMMIT_ENABLED:
+        async with AsyncSessionLocal() as db:
+            result = await work(db)
+            await db.commit()
+        return result
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _pending.append((work, future))
+    if len(_pending) >= GROUP_COMMIT_MAX_BATCH:
+        _flush()
+    elif _timer is None:
+        _timer = loop.call_later(GROUP_COMMIT_WINDOW, _flush)
+    return await future
+
+
+def stats() -> Dict[str, Any]:
+    batches = _stats["batches"]
+    return {
+        **_stats,
+        "enabled": GROUP_COMMIT_ENABLED,
+        "queued": len(_pending),
+        "mean_batch_size": round(_stats["writes"] / batches, 2) if batches else 0.0
+    }
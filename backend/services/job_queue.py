@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.models import Job
+from db.queries.session import AsyncSessionLocal
+
+# Durable background jobs stored in the application database. Jobs are
+# written in the same transaction as the rows they refer to, so nothing is
+# lost on restart; workers claim them with a lease and retry with backoff.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Finished (done or failed) jobs are deleted this long after they finish
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "168"))
+JOB_SWEEP_INTERVAL = float(os.getenv("JOB_SWEEP_INTERVAL", "300"))  # seconds between sweeps
+
+Handler = Callable[[dict], Awaitable[None]]
+
+_handlers: Dict[str, Handler] = {}
+_failure_handlers: Dict[str, Handler] = {}
+_workers: List[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+
+
+def handler(kind: str, on_failure: Optional[Handler] = None):
+    """Register the coroutine that runs jobs of ``kind``.
+
+    ``on_failure`` runs with the same payload once the job has used up all
+    of its attempts.
+    """
+    def decorator(func: Handler) -> Handler:
+        _handlers[kind] = func
+        if on_failure:
+            _failure_handlers[kind] = on_failure
+        return func
+    return decorator
+
+
+def enqueue(db: AsyncSession, kind: str, payload: dict, delay: float = 0.0) -> Job:
+    """Add a job to the caller's session; it becomes visible on commit.
+
+    Workers will not pick it up for ``delay`` seconds. Call notify() after
+    committing to wake an idle worker immediately.
+    """
+    job = Job(kind=kind, payload=json.dumps(payload), status="pending",
+              attempts=0, available_at=time.time() + delay)
+    db.add(job)
+    return job
+
+
+def notify() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def _claim_next() -> Optional[Job]:
+    """Atomically take the oldest runnable job, or return None."""
+    async with AsyncSessionLocal() as db:
+        while True:
+            now = time.time()
+            # A running job whose lease expired is retried only if it has attempts
+            # left; the sweep fails the others
+            runnable = (
+                ((Job.status == "pending") | ((Job.status == "running") & (Job.attempts < JOB_MAX_ATTEMPTS)))
+                & (Job.available_at <= now)
+            )
+            job_id = (await db.execute(
+                select(Job.id).where(runnable).order_by(Job.id).limit(1)
+            )).scalar()
+            if job_id is None:
+                return None
+            # Conditional update: only one worker can win the claim
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, runnable)
+                .values(status="running", attempts=Job.attempts + 1,
+                        available_at=now + JOB_LEASE_SECONDS)
+            )
+            await db.commit()
+            if result.rowcount == 1:
+                return await db.get(Job, job_id)
+
+
+async def _finish(job: Job, error: Optional[str] = None) -> bool:
+    """Record the outcome of a run; returns True if the job is now dead."""
+    async with AsyncSessionLocal() as db:
+        values = {"last_error": error}
+        dead = False
+        if error is None:
+            values.update(status="done", finished_at=func.now())
+        elif job.attempts >= JOB_MAX_ATTEMPTS:
+            values.update(status="failed", finished_at=func.now())
+            dead = True
+        else:
+            # Exponential backoff: 2s, 4s, 8s, ...
+            values.update(status="pending", available_at=time.time() + 2 ** job.attempts)
+        await db.execute(update(Job).where(Job.id == job.id).values(**values))
+        await db.commit()
+        return dead
+
+
+async def _fail_expired() -> int:
+    """Fail running jobs whose lease expired on their last attempt; returns how many.
+
+    Their worker crashed or the server stopped mid-run, so the failure
+    handler runs here instead.
+    """
+    expired = (Job.status == "running") & (Job.attempts >= JOB_MAX_ATTEMPTS)
+    count = 0
+    async with AsyncSessionLocal() as db:
+        jobs = (await db.execute(
+            select(Job.id, Job.kind, Job.payload).where(expired, Job.available_at <= time.time())
+        )).all()
+        for job_id, kind, payload in jobs:
+            # Conditional update, as in _claim_next: a lease renewed meanwhile is left alone
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, expired, Job.available_at <= time.time())
+                .values(status="failed", finished_at=func.now(),
+                        last_error="Lease expired on the last attempt")
+            )
+            await db.commit()
+            if result.rowcount != 1:
+                continue
+            count += 1
+            print(f"Job {job_id} ({kind}) failed: lease expired on attempt {JOB_MAX_ATTEMPTS}")
+            if kind in _failure_handlers:
+                await _failure_handlers[kind](json.loads(payload) if payload else {})
+    return count
+
+
+async def purge_finished(hours: float = JOB_RETENTION_HOURS) -> int:
+    """Delete done and failed jobs that finished more than ``hours`` ago; returns how many."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(Job).where(Job.status.in_(("done", "failed")), Job.finished_at < cutoff)
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def sweep() -> None:
+    """Fail jobs stuck past their last attempt and purge old finished ones."""
+    await _fail_expired()
+    purged = await purge_finished()
+    if purged:
+        print(f"Purged {purged} finished jobs older than {JOB_RETENTION_HOURS:g} hours.")
+
+
+async def run_one() -> bool:
+    """Claim and run a single job; returns False if there was nothing to do."""
+    job = await _claim_next()
+    if job is None:
+        return False
+
+    payload = json.loads(job.payload) if job.payload else {}
+    func = _handlers.get(job.kind)
+    try:
+        if func is None:
+            raise RuntimeError(f"No handler registered for job kind '{job.kind}'")
+        await func(payload)
+    except Exception as e:
+        print(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}: {e}")
+        if await _finish(job, error=str(e)) and job.kind in _failure_handlers:
+            await _failure_handlers[job.kind](payload)
+    else:
+        await _finish(job)
+    return True
+
+
+async def _sweep_loop():
+    # On its own timer, so expired leases and old rows are handled under constant load too
+    while True:
+        await asyncio.sleep(JOB_SWEEP_INTERVAL)
+        try:
+            await sweep()
+        except Exception as e:
+            print(f"Job sweep error: {e}")
+
+
+async def _worker_loop():
+    while True:
+        try:
+            if await run_one():
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Job worker error: {e}")
+        # Idle: sleep until notified or the next poll tick
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), JOB_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start(workers: int = JOB_WORKERS) -> None:
+    global _wakeup
+    _wakeup = asyncio.Event()
+    for _ in range(workers):
+        _workers.append(asyncio.create_task(_worker_loop()))
+    _workers.append(asyncio.create_task(_sweep_loop()))
+    print(f"Job queue started with {workers} workers.")
+
+
+async def stop() -> None:
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
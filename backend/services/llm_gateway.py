@@ -0,0 +1,259 @@
+import os
+import asyncio
+from typing import AsyncIterator, Callable, Dict, Optional
+
+# Shared, non-blocking entry point for every LLM call made by the services.
+# Each provider gets one pooled client, a concurrency limit and a per-call
+# timeout so a slow provider can never freeze the event loop.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "").lower()  # "fake" replaces every provider
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_FAKE_LATENCY = float(os.getenv("LLM_FAKE_LATENCY", "0"))
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+
+
+class LLMError(Exception):
+    """Raised when a provider call fails, times out or is not configured."""
+
+
+class LLMTimeout(LLMError):
+    pass
+
+
+class GeminiBackend:
+    """Google Gemini through the async gRPC client of google-generativeai."""
+
+    def __init__(self, model_name: str = GEMINI_MODEL):
+        self.model_name = model_name
+        self._model = None
+
+    def available(self) -> bool:
+        return bool(os.getenv("GOOGLE_API_KEY"))
+
+    @property
+    def model_id(self) -> str:
+        return f"gemini:{self.model_name}"
+
+    def _get_model(self):
+        if self._model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    async def generate(self, prompt: str, temperature: Optional[float] = None,
+                       max_tokens: Optional[int] = None) -> str:
+        import google.generativeai as genai
+        config = genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens
+        )
+        response = await self._get_model().generate_content_async(prompt, generation_config=config)
+        return response.text
+
+    async def stream(self, prompt: str, temperature: Optional[float] = None,
+                     max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        import google.generativeai as genai
+        config = genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens
+        )
+        response = await self._get_model().generate_content_async(
+            prompt, generation_config=config, stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    async def aclose(self):
+        self._model = None
+
+
+class OpenAIBackend:
+    """OpenAI chat completions through one pooled AsyncOpenAI client."""
+
+    def __init__(self, model_name: str = OPENAI_MODEL, max_connections: int = LLM_MAX_CONCURRENCY):
+        self.model_name = model_name
+        self.max_connections = max_connections
+        self._client = None
+
+    def available(self) -> bool:
+        return bool(os.getenv("OPENAI_API_KEY"))
+
+    @property
+    def model_id(self) -> str:
+        return f"openai:{self.model_name}"
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                max_retries=0,  # the gateway owns timeouts; callers own fallbacks
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections
+                    )
+                )
+            )
+        return self._client
+
+    def _request(self, prompt: str, temperature: Optional[float], max_tokens: Optional[int]) -> dict:
+        kwargs = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        return kwargs
+
+    async def generate(self, prompt: str, temperature: Optional[float] = None,
+                       max_tokens: Optional[int] = None) -> str:
+        response = await self._get_client().chat.completions.create(
+            **self._request(prompt, temperature, max_tokens)
+        )
+        return response.choices[0].message.content
+
+    async def stream(self, prompt: str, temperature: Optional[float] = None,
+                     max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        response = await self._get_client().chat.completions.create(
+            stream=True, **self._request(prompt, temperature, max_tokens)
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class FakeBackend:
+    """Local stand-in for a provider, for development and load tests.
+
+    ``handler`` maps a prompt to the reply text. The default reply is an empty
+    JSON object, which every service turns into its default result.
+    """
+
+    model_id = "fake"
+
+    def __init__(self, handler: Optional[Callable[[str], str]] = None, latency: float = LLM_FAKE_LATENCY):
+        self.handler = handler or (lambda prompt: "{}")
+        self.latency = latency
+
+    def available(self) -> bool:
+        return True
+
+    async def generate(self, prompt: str, temperature: Optional[float] = None,
+                       max_tokens: Optional[int] = None) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.handler(prompt)
+
+    async def stream(self, prompt: str, temperature: Optional[float] = None,
+                     max_tokens: Optional[int] = None, chunk_size: int = 16) -> AsyncIterator[str]:
+        # The latency is spent before the first chunk, like a real time-to-first-token
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        reply = self.handler(prompt)
+        for i in range(0, len(reply), chunk_size):
+            await asyncio.sleep(0)
+            yield reply[i:i + chunk_size]
+
+    async def aclose(self):
+        pass
+
+
+def _default_backends() -> Dict[str, object]:
+    if LLM_BACKEND == "fake":
+        fake = FakeBackend()
+        return {"gemini": fake, "openai": fake}
+    return {"gemini": GeminiBackend(), "openai": OpenAIBackend()}
+
+
+_backends: Dict[str, object] = _default_backends()
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def set_backend(provider: str, backend) -> None:
+    """Replace the backend for a provider, e.g. with a FakeBackend."""
+    _backends[provider] = backend
+
+
+def _semaphore(provider: str) -> asyncio.Semaphore:
+    semaphore = _semaphores.get(provider)
+    if semaphore is None:
+        semaphore = _semaphores[provider] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return semaphore
+
+
+def available(provider: str = "gemini") -> bool:
+    backend = _backends.get(provider)
+    return backend is not None and backend.available()
+
+
+def model_id(provider: str = "gemini") -> str:
+    """Identifier of the model behind ``provider``, for cache keys and logs."""
+    backend = _backends.get(provider)
+    return backend.model_id if backend is not None else "none"
+
+
+async def generate(prompt: str, provider: str = "gemini", timeout: Optional[float] = None,
+                   temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> str:
+    """Run one completion on ``provider`` without blocking the event loop.
+
+    At most LLM_MAX_CONCURRENCY calls per provider are in flight; the rest
+    wait their turn. Raises LLMError on timeout or misconfiguration.
+    """
+    backend = _backends.get(provider)
+    if backend is None or not backend.available():
+        raise LLMError(f"LLM provider '{provider}' is not configured")
+
+    async with _semaphore(provider):
+        try:
+            return await asyncio.wait_for(
+                backend.generate(prompt, temperature=temperature, max_tokens=max_tokens),
+                timeout or LLM_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            raise LLMTimeout(f"LLM provider '{provider}' timed out after {timeout or LLM_TIMEOUT}s")
+
+
+async def stream(prompt: str, provider: str = "gemini", timeout: Optional[float] = None,
+                 temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+    """Yield completion text from ``provider`` as it is produced.
+
+    Holds one of the provider's concurrency slots until the stream ends; the
+    timeout applies to the wait for each chunk rather than the whole reply.
+    """
+    backend = _backends.get(provider)
+    if backend is None or not backend.available():
+        raise LLMError(f"LLM provider '{provider}' is not configured")
+
+    limit = timeout or LLM_TIMEOUT
+    async with _semaphore(provider):
+        chunks = backend.stream(prompt, temperature=temperature, max_tokens=max_tokens)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), limit)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    raise LLMTimeout(f"LLM provider '{provider}' stalled for {limit}s while streaming")
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+
+async def aclose() -> None:
+    """Close pooled provider clients; called on application shutdown."""
+    for backend in set(_backends.values()):
+        await backend.aclose()
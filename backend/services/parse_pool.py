@@ -0,0 +1,159 @@
+import os
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Union
+from services import resume_parser, text_store
+
+# Resume parsing (PyMuPDF text extraction plus skill matching) is CPU-bound,
+# so it runs in a small process pool instead of on the event loop. At most
+# PARSE_QUEUE_LIMIT parses are admitted at once (running or waiting for a
+# worker); beyond that callers get ParseQueueFull and should retry later.
+# Admitted parses wait on the event loop until a worker is free, so only
+# PARSE_WORKERS are ever handed to the pool and PARSE_TIMEOUT only counts
+# time spent parsing.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_QUEUE_LIMIT = int(os.getenv("PARSE_QUEUE_LIMIT", "32"))
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "30"))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+
+
+class ParseQueueFull(Exception):
+    pass
+
+
+class ParseTimeout(Exception):
+    pass
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_worker_slots: Optional[asyncio.Semaphore] = None
+_in_flight = 0
+_timeout_recycles = 0  # pools killed because a parse timed out
+_stats = {"completed": 0, "failed": 0, "rejected": 0, "timeouts": 0, "restarted": 0, "max_in_flight": 0}
+
+
+def create_executor(workers: int) -> ProcessPoolExecutor:
+    # spawn: forking a process that runs an event loop and driver threads is unsafe
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def terminate_executor(executor: ProcessPoolExecutor) -> None:
+    """Shut a pool down, killing its workers; the only way to stop a hung parse.
+
+    Other jobs still in the pool fail with BrokenProcessPool rather than
+    being cancelled, so their callers can tell and resubmit them.
+    """
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False)
+
+
+def _parse_and_store(**kwargs) -> Dict[str, Any]:
+    """Runs in the worker: parse, then move the full text to the text store when it is enabled"""
+    result = resume_parser.parse_resume(**kwargs)
+    if text_store.RESUME_TEXT_STORE and "full_text" in result:
+        result["text_key"] = text_store.put(result.pop("full_text"))
+    return result
+
+
+def parse_job(pdf: Union[str, bytes, bytearray], max_pages: int = RESUME_MAX_PAGES) -> functools.partial:
+    """The picklable call that parses ``pdf`` (a path or the file's bytes) in a worker process"""
+    if isinstance(pdf, str):
+        return functools.partial(_parse_and_store, pdf_path=pdf, max_pages=max_pages)
+    return functools.partial(_parse_and_store, pdf_bytes=pdf, max_pages=max_pages)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = create_executor(PARSE_WORKERS)
+    return _executor
+
+
+def _get_worker_slots() -> asyncio.Semaphore:
+    global _worker_slots
+    if _worker_slots is None:
+        _worker_slots = asyncio.Semaphore(PARSE_WORKERS)
+    return _worker_slots
+
+
+def _recycle(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    if _executor is executor:
+        _executor = None
+    terminate_executor(executor)
+
+
+async def parse_resume(pdf: Union[str, bytes, bytearray], max_pages: int = RESUME_MAX_PAGES,
+                       timeout: float = PARSE_TIMEOUT) -> Dict[str, Any]:
+    """Parse a resume PDF, given as a path or as the file's bytes, in the process pool.
+
+    Raises ParseQueueFull when PARSE_QUEUE_LIMIT parses are already admitted
+    and ParseTimeout when the parse takes longer than ``timeout`` seconds.
+    """
+    global _in_flight
+    if _in_flight >= PARSE_QUEUE_LIMIT:
+        _stats["rejected"] += 1
+        raise ParseQueueFull(f"{_in_flight} resumes are already being parsed")
+
+    global _timeout_recycles
+    _in_flight += 1
+    _stats["max_in_flight"] = max(_stats["max_in_flight"], _in_flight)
+    loop = asyncio.get_running_loop()
+    try:
+        async with _get_worker_slots():
+            # One retry if the pool broke under this job
+            for attempt in range(2):
+                executor = _get_executor()
+                recycles = _timeout_recycles
+                future = loop.run_in_executor(executor, parse_job(pdf, max_pages))
+                try:
+                    result = await asyncio.wait_for(future, timeout)
+                except asyncio.TimeoutError:
+                    _stats["timeouts"] += 1
+                    _timeout_recycles += 1
+                    _recycle(executor)
+                    raise ParseTimeout(f"Resume parsing took longer than {timeout:g}s")
+                except BrokenProcessPool:
+                    _recycle(executor)
+                    if not attempt:
+                        _stats["restarted"] += 1
+                        continue
+                    if _timeout_recycles != recycles:
+                        # Killed again for another job's timeout, not this file's fault
+                        raise ParseQueueFull("Resume parsing was interrupted, please retry")
+                    raise
+                _stats["completed"] += 1
+                return result
+    except (ParseTimeout, ParseQueueFull):
+        raise
+    except Exception:
+        _stats["failed"] += 1
+        raise
+    finally:
+        _in_flight -= 1
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "workers": PARSE_WORKERS,
+        "queue_limit": PARSE_QUEUE_LIMIT,
+        "in_flight": _in_flight,
+        "queued": max(0, _in_flight - PARSE_WORKERS),
+    }
+
+
+def start() -> None:
+    _get_executor()
+
+
+def stop() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -3,11 +3,13 @@ from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+import os
 import tempfile
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 def generate_pdf_report(session_id: str, answers: List[str], scores: List[Dict], summary: str) -> str:
     fd, path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
     c = canvas.Canvas(path, pagesize=letter)
     width, height = letter
     y = height - 40
@@ -28,9 +30,14 @@ def generate_pdf_report(session_id: str, answers: List[str], scores: List[Dict],
     c.save()
     return path
 
-def generate_enhanced_pdf_report(report_data: Dict[str, Any]) -> str:
-    """Generate enhanced PDF report with detailed feedback and analytics"""
-    fd, path = tempfile.mkstemp(suffix='.pdf')
+def generate_enhanced_pdf_report(report_data: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Generate enhanced PDF report with detailed feedback and analytics.
+
+    Writes to ``path`` if given, otherwise to a new temp file the caller owns.
+    """
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
     doc = SimpleDocTemplate(path, pagesize=letter)
     styles = getSampleStyleSheet()
     story = []
@@ -0,0 +1,302 @@
+import os
+import json
+import time
+import random
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select, delete
+from db.models.models import QuestionBankEntry
+from db.queries.session import AsyncSessionLocal
+from services import llm_gateway
+
+# Pre-generated questions pooled by (role, skill) and held in memory, so a
+# plan for a new interview is assembled without an LLM call. Pools that run
+# low or go stale are topped up in the background; the LLM is only used to
+# refill them.
+BANK_MIN_POOL = int(os.getenv("QUESTION_BANK_MIN_POOL", "9"))
+BANK_MAX_POOL = int(os.getenv("QUESTION_BANK_MAX_POOL", "60"))
+BANK_REFILL_BATCH = int(os.getenv("QUESTION_BANK_REFILL_BATCH", "15"))
+BANK_MAX_AGE = float(os.getenv("QUESTION_BANK_MAX_AGE", str(30 * 24 * 3600)))
+BANK_REFILL_INTERVAL = float(os.getenv("QUESTION_BANK_REFILL_INTERVAL", "300"))
+# After a refill that fails or adds nothing, the pool is left alone for
+# BANK_REFILL_BACKOFF seconds, doubling with each further miss up to
+# BANK_REFILL_BACKOFF_MAX, so a failing LLM is not asked once per interview start
+BANK_REFILL_BACKOFF = float(os.getenv("QUESTION_BANK_REFILL_BACKOFF", "60"))
+BANK_REFILL_BACKOFF_MAX = float(os.getenv("QUESTION_BANK_REFILL_BACKOFF_MAX", "3600"))
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+GENERAL = ""  # skill key of a role's general pool
+
+PoolKey = Tuple[str, str]
+
+# (role, skill) -> difficulty -> [(question, created_at epoch)]
+_index: Dict[PoolKey, Dict[str, List[Tuple[str, float]]]] = {}
+_wanted: Set[PoolKey] = set()
+# (role, skill) -> (monotonic time of the last failed refill, consecutive failures)
+_failures: Dict[PoolKey, Tuple[float, int]] = {}
+_wakeup: Optional[asyncio.Event] = None
+_refill_task: Optional[asyncio.Task] = None
+
+
+def _key(role: str, skill: str = GENERAL) -> PoolKey:
+    return (role or "").strip().lower(), (skill or "").strip().lower()
+
+
+def _epoch(value) -> float:
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _add(key: PoolKey, difficulty: str, question: str, created_at: float) -> None:
+    pool = _index.setdefault(key, {d: [] for d in DIFFICULTIES})
+    pool.setdefault(difficulty, []).append((question, created_at))
+
+
+def pool_size(role: str, skill: str = GENERAL) -> int:
+    pool = _index.get(_key(role, skill))
+    return sum(len(qs) for qs in pool.values()) if pool else 0
+
+
+def _needs_refill(key: PoolKey) -> bool:
+    pool = _index.get(key)
+    if not pool or sum(len(qs) for qs in pool.values()) < BANK_MIN_POOL:
+        return True
+    newest = max((created for qs in pool.values() for _, created in qs), default=0.0)
+    return datetime.now(timezone.utc).timestamp() - newest > BANK_MAX_AGE
+
+
+def _cooling_down(key: PoolKey) -> bool:
+    """True while a pool is backing off after failed or empty refills"""
+    if key not in _failures:
+        return False
+    last_attempt, misses = _failures[key]
+    backoff = min(BANK_REFILL_BACKOFF * 2 ** (misses - 1), BANK_REFILL_BACKOFF_MAX)
+    return time.monotonic() - last_attempt < backoff
+
+
+def _record_refill(key: PoolKey, added: int) -> None:
+    if added:
+        _failures.pop(key, None)
+    else:
+        _failures[key] = (time.monotonic(), _failures.get(key, (0.0, 0))[1] + 1)
+
+
+def request_refill(role: str, skill: str = GENERAL) -> None:
+    key = _key(role, skill)
+    if _cooling_down(key):
+        return
+    _wanted.add(key)
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def assemble_plan(skills: List[str], role: str, n: int = 10) -> Optional[List[str]]:
+    """Build an interview plan from the bank, easiest questions first.
+
+    Draws round-robin from the candidate's skill pools and the role's general
+    pool, aiming for an even spread over the difficulty levels. Returns None
+    if the bank cannot supply ``n`` distinct questions yet; the pools
+    involved are queued for refill either way when they run low.
+    """
+    keys = [_key(role, s) for s in skills] + [_key(role)]
+    for key in keys:
+        if _needs_refill(key):
+            request_refill(*key)
+
+    pools = [_index[key] for key in keys if key in _index]
+    if not pools:
+        return None
+
+    chosen: List[Tuple[int, str]] = []
+    seen: Set[str] = set()
+    quotas = [n // len(DIFFICULTIES) + (1 if i < n % len(DIFFICULTIES) else 0)
+              for i in range(len(DIFFICULTIES))]
+    # Shuffled candidates per difficulty, interleaved across pools
+    per_difficulty = {}
+    for difficulty in DIFFICULTIES:
+        streams = [random.sample(pool.get(difficulty, []), len(pool.get(difficulty, []))) for pool in pools]
+        per_difficulty[difficulty] = [question for question, _ in _interleave(streams)]
+
+    def take(difficulty: str, count: int) -> int:
+        taken = 0
+        for question in per_difficulty[difficulty]:
+            if taken == count:
+                break
+            if question not in seen:
+                seen.add(question)
+                chosen.append((DIFFICULTIES.index(difficulty), question))
+                taken += 1
+        return taken
+
+    shortfall = 0
+    for difficulty, quota in zip(DIFFICULTIES, quotas):
+        shortfall += quota - take(difficulty, quota)
+    # Borrow from any level if one of them is short
+    for difficulty in DIFFICULTIES:
+        if shortfall:
+            shortfall -= take(difficulty, shortfall)
+
+    if len(chosen) < n:
+        return None
+    chosen.sort(key=lambda item: item[0])
+    return [question for _, question in chosen]
+
+
+def _interleave(streams: List[list]) -> Iterable:
+    for i in range(max((len(s) for s in streams), default=0)):
+        for stream in streams:
+            if i < len(stream):
+                yield stream[i]
+
+
+async def load() -> int:
+    """Load the whole bank into memory; returns the number of questions."""
+    _index.clear()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(
+            QuestionBankEntry.role, QuestionBankEntry.skill, QuestionBankEntry.difficulty,
+            QuestionBankEntry.question, QuestionBankEntry.created_at
+        ))
+        rows = result.all()
+    for role, skill, difficulty, question, created_at in rows:
+        _add((role, skill), difficulty, question, _epoch(created_at))
+    return len(rows)
+
+
+def _refill_prompt(role: str, skill: str, n: int) -> str:
+    topic = (
+        f"probe a candidate's hands-on experience with {skill}"
+        if skill else "cover the core competencies of the role"
+    )
+    return (
+        f"You are an expert technical interviewer for a '{role}' position. "
+        f"Write exactly {n} distinct interview questions that {topic}. "
+        f"Spread them evenly across three difficulty levels: easy, medium and hard. "
+        f"Return your response as a single JSON array of objects with the keys "
+        f"\"question\" and \"difficulty\" (one of \"easy\", \"medium\", \"hard\"). "
+        f"Example format: [{{\"question\": \"...\", \"difficulty\": \"easy\"}}, ...]"
+    )
+
+
+async def refill(role: str, skill: str = GENERAL, n: int = BANK_REFILL_BATCH) -> int:
+    """Generate ``n`` questions for one pool and store them; returns how many were added."""
+    role_key, skill_key = _key(role, skill)
+    response_text = await llm_gateway.generate(_refill_prompt(role_key, skill_key, n), temperature=0.8)
+    start_idx = response_text.find('[')
+    end_idx = response_text.rfind(']') + 1
+    items = json.loads(response_text[start_idx:end_idx]) if start_idx != -1 and end_idx else []
+
+    existing = {q for qs in _index.get((role_key, skill_key), {}).values() for q, _ in qs}
+    fresh = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        question = str(item.get("question", "")).strip()
+        difficulty = str(item.get("difficulty", "medium")).strip().lower()
+        if question and question not in existing:
+            existing.add(question)
+            fresh.append((question, difficulty if difficulty in DIFFICULTIES else "medium"))
+    if not fresh:
+        return 0
+
+    async with AsyncSessionLocal() as db:
+        db.add_all([
+            QuestionBankEntry(role=role_key, skill=skill_key, difficulty=d, question=q)
+            for q, d in fresh
+        ])
+        await db.commit()
+    now = datetime.now(timezone.utc).timestamp()
+    for question, difficulty in fresh:
+        _add((role_key, skill_key), difficulty, question, now)
+    await _trim(role_key, skill_key)
+    return len(fresh)
+
+
+async def _trim(role: str, skill: str) -> None:
+    """Drop the oldest questions of a pool beyond BANK_MAX_POOL."""
+    pool = _index.get((role, skill))
+    entries = sorted(
+        ((created, difficulty, q) for difficulty, qs in pool.items() for q, created in qs),
+        reverse=True
+    )
+    stale = entries[BANK_MAX_POOL:]
+    if not stale:
+        return
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(QuestionBankEntry).where(
+            QuestionBankEntry.role == role,
+            QuestionBankEntry.skill == skill,
+            QuestionBankEntry.question.in_([q for _, _, q in stale])
+        ))
+        await db.commit()
+    dropped = {q for _, _, q in stale}
+    for difficulty in pool:
+        pool[difficulty] = [(q, c) for q, c in pool[difficulty] if q not in dropped]
+
+
+async def _refill_loop():
+    while True:
+        for key in list(_wanted):
+            _wanted.discard(key)
+            if not _needs_refill(key) or _cooling_down(key) or not llm_gateway.available():
+                continue
+            try:
+                added = await refill(*key)
+                print(f"Question bank: added {added} questions to {key}")
+            except Exception as e:
+                added = 0
+                print(f"Question bank refill failed for {key}: {e}")
+            _record_refill(key, added)
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), BANK_REFILL_INTERVAL)
+        except asyncio.TimeoutError:
+            # Periodic sweep for pools that went stale without being asked for
+            _wanted.update(key for key in _index if _needs_refill(key) and not _cooling_down(key))
+
+
+async def start() -> None:
+    global _wakeup, _refill_task
+    _wakeup = asyncio.Event()
+    count = await load()
+    _refill_task = asyncio.create_task(_refill_loop())
+    print(f"Question bank loaded with {count} questions in {len(_index)} pools.")
+
+
+async def stop() -> None:
+    if _refill_task is not None:
+        _refill_task.cancel()
+        await asyncio.gather(_refill_task, return_exceptions=True)
+
+
+async def warm(roles: List[str], skills: List[str]) -> None:
+    """Fill every (role, skill) pool, plus each role's general pool, up to the minimum."""
+    await load()
+    for role in roles:
+        for skill in [GENERAL] + skills:
+            key = _key(role, skill)
+            while _needs_refill(key):
+                added = await refill(*key)
+                print(f"{key}: +{added} (pool size {pool_size(*key)})")
+                if not added:
+                    break
+
+
+if __name__ == "__main__":
+    # Warm the bank offline, e.g.:
+    #   python -m services.question_bank "Software Engineer" "Data Scientist"
+    #   python -m services.question_bank "Software Engineer" --skills python,sql
+    import argparse
+    from services.resume_parser import SKILL_KEYWORDS
+
+    parser = argparse.ArgumentParser(description="Pre-generate interview questions into the question bank")
+    parser.add_argument("roles", nargs="+", help="roles to warm")
+    parser.add_argument("--skills", help="comma-separated skills (default: the resume parser vocabulary)")
+    args = parser.parse_args()
+
+    skills = args.skills.split(",") if args.skills else SKILL_KEYWORDS
+    asyncio.run(warm(args.roles, skills))
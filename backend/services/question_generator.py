@@ -1,25 +1,18 @@
-import os
 import json
 from typing import List
-import google.generativeai as genai
+from services import llm_gateway
 
-# Configure Gemini
-# Ensure your GOOGLE_API_KEY is set in your environment
-try:
-    genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-except KeyError:
+# Gemini is reached through the shared LLM gateway; make sure GOOGLE_API_KEY
+# is set in your environment (or LLM_BACKEND=fake for local runs)
+if not llm_gateway.available():
     print("‼️ GOOGLE_API_KEY environment variable not set.")
-    # Handle the case where the key is not set, maybe exit or use a dummy mode.
-    # For this example, we'll allow it to proceed and fail gracefully in the function.
 
-model = genai.GenerativeModel('gemini-pro')
-
-def generate_questions(skills: List[str], role: str = "Software Engineer", n: int = 10) -> List[str]:
+async def generate_questions(skills: List[str], role: str = "Software Engineer", n: int = 10) -> List[str]:
     """
     Generates tailored interview questions using the Gemini API.
     Falls back to a static list if the API call fails.
     """
-    if "GOOGLE_API_KEY" not in os.environ:
+    if not llm_gateway.available():
         print("API key not found. Using fallback questions.")
         return _generate_fallback_questions(skills, role, n)
 
@@ -37,15 +30,11 @@ def generate_questions(skills: List[str], role: str = "Software Engineer", n: in
 
     try:
         # --- IMPROVEMENT 2: Add temperature for more creative responses ---
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.8 
-        )
-        
-        response = model.generate_content(prompt, generation_config=generation_config)
+        response_text = await llm_gateway.generate(prompt, temperature=0.8)
 
         # --- IMPROVEMENT 3: Robust JSON Parsing ---
         # Clean the response to ensure it's valid JSON
-        cleaned_text = response.text.strip().replace("`json", "").replace("`", "")
+        cleaned_text = response_text.strip().replace("`json", "").replace("`", "")
         questions = json.loads(cleaned_text)
         
         if not isinstance(questions, list):
@@ -79,11 +68,13 @@ def _generate_fallback_questions(skills: List[str], role: str, n: int) -> List[s
 
 # Example Usage:
 if __name__ == '__main__':
+    import asyncio
+
     # Make sure to set your GOOGLE_API_KEY in your environment to test this
     # For example, in your terminal: export GOOGLE_API_KEY='your_key_here'
     
     example_skills = ["React", "Node.js", "TypeScript", "AWS S3", "PostgreSQL"]
-    generated = generate_questions(example_skills, "Senior Full-Stack Engineer")
+    generated = asyncio.run(generate_questions(example_skills, "Senior Full-Stack Engineer"))
     
     if generated:
         print("\n--- Generated Questions ---")
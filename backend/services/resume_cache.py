@@ -0,0 +1,73 @@
+import json
+from typing import Any, Dict, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.models import ResumeParse
+from services import parse_pool, resume_parser, skill_index
+
+# Parsed resumes stored by content hash, so re-uploading the same PDF (or the
+# same CV for several roles) skips PDF extraction. Bump PARSER_VERSION when
+# resume_parser's output changes; taxonomy edits and the reading budget are
+# part of the version automatically.
+PARSER_VERSION = "2"
+
+_stats = {"hits": 0, "misses": 0}
+
+
+def parser_version() -> str:
+    budget = f"{parse_pool.RESUME_MAX_PAGES}:{resume_parser.RESUME_MAX_CHARS}:{resume_parser.RESUME_CONVERGE_PAGES}"
+    return f"{PARSER_VERSION}:{skill_index.default_index().version}:{budget}"
+
+
+def stored_text(parsed: Dict[str, Any]) -> str:
+    """What goes in the text columns: the full text, unless it went to the text store"""
+    return parsed.get("full_text", parsed.get("text", ""))
+
+
+def from_row(text: Optional[str], text_key: Optional[str], skills: Optional[str]) -> Dict[str, Any]:
+    """A stored parse, shaped like resume_parser.parse_resume's result"""
+    parsed = {"text": (text or "")[:resume_parser.RESUME_PREVIEW_CHARS],
+              "skills": json.loads(skills or "[]"), "source": "pdf"}
+    if text_key:
+        parsed["text_key"] = text_key
+    else:
+        parsed["full_text"] = text or ""
+    return parsed
+
+
+async def get(db: AsyncSession, content_hash: str) -> Optional[Dict[str, Any]]:
+    """The stored parse for this upload, shaped like resume_parser.parse_resume's result"""
+    result = await db.execute(
+        select(ResumeParse.text, ResumeParse.text_key, ResumeParse.skills).where(
+            ResumeParse.content_hash == content_hash,
+            ResumeParse.parser_version == parser_version()
+        )
+    )
+    row = result.first()
+    if row is None:
+        _stats["misses"] += 1
+        return None
+    _stats["hits"] += 1
+    return from_row(row.text, row.text_key, row.skills)
+
+
+async def put(db: AsyncSession, content_hash: str, parsed: Dict[str, Any]) -> None:
+    """Store a parse; commits on its own so a concurrent duplicate upload is harmless"""
+    db.add(ResumeParse(
+        content_hash=content_hash,
+        parser_version=parser_version(),
+        text=stored_text(parsed),
+        text_key=parsed.get("text_key"),
+        skills=json.dumps(parsed.get("skills", []))
+    ))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # The same file was parsed and stored by another request meanwhile
+        await db.rollback()
+
+
+def stats() -> Dict[str, Any]:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {**_stats, "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0}
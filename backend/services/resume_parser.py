@@ -1,33 +1,90 @@
 import fitz  # PyMuPDF
-import re
-from typing import List, Dict
+import os
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional
+from services import skill_index
 
-# Simple skill/keyword list for demo
+# Core skills, used to pre-generate interview questions; resumes are matched
+# against the full taxonomy in services/data/skill_taxonomy.json
 SKILL_KEYWORDS = [
     'python', 'java', 'c++', 'machine learning', 'deep learning', 'react', 'node', 'sql', 'aws', 'docker', 'kubernetes',
     'project management', 'communication', 'leadership', 'data analysis', 'nlp', 'devops', 'cloud', 'api', 'typescript', 'javascript'
 ]
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    doc = fitz.open(pdf_path)
-    text = "\n".join(page.get_text() for page in doc)
-    return text
+# Pages are read lazily and reading stops early once skill detection has
+# converged (RESUME_CONVERGE_PAGES pages in a row add no new skill) or the
+# page / character budget is spent.
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "200000"))
+RESUME_CONVERGE_PAGES = int(os.getenv("RESUME_CONVERGE_PAGES", "3"))
+RESUME_PREVIEW_CHARS = 1000
+
+def iter_pdf_pages(pdf_path: str = None, pdf_bytes: Optional[bytes] = None) -> Iterator[str]:
+    """Yield the text of each page, extracting a page only when it is asked for"""
+    # In-memory uploads are opened straight from the buffer, without a temp file
+    source = fitz.open(stream=pdf_bytes, filetype="pdf") if pdf_bytes is not None else fitz.open(pdf_path)
+    with source as doc:
+        for page in doc:
+            yield page.get_text()
+
+def extract_text_from_pdf(pdf_path: str = None, max_pages: Optional[int] = None, pdf_bytes: Optional[bytes] = None) -> str:
+    return "\n".join(islice(iter_pdf_pages(pdf_path, pdf_bytes), max_pages))
 
 def extract_skills(text: str) -> List[str]:
-    found = set()
-    for skill in SKILL_KEYWORDS:
-        if re.search(rf'\b{re.escape(skill)}\b', text, re.IGNORECASE):
-            found.add(skill)
-    return list(found)
-
-def parse_resume(pdf_path: str = None, linkedin_url: str = None) -> Dict:
-    if pdf_path:
-        text = extract_text_from_pdf(pdf_path)
-        skills = extract_skills(text)
+    # One pass over the text against the whole skill taxonomy, synonyms included
+    return skill_index.default_index().extract(text)
+
+def read_resume(pages: Iterable[str], max_pages: Optional[int] = None,
+                max_chars: int = RESUME_MAX_CHARS, converge_pages: int = RESUME_CONVERGE_PAGES) -> Dict:
+    """Read pages until the skill set converges or the budget runs out.
+
+    ``stopped`` is why reading ended before the last page ("converged",
+    "max_pages" or "max_chars"), or None when every page was read.
+    """
+    index = skill_index.default_index()
+    texts, skills = [], {}
+    chars = stale_pages = 0
+    stopped = None
+    for page_text in pages:
+        page_text = page_text[:max_chars - chars]
+        texts.append(page_text)
+        chars += len(page_text)
+        
+        new_skills = [skill for skill in index.extract(page_text) if skill not in skills]
+        skills.update(dict.fromkeys(new_skills))
+        # Leading pages without any skill (a cover letter) do not count towards convergence
+        stale_pages = 0 if new_skills else stale_pages + bool(skills)
+        # Checked before the next page is pulled, so no page past the budget is extracted
+        if converge_pages and stale_pages >= converge_pages:
+            stopped = "converged"
+        elif max_pages is not None and len(texts) >= max_pages:
+            stopped = "max_pages"
+        elif chars >= max_chars:
+            stopped = "max_chars"
+        if stopped:
+            break
+    return {
+        'text': "\n".join(texts),
+        'skills': list(skills),
+        'pages_read': len(texts),
+        'stopped': stopped,
+    }
+
+def parse_resume(pdf_path: str = None, linkedin_url: str = None, max_pages: Optional[int] = None,
+                 pdf_bytes: Optional[bytes] = None) -> Dict:
+    if pdf_path or pdf_bytes:
+        pages = iter_pdf_pages(pdf_path, pdf_bytes)
+        try:
+            read = read_resume(pages, max_pages)
+        finally:
+            # Stopping early leaves the generator suspended; close the document now
+            pages.close()
         # TODO: Extract roles, experience, etc.
         return {
-            'text': text[:1000],  # Truncate for demo
-            'skills': skills,
+            'text': read['text'][:RESUME_PREVIEW_CHARS],
+            'full_text': read['text'],
+            'skills': read['skills'],
+            'pages_read': read['pages_read'],
+            'stopped': read['stopped'],
             'source': 'pdf',
         }
     elif linkedin_url:
@@ -0,0 +1,74 @@
+import os
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from services import scoring_engine
+
+# Collects concurrent scoring requests for a short window and sends them to
+# the LLM as one batched prompt, so the rubric is paid for once per batch
+# rather than once per answer. A batch is flushed when it reaches
+# SCORE_BATCH_MAX_SIZE answers or SCORE_BATCH_WINDOW seconds after its first
+# answer arrived, whichever comes first.
+SCORE_BATCH_MAX_SIZE = int(os.getenv("SCORE_BATCH_MAX_SIZE", "8"))
+SCORE_BATCH_WINDOW = float(os.getenv("SCORE_BATCH_WINDOW", "0.05"))
+
+Pending = Tuple[str, str, asyncio.Future]
+
+_pending: List[Pending] = []
+_timer: Optional[asyncio.TimerHandle] = None
+_tasks: set = set()
+_stats = {"batches": 0, "answers": 0, "largest_batch": 0}
+
+
+def _flush() -> None:
+    global _pending, _timer
+    if _timer is not None:
+        _timer.cancel()
+        _timer = None
+    if not _pending:
+        return
+    batch, _pending = _pending, []
+    task = asyncio.get_running_loop().create_task(_run(batch))
+    # Keep a reference until the batch is done so it is not garbage collected
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _run(batch: List[Pending]) -> None:
+    _stats["batches"] += 1
+    _stats["answers"] += len(batch)
+    _stats["largest_batch"] = max(_stats["largest_batch"], len(batch))
+    try:
+        results = await scoring_engine.score_answers_batch([(q, a) for q, a, _ in batch])
+    except Exception as e:
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+    for (_, _, future), result in zip(batch, results):
+        if not future.done():
+            future.set_result(result)
+
+
+async def score(question: str, answer: str) -> Dict[str, Any]:
+    """Score one answer as part of the next batch; same result as scoring_engine.score_answer."""
+    global _timer
+    if SCORE_BATCH_MAX_SIZE <= 1:
+        return await scoring_engine.score_answer(question, answer)
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _pending.append((question, answer, future))
+    if len(_pending) >= SCORE_BATCH_MAX_SIZE:
+        _flush()
+    elif _timer is None:
+        _timer = loop.call_later(SCORE_BATCH_WINDOW, _flush)
+    return await future
+
+
+def stats() -> Dict[str, Any]:
+    batches = _stats["batches"]
+    return {
+        **_stats,
+        "queued": len(_pending),
+        "mean_batch_size": round(_stats["answers"] / batches, 2) if batches else 0.0
+    }
@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Two-tier cache for LLM scoring results, keyed by content: an in-process LRU
+# in front of a SQLite file shared by every worker on the node. Entries
+# expire after SCORE_CACHE_TTL seconds and the file is trimmed to
+# SCORE_CACHE_MAX_ENTRIES, least recently used first.
+BACKEND_DIR = Path(__file__).parent.parent
+
+SCORE_CACHE_PATH = os.getenv("SCORE_CACHE_PATH", str(BACKEND_DIR / "score_cache.db"))
+SCORE_CACHE_MEMORY_SIZE = int(os.getenv("SCORE_CACHE_MEMORY_SIZE", "2048"))
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "100000"))
+SCORE_CACHE_TTL = float(os.getenv("SCORE_CACHE_TTL", str(30 * 24 * 3600)))
+SCORE_CACHE_ENABLED = os.getenv("SCORE_CACHE_ENABLED", "1") != "0"
+
+# Trim the disk tier every this many writes rather than on each one
+_EVICT_EVERY = 256
+
+_memory: "OrderedDict[str, tuple]" = OrderedDict()
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+_writes = 0
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").split()).casefold()
+
+
+def make_key(question: str, answer: str, version: str) -> str:
+    """Content hash of the normalized question/answer and the scorer version."""
+    material = "\x1f".join((version, _normalize(question), _normalize(answer)))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(SCORE_CACHE_PATH, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS score_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS ix_score_cache_accessed ON score_cache (accessed_at)")
+        _conn.commit()
+    return _conn
+
+
+def _disk_get(key: str) -> Optional[tuple]:
+    with _lock:
+        conn = _get_conn()
+        row = conn.execute(
+            "SELECT value, expires_at FROM score_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if row[1] <= now:
+            conn.execute("DELETE FROM score_cache WHERE key = ?", (key,))
+            conn.commit()
+            return None
+        conn.execute("UPDATE score_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        conn.commit()
+        return json.loads(row[0]), row[1]
+
+
+def _disk_set(key: str, value: Dict[str, Any], expires_at: float) -> None:
+    global _writes
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO score_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), expires_at, time.time())
+        )
+        _writes += 1
+        if _writes % _EVICT_EVERY == 0:
+            _evict(conn)
+        conn.commit()
+
+
+def _evict(conn: sqlite3.Connection) -> None:
+    expired = conn.execute("DELETE FROM score_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+    overflow = conn.execute(
+        "DELETE FROM score_cache WHERE key IN ("
+        "SELECT key FROM score_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+        (SCORE_CACHE_MAX_ENTRIES,)
+    ).rowcount
+    _stats["evictions"] += expired + overflow
+
+
+def _remember(key: str, value: Dict[str, Any], expires_at: float) -> None:
+    _memory[key] = (value, expires_at)
+    _memory.move_to_end(key)
+    while len(_memory) > SCORE_CACHE_MEMORY_SIZE:
+        _memory.popitem(last=False)
+
+
+async def get(key: str) -> Optional[Dict[str, Any]]:
+    if not SCORE_CACHE_ENABLED:
+        return None
+
+    entry = _memory.get(key)
+    if entry is not None:
+        if entry[1] > time.time():
+            _memory.move_to_end(key)
+            _stats["memory_hits"] += 1
+            return dict(entry[0])
+        del _memory[key]
+
+    try:
+        entry = await asyncio.to_thread(_disk_get, key)
+    except sqlite3.Error as e:
+        print(f"Score cache read failed: {e}")
+        entry = None
+    if entry is None:
+        _stats["misses"] += 1
+        return None
+    _stats["disk_hits"] += 1
+    _remember(key, *entry)
+    return dict(entry[0])
+
+
+async def put(key: str, value: Dict[str, Any]) -> None:
+    if not SCORE_CACHE_ENABLED:
+        return
+    expires_at = time.time() + SCORE_CACHE_TTL
+    _remember(key, dict(value), expires_at)
+    _stats["writes"] += 1
+    try:
+        await asyncio.to_thread(_disk_set, key, value, expires_at)
+    except sqlite3.Error as e:
+        print(f"Score cache write failed: {e}")
+
+
+def stats() -> Dict[str, Any]:
+    hits = _stats["memory_hits"] + _stats["disk_hits"]
+    lookups = hits + _stats["misses"]
+    return {
+        **_stats,
+        "memory_entries": len(_memory),
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+    }
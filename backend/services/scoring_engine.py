@@ -1,30 +1,16 @@
-import os
-import google.generativeai as genai
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, AsyncIterator, List, Tuple
+from services import llm_gateway, score_cache, fallback_scorer
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-model = genai.GenerativeModel('gemini-pro')
+# Bump when the scoring prompt or result shape changes so cached scores from
+# the old prompt are no longer served
+SCORING_PROMPT_VERSION = "1"
 
-def score_answer(question: str, answer: str) -> Dict[str, Any]:
-    """
-    Score an answer using Gemini AI with rigorous evaluation criteria
-    """
-    try:
-        # Check if API key is available
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            print("No Google API key found, using fallback scoring")
-            return _fallback_scoring(question, answer)
-        
-        prompt = f"""
-        You are an expert technical interviewer conducting a rigorous evaluation of a candidate's answer.
-        
-        Question: {question}
-        Candidate's Answer: {answer}
-        
-        Please evaluate this answer using the following strict criteria:
-        
+def _scoring_version() -> str:
+    return f"{SCORING_PROMPT_VERSION}:{llm_gateway.model_id()}"
+
+# Shared by the single and batched scoring prompts
+_SCORING_CRITERIA = """
         1. TECHNICAL DEPTH (0-10 points):
            - Demonstrates deep understanding of concepts
            - Shows practical experience and real-world application
@@ -56,9 +42,9 @@ def score_answer(question: str, answer: str) -> Dict[str, Any]:
            - Shows ability to think beyond immediate solutions
         
         Calculate the average score from all 5 criteria (0-10 scale).
-        
-        Format your response as JSON:
-        {{
+"""
+
+_SCORE_FIELDS = """
             "score": <average_score_0-10>,
             "technical_depth": <score_0-10>,
             "problem_solving": <score_0-10>,
@@ -70,46 +56,198 @@ def score_answer(question: str, answer: str) -> Dict[str, Any]:
             "improvements": ["<improvement1>", "<improvement2>", "<improvement3>"],
             "suggestions": ["<suggestion1>", "<suggestion2>", "<suggestion3>"],
             "overall_assessment": "<comprehensive_assessment>"
-        }}
+"""
+
+def _score_prompt(question: str, answer: str) -> str:
+    return f"""
+        You are an expert technical interviewer conducting a rigorous evaluation of a candidate's answer.
+        
+        Question: {question}
+        Candidate's Answer: {answer}
+        
+        Please evaluate this answer using the following strict criteria:
+        {_SCORING_CRITERIA}        
+        Format your response as JSON:
+        {{{_SCORE_FIELDS}        }}
         
         Be strict and honest in your evaluation. A score of 8-10 should be reserved for truly exceptional answers.
         """
+
+def _batch_score_prompt(items: List[Tuple[str, str]]) -> str:
+    answers = "".join(
+        f"""
+        Answer {i}:
+        Question: {question}
+        Candidate's Answer: {answer}
+        """
+        for i, (question, answer) in enumerate(items, 1)
+    )
+    return f"""
+        You are an expert technical interviewer conducting a rigorous evaluation of {len(items)} candidate answers.
+        Evaluate each answer on its own merits, independently of the others.
+        {answers}
+        Please evaluate each answer using the following strict criteria:
+        {_SCORING_CRITERIA}        
+        Format your response as a JSON array with exactly one object per answer, in the same order:
+        [{{
+            "id": <answer_number>,{_SCORE_FIELDS}        }}, ...]
         
-        response = model.generate_content(prompt)
+        Be strict and honest in your evaluation. A score of 8-10 should be reserved for truly exceptional answers.
+        """
+
+async def score_answer(question: str, answer: str) -> Dict[str, Any]:
+    """
+    Score an answer using Gemini AI with rigorous evaluation criteria
+    """
+    try:
+        # Check if an LLM provider is available
+        if not llm_gateway.available():
+            print("No LLM provider configured, using fallback scoring")
+            return _fallback_scoring(question, answer)
         
-        # Try to parse JSON response
-        try:
-            import json
-            # Extract JSON from response
-            response_text = response.text
-            # Find JSON in the response
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-            if start_idx != -1 and end_idx != 0:
-                json_str = response_text[start_idx:end_idx]
-                result = json.loads(json_str)
-                
-                return {
-                    "score": result.get("score", 6),
-                    "technical_depth": result.get("technical_depth", 6),
-                    "problem_solving": result.get("problem_solving", 6),
-                    "communication": result.get("communication", 6),
-                    "experience": result.get("experience", 6),
-                    "critical_thinking": result.get("critical_thinking", 6),
-                    "feedback": result.get("feedback", "Good answer with room for improvement."),
-                    "strengths": result.get("strengths", []),
-                    "improvements": result.get("improvements", []),
-                    "suggestions": result.get("suggestions", []),
-                    "overall_assessment": result.get("overall_assessment", "Solid performance with areas for growth.")
-                }
-        except:
-            # Fallback parsing
-            return _parse_gemini_response(response.text, question, answer)
+        # Identical question/answer pairs reuse the stored LLM score
+        cache_key = score_cache.make_key(question, answer, _scoring_version())
+        cached = await score_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = _score_prompt(question, answer)
+        
+        response_text = await llm_gateway.generate(prompt)
+        result, parsed_ok = _parse_score_response(response_text, question, answer)
+        # A score guessed from malformed output is not cached, so the next identical answer asks again
+        if parsed_ok:
+            await score_cache.put(cache_key, result)
+        return result
             
     except Exception as e:
         print(f"Error in Gemini scoring: {e}")
         return _fallback_scoring(question, answer)
 
+async def stream_score_answer(question: str, answer: str) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream an answer evaluation: ("token", text) events as the model writes,
+    then a single ("result", score_data) event shaped like score_answer's result
+    """
+    if not llm_gateway.available():
+        yield "result", _fallback_scoring(question, answer)
+        return
+    
+    cache_key = score_cache.make_key(question, answer, _scoring_version())
+    cached = await score_cache.get(cache_key)
+    if cached is not None:
+        yield "result", cached
+        return
+    
+    chunks = []
+    try:
+        async for chunk in llm_gateway.stream(_score_prompt(question, answer)):
+            chunks.append(chunk)
+            yield "token", chunk
+    except Exception as e:
+        print(f"Error in Gemini scoring stream: {e}")
+        yield "result", _fallback_scoring(question, answer)
+        return
+    
+    result, parsed_ok = _parse_score_response("".join(chunks), question, answer)
+    if parsed_ok:
+        await score_cache.put(cache_key, result)
+    yield "result", result
+
+async def score_answers_batch(items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Score several (question, answer) pairs with a single LLM request, sending
+    the rubric once. Results come back in input order; any answer the batched
+    response does not cover is scored on its own with score_answer.
+    """
+    if not llm_gateway.available():
+        return [_fallback_scoring(question, answer) for question, answer in items]
+    
+    version = _scoring_version()
+    keys = [score_cache.make_key(question, answer, version) for question, answer in items]
+    results = [await score_cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    
+    if len(missing) > 1:
+        try:
+            response_text = await llm_gateway.generate(
+                _batch_score_prompt([items[i] for i in missing])
+            )
+            parsed = _parse_batch_response(response_text, len(missing))
+        except Exception as e:
+            print(f"Error in Gemini batch scoring: {e}")
+            parsed = [None] * len(missing)
+        for i, result in zip(missing, parsed):
+            if result is not None:
+                results[i] = result
+                await score_cache.put(keys[i], result)
+    
+    # Whatever the batch did not yield is scored individually
+    leftovers = [i for i in missing if results[i] is None]
+    for i, result in zip(leftovers, await asyncio.gather(*(score_answer(*items[i]) for i in leftovers))):
+        results[i] = result
+    return results
+
+def _parse_score_response(response_text: str, question: str, answer: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Parse the JSON score object out of a Gemini response. Returns the result
+    and whether it came from the JSON; False means it was guessed from free text.
+    """
+    try:
+        import json
+        # Find JSON in the response
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}') + 1
+        if start_idx != -1 and end_idx != 0:
+            json_str = response_text[start_idx:end_idx]
+            result = json.loads(json_str)
+            
+            return _score_result(result), True
+    except:
+        pass
+    # Fallback parsing
+    return _parse_gemini_response(response_text, question, answer), False
+
+def _score_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "score": result.get("score", 6),
+        "technical_depth": result.get("technical_depth", 6),
+        "problem_solving": result.get("problem_solving", 6),
+        "communication": result.get("communication", 6),
+        "experience": result.get("experience", 6),
+        "critical_thinking": result.get("critical_thinking", 6),
+        "feedback": result.get("feedback", "Good answer with room for improvement."),
+        "strengths": result.get("strengths", []),
+        "improvements": result.get("improvements", []),
+        "suggestions": result.get("suggestions", []),
+        "overall_assessment": result.get("overall_assessment", "Solid performance with areas for growth.")
+    }
+
+def _parse_batch_response(response_text: str, count: int) -> List[Any]:
+    """Split a batched response into per-answer results; None where an entry is missing or malformed"""
+    import json
+    start_idx = response_text.find('[')
+    end_idx = response_text.rfind(']') + 1
+    if start_idx == -1 or end_idx == 0:
+        return [None] * count
+    try:
+        entries = json.loads(response_text[start_idx:end_idx])
+    except ValueError:
+        return [None] * count
+    if not isinstance(entries, list):
+        return [None] * count
+    
+    results = [None] * count
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("score"), (int, float)):
+            continue
+        # Prefer the echoed answer number, fall back to the position in the array
+        index = entry.get("id")
+        index = index - 1 if isinstance(index, int) and 1 <= index <= count else position
+        if index < count and results[index] is None:
+            results[index] = _score_result(entry)
+    return results
+
 def _parse_gemini_response(response_text: str, question: str, answer: str) -> Dict[str, Any]:
     """Parse Gemini response when JSON parsing fails"""
     lines = response_text.split('\n')
@@ -143,180 +281,38 @@ def _parse_gemini_response(response_text: str, question: str, answer: str) -> Di
 
 def _fallback_scoring(question: str, answer: str) -> Dict[str, Any]:
     """Fallback scoring when Gemini is not available - more rigorous"""
-    # Initialize scores for each criterion
-    technical_depth = 5
-    problem_solving = 5
-    communication = 5
-    experience = 5
-    critical_thinking = 5
-    
-    # Analyze answer length and structure
-    if len(answer) > 200:
-        communication += 2
-        experience += 1
-    elif len(answer) < 100:
-        communication -= 2
-        experience -= 1
-    
-    # Check for technical keywords and depth
-    tech_keywords = ['algorithm', 'complexity', 'optimization', 'architecture', 'framework', 'methodology', 'pattern']
-    found_tech_keywords = [word for word in tech_keywords if word.lower() in answer.lower()]
-    
-    if len(found_tech_keywords) >= 3:
-        technical_depth += 3
-        problem_solving += 2
-    elif len(found_tech_keywords) >= 1:
-        technical_depth += 1
-        problem_solving += 1
-    else:
-        technical_depth -= 1
-    
-    # Check for specific examples and experience
-    experience_indicators = ['project', 'experience', 'worked on', 'implemented', 'developed', 'built']
-    found_experience = [word for word in experience_indicators if word.lower() in answer.lower()]
-    
-    if len(found_experience) >= 2:
-        experience += 3
-        technical_depth += 1
-    elif len(found_experience) >= 1:
-        experience += 1
-    else:
-        experience -= 2
-    
-    # Check for problem-solving approach
-    problem_solving_indicators = ['step', 'approach', 'process', 'method', 'strategy', 'solution']
-    found_problem_solving = [word for word in problem_solving_indicators if word.lower() in answer.lower()]
-    
-    if len(found_problem_solving) >= 2:
-        problem_solving += 2
-        critical_thinking += 1
-    elif len(found_problem_solving) >= 1:
-        problem_solving += 1
-    
-    # Check for critical thinking indicators
-    critical_thinking_indicators = ['consider', 'trade-off', 'alternative', 'challenge', 'limitation', 'future']
-    found_critical_thinking = [word for word in critical_thinking_indicators if word.lower() in answer.lower()]
-    
-    if len(found_critical_thinking) >= 2:
-        critical_thinking += 3
-    elif len(found_critical_thinking) >= 1:
-        critical_thinking += 1
-    else:
-        critical_thinking -= 1
-    
-    # Check for communication quality
-    communication_indicators = ['clearly', 'specifically', 'example', 'because', 'therefore', 'however']
-    found_communication = [word for word in communication_indicators if word.lower() in answer.lower()]
-    
-    if len(found_communication) >= 3:
-        communication += 2
-    elif len(found_communication) >= 1:
-        communication += 1
-    
-    # Ensure scores are within bounds
-    technical_depth = max(1, min(10, technical_depth))
-    problem_solving = max(1, min(10, problem_solving))
-    communication = max(1, min(10, communication))
-    experience = max(1, min(10, experience))
-    critical_thinking = max(1, min(10, critical_thinking))
-    
-    # Calculate average score
-    avg_score = (technical_depth + problem_solving + communication + experience + critical_thinking) / 5
-    
-    # Generate feedback based on scores
-    strengths = []
-    improvements = []
-    suggestions = []
-    
-    if technical_depth >= 7:
-        strengths.append("Strong technical knowledge")
-    else:
-        improvements.append("Could demonstrate deeper technical understanding")
-        suggestions.append("Provide more technical details and specific technologies")
-    
-    if problem_solving >= 7:
-        strengths.append("Good problem-solving approach")
-    else:
-        improvements.append("Could show more systematic problem-solving")
-        suggestions.append("Break down problems into steps and explain your reasoning")
-    
-    if communication >= 7:
-        strengths.append("Clear communication")
-    else:
-        improvements.append("Could improve clarity and structure")
-        suggestions.append("Organize your thoughts and provide specific examples")
-    
-    if experience >= 7:
-        strengths.append("Good practical experience")
-    else:
-        improvements.append("Could provide more specific examples")
-        suggestions.append("Share concrete examples from your work experience")
-    
-    if critical_thinking >= 7:
-        strengths.append("Shows critical thinking")
-    else:
-        improvements.append("Could demonstrate more analytical thinking")
-        suggestions.append("Consider trade-offs and alternative approaches")
-    
-    if avg_score >= 8:
-        overall_assessment = "Excellent answer demonstrating strong technical knowledge, problem-solving skills, and communication."
-    elif avg_score >= 6:
-        overall_assessment = "Good answer showing solid understanding with room for improvement in specific areas."
-    else:
-        overall_assessment = "Answer needs improvement in multiple areas. Focus on providing more specific examples and technical depth."
-    
-    return {
-        "score": round(avg_score, 1),
-        "technical_depth": technical_depth,
-        "problem_solving": problem_solving,
-        "communication": communication,
-        "experience": experience,
-        "critical_thinking": critical_thinking,
-        "feedback": f"Technical Depth: {technical_depth}/10, Problem Solving: {problem_solving}/10, Communication: {communication}/10, Experience: {experience}/10, Critical Thinking: {critical_thinking}/10",
-        "strengths": strengths,
-        "improvements": improvements,
-        "suggestions": suggestions,
-        "overall_assessment": overall_assessment
-    }
+    return fallback_scorer.score(question, answer)
 
-def generate_overall_feedback(answers: list) -> Dict[str, Any]:
-    """
-    Generate overall interview feedback using Gemini AI with rigorous analysis
-    """
-    try:
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            return _fallback_overall_feedback(answers)
-        
-        # Prepare answers summary with detailed scores
-        answers_summary = []
-        total_score = 0
-        category_scores = {
-            "technical_depth": 0,
-            "problem_solving": 0,
-            "communication": 0,
-            "experience": 0,
-            "critical_thinking": 0
-        }
-        
-        for i, answer in enumerate(answers):
-            score_details = f"Technical: {answer.get('technical_depth', answer['score'])}/10, "
-            score_details += f"Problem Solving: {answer.get('problem_solving', answer['score'])}/10, "
-            score_details += f"Communication: {answer.get('communication', answer['score'])}/10, "
-            score_details += f"Experience: {answer.get('experience', answer['score'])}/10, "
-            score_details += f"Critical Thinking: {answer.get('critical_thinking', answer['score'])}/10"
-            
-            answers_summary.append(f"Q{i+1}: {answer['question']}\nA: {answer['answer']}\nScores: {score_details}")
-            total_score += answer['score']
-            
-            # Aggregate category scores
-            for category in category_scores:
-                category_scores[category] += answer.get(category, answer['score'])
+def _overall_feedback_prompt(answers: list) -> str:
+    # Prepare answers summary with detailed scores
+    answers_summary = []
+    total_score = 0
+    category_scores = {
+        "technical_depth": 0,
+        "problem_solving": 0,
+        "communication": 0,
+        "experience": 0,
+        "critical_thinking": 0
+    }
+    
+    for i, answer in enumerate(answers):
+        score_details = f"Technical: {answer.get('technical_depth', answer['score'])}/10, "
+        score_details += f"Problem Solving: {answer.get('problem_solving', answer['score'])}/10, "
+        score_details += f"Communication: {answer.get('communication', answer['score'])}/10, "
+        score_details += f"Experience: {answer.get('experience', answer['score'])}/10, "
+        score_details += f"Critical Thinking: {answer.get('critical_thinking', answer['score'])}/10"
         
-        avg_score = total_score / len(answers) if answers else 0
-        avg_category_scores = {k: v/len(answers) for k, v in category_scores.items()} if answers else {}
+        answers_summary.append(f"Q{i+1}: {answer['question']}\nA: {answer['answer']}\nScores: {score_details}")
+        total_score += answer['score']
         
-        prompt = f"""
+        # Aggregate category scores
+        for category in category_scores:
+            category_scores[category] += answer.get(category, answer['score'])
+    
+    avg_score = total_score / len(answers) if answers else 0
+    avg_category_scores = {k: v/len(answers) for k, v in category_scores.items()} if answers else {}
+    
+    return f"""
         You are an expert technical interviewer providing comprehensive feedback for a candidate.
         
         Interview Summary:
@@ -356,35 +352,69 @@ def generate_overall_feedback(answers: list) -> Dict[str, Any]:
         
         Be strict and honest. Reserve "high potential" and "strong hire" for truly exceptional candidates.
         """
+
+async def generate_overall_feedback(answers: list) -> Dict[str, Any]:
+    """
+    Generate overall interview feedback using Gemini AI with rigorous analysis
+    """
+    try:
+        if not llm_gateway.available():
+            return _fallback_overall_feedback(answers)
         
-        response = model.generate_content(prompt)
+        prompt = _overall_feedback_prompt(answers)
         
-        try:
-            import json
-            response_text = response.text
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-            if start_idx != -1 and end_idx != 0:
-                json_str = response_text[start_idx:end_idx]
-                result = json.loads(json_str)
-                
-                return {
-                    "overall_feedback": result.get("overall_assessment", "Good performance overall."),
-                    "category_analysis": result.get("category_analysis", {}),
-                    "strengths": result.get("strengths", []),
-                    "critical_weaknesses": result.get("critical_weaknesses", []),
-                    "recommendations": result.get("recommendations", []),
-                    "potential": result.get("potential", "medium"),
-                    "next_steps": result.get("next_steps", []),
-                    "hiring_recommendation": result.get("hiring_recommendation", "consider")
-                }
-        except:
-            return _fallback_overall_feedback(answers)
+        response_text = await llm_gateway.generate(prompt)
+        return _parse_overall_response(response_text, answers)
             
     except Exception as e:
         print(f"Error in Gemini overall feedback: {e}")
         return _fallback_overall_feedback(answers)
 
+async def stream_overall_feedback(answers: list) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream overall feedback: ("token", text) events as the model writes, then
+    a single ("result", feedback) event shaped like generate_overall_feedback's result
+    """
+    if not llm_gateway.available():
+        yield "result", _fallback_overall_feedback(answers)
+        return
+    
+    chunks = []
+    try:
+        async for chunk in llm_gateway.stream(_overall_feedback_prompt(answers)):
+            chunks.append(chunk)
+            yield "token", chunk
+    except Exception as e:
+        print(f"Error in Gemini overall feedback stream: {e}")
+        yield "result", _fallback_overall_feedback(answers)
+        return
+    
+    yield "result", _parse_overall_response("".join(chunks), answers)
+
+def _parse_overall_response(response_text: str, answers: list) -> Dict[str, Any]:
+    """Parse the JSON overall feedback out of a Gemini response"""
+    try:
+        import json
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}') + 1
+        if start_idx != -1 and end_idx != 0:
+            json_str = response_text[start_idx:end_idx]
+            result = json.loads(json_str)
+            
+            return {
+                "overall_feedback": result.get("overall_assessment", "Good performance overall."),
+                "category_analysis": result.get("category_analysis", {}),
+                "strengths": result.get("strengths", []),
+                "critical_weaknesses": result.get("critical_weaknesses", []),
+                "recommendations": result.get("recommendations", []),
+                "potential": result.get("potential", "medium"),
+                "next_steps": result.get("next_steps", []),
+                "hiring_recommendation": result.get("hiring_recommendation", "consider")
+            }
+    except:
+        pass
+    return _fallback_overall_feedback(answers)
+
 def _fallback_overall_feedback(answers: list) -> Dict[str, Any]:
     """Fallback overall feedback generation with rigorous analysis"""
     if not answers:
@@ -0,0 +1,130 @@
+import os
+import re
+import json
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Skill extraction over a taxonomy of canonical skills and their synonyms
+# ("k8s" -> kubernetes, "postgres" -> sql). Every term is tokenized the
+# same way as the text and stored in a token trie, so a resume is matched
+# in one pass over its tokens regardless of how large the taxonomy is.
+# Matching is on whole tokens, which gives word-boundary semantics; at each
+# position the longest term wins ("machine learning" over "learning").
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH", str(Path(__file__).parent / "data" / "skill_taxonomy.json")
+)
+
+# A token is a run of letters/digits that may carry the symbols used in
+# skill names (c++, c#) and internal '.', '/' or '-' (node.js, ci/cd,
+# scikit-learn), optionally with a leading '.' (.net).
+TOKEN_RE = re.compile(r"(?<![a-z0-9])\.?[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9][a-z0-9+#]*)*")
+PART_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+_TERMINAL = ""  # trie key holding the canonical skill of a complete term
+
+Token = Tuple[str, int]
+
+
+def _tokenize(text: str) -> List[Token]:
+    return [(m.group(), m.start()) for m in TOKEN_RE.finditer(text)]
+
+
+def _is_compound(token: str) -> bool:
+    return token[0] == "." or any(sep in token for sep in "./-")
+
+
+def _parts(token: Token) -> List[Token]:
+    text, start = token
+    return [(m.group(), start + m.start()) for m in PART_RE.finditer(text)]
+
+
+class SkillIndex:
+    def __init__(self, taxonomy: Dict[str, Iterable[str]], version: Optional[str] = None):
+        """``taxonomy`` maps each canonical skill to its synonyms."""
+        self.skills: List[str] = []
+        self._trie: Dict[str, Any] = {}
+        self.term_count = 0
+        for canonical, synonyms in taxonomy.items():
+            canonical = canonical.strip().lower()
+            self.skills.append(canonical)
+            for term in [canonical, *synonyms]:
+                self._add(term.strip().lower(), canonical)
+
+        if version is None:
+            canonical_json = json.dumps(taxonomy, sort_keys=True, default=list)
+            version = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()[:12]
+        self.version = version
+
+    def _add(self, term: str, canonical: str) -> None:
+        tokens = [token for token, _ in _tokenize(term)]
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _TERMINAL in node and node[_TERMINAL] != canonical:
+            print(f"Skill term '{term}' is listed under both '{node[_TERMINAL]}' and '{canonical}', keeping the first")
+            return
+        if _TERMINAL not in node:
+            self.term_count += 1
+        node[_TERMINAL] = canonical
+
+    def _longest(self, tokens: List[Token], i: int) -> Tuple[Optional[str], int]:
+        """Longest term starting at tokens[i]: (canonical skill, tokens consumed)"""
+        node = self._trie
+        found, length = None, 0
+        for j in range(i, len(tokens)):
+            node = node.get(tokens[j][0])
+            if node is None:
+                break
+            if _TERMINAL in node:
+                found, length = node[_TERMINAL], j - i + 1
+        return found, length
+
+    def _scan(self, tokens: List[Token], matches: Dict[str, Dict[str, Any]]) -> None:
+        i = 0
+        while i < len(tokens):
+            skill, length = self._longest(tokens, i)
+            if skill is not None:
+                entry = matches.setdefault(skill, {"count": 0, "positions": []})
+                entry["count"] += 1
+                entry["positions"].append(tokens[i][1])
+                i += length
+                continue
+            # "python/django" or "e.g." is not a term as a whole; try its parts
+            if _is_compound(tokens[i][0]):
+                self._scan(_parts(tokens[i]), matches)
+            i += 1
+
+    def match(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """Canonical skills found in ``text``, in order of first mention.
+
+        Each maps to {"count": occurrences, "positions": character offsets
+        of each occurrence in ``text``}.
+        """
+        matches: Dict[str, Dict[str, Any]] = {}
+        self._scan(_tokenize(text.lower()), matches)
+        return matches
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills found in ``text``, in order of first mention"""
+        return list(self.match(text))
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillIndex":
+        """Load a taxonomy file: {"version": ..., "skills": {"<canonical>": ["<synonym>", ...]}}"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(data["skills"])
+        if "version" in data:
+            # Keep the content hash so an edited file without a bumped version still reads as new
+            index.version = f"{data['version']}-{index.version}"
+        return index
+
+
+@lru_cache(maxsize=1)
+def default_index() -> SkillIndex:
+    """The index for SKILL_TAXONOMY_PATH, built once per process"""
+    return SkillIndex.from_file(SKILL_TAXONOMY_PATH)
@@ -0,0 +1,58 @@
+import os
+import asyncio
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Optional
+import zstandard
+
+# Full resume text kept out of the database: zstd-compressed files named by
+# the sha256 of the text, so identical texts are stored once and a key never
+# points at different content. Candidates keep a short preview in
+# resume_text and the key of the full text. Writes happen in the parse
+# workers, next to the extraction, so only the key crosses the process
+# boundary.
+BACKEND_DIR = Path(__file__).parent.parent
+
+RESUME_TEXT_STORE = os.getenv("RESUME_TEXT_STORE", "1") == "1"
+RESUME_TEXT_DIR = Path(os.getenv("RESUME_TEXT_DIR", str(BACKEND_DIR / "resume_texts")))
+RESUME_TEXT_LEVEL = int(os.getenv("RESUME_TEXT_LEVEL", "6"))
+
+
+def _path_for(key: str) -> Path:
+    # Two-character fan-out keeps directories small at hundreds of thousands of resumes
+    return RESUME_TEXT_DIR / key[:2] / f"{key}.zst"
+
+
+def put(text: str) -> str:
+    """Store ``text`` and return its key; a no-op when the same text is already stored"""
+    data = text.encode("utf-8")
+    key = hashlib.sha256(data).hexdigest()
+    path = _path_for(key)
+    if path.exists():
+        return key
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the final name and rename, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(zstandard.ZstdCompressor(level=RESUME_TEXT_LEVEL).compress(data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return key
+
+
+def get(key: str) -> Optional[str]:
+    """The stored text for ``key``, or None if it is not in the store"""
+    try:
+        compressed = _path_for(key).read_bytes()
+    except FileNotFoundError:
+        return None
+    return zstandard.ZstdDecompressor().decompress(compressed).decode("utf-8")
+
+
+async def aget(key: str) -> Optional[str]:
+    return await asyncio.to_thread(get, key)